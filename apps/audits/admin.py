@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Audit, AuditResponse
+from .models import Audit, AuditResponse, AuditSchedule
 
 
 class AuditResponseInline(admin.TabularInline):
@@ -64,3 +64,16 @@ class AuditResponseAdmin(admin.ModelAdmin):
         return bool(obj.evidence_file)
     has_evidence.boolean = True
     has_evidence.short_description = 'Evidencia'
+
+
+@admin.register(AuditSchedule)
+class AuditScheduleAdmin(admin.ModelAdmin):
+    list_display = [
+        'name', 'template', 'company', 'frequency', 'interval',
+        'next_run', 'assignee_policy', 'is_active'
+    ]
+    list_filter = ['frequency', 'assignee_policy', 'is_active', 'company']
+    search_fields = ['name', 'company__name', 'template__name']
+    readonly_fields = ['last_run_at', 'created_at', 'updated_at']
+    filter_horizontal = ['branches']
+    raw_id_fields = ['assigned_to']
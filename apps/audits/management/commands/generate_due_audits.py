@@ -0,0 +1,49 @@
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from apps.audits.services.recurrence_service import RecurringAuditService
+
+
+class Command(BaseCommand):
+    help = 'Genera las auditorías de las programaciones recurrentes vencidas'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=0,
+            help='Incluir ocurrencias de los próximos N días (por defecto solo hasta hoy)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Programaciones procesadas por transacción'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Calcula las ocurrencias sin guardar cambios'
+        )
+
+    def handle(self, *args, **options):
+        until = timezone.localdate() + timedelta(days=options['days'])
+
+        result = RecurringAuditService.generate_due_audits(
+            until=until,
+            batch_size=options['batch_size'],
+            dry_run=options['dry_run']
+        )
+
+        for schedule_id, reason in result['skipped'].items():
+            self.stdout.write(
+                self.style.WARNING(f'Programación {schedule_id} omitida: {reason}')
+            )
+
+        prefix = '[dry-run] ' if options['dry_run'] else ''
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{prefix}{result['schedules']} programaciones procesadas, "
+                f"{result['audits']} auditorías generadas hasta {until.isoformat()}"
+            )
+        )
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from apps.audits.services.idempotency_service import IdempotencyService
+
+
+class Command(BaseCommand):
+    help = 'Elimina las claves de idempotencia expiradas'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Claves eliminadas por DELETE'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Solo cuenta las claves expiradas'
+        )
+
+    def handle(self, *args, **options):
+        deleted = IdempotencyService.prune_expired(
+            batch_size=options['batch_size'],
+            dry_run=options['dry_run']
+        )
+
+        prefix = '[dry-run] ' if options['dry_run'] else ''
+        self.stdout.write(
+            self.style.SUCCESS(f'{prefix}{deleted} claves de idempotencia expiradas eliminadas')
+        )
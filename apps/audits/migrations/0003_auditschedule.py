@@ -0,0 +1,63 @@
+# Generated by Django 5.0 on 2026-10-18 23:34
+
+import django.core.validators
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audits', '0002_auditresponse_response_type'),
+        ('companies', '0002_department_company'),
+        ('templates', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuditSchedule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=200, verbose_name='Nombre de la Programación')),
+                ('frequency', models.CharField(choices=[('weekly', 'Semanal'), ('monthly', 'Mensual'), ('quarterly', 'Trimestral'), ('yearly', 'Anual')], max_length=20, verbose_name='Frecuencia')),
+                ('interval', models.PositiveIntegerField(default=1, help_text='Cada cuántas unidades de frecuencia se repite', validators=[django.core.validators.MinValueValidator(1)], verbose_name='Intervalo')),
+                ('next_run', models.DateField(verbose_name='Próxima Ejecución')),
+                ('end_date', models.DateField(blank=True, null=True, verbose_name='Fecha de Fin')),
+                ('assignee_policy', models.CharField(choices=[('fixed', 'Auditor Fijo'), ('balanced', 'Balanceado por Carga')], default='balanced', max_length=20, verbose_name='Política de Asignación')),
+                ('is_active', models.BooleanField(default=True, verbose_name='Activa')),
+                ('last_run_at', models.DateTimeField(blank=True, null=True, verbose_name='Última Ejecución')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('assigned_to', models.ForeignKey(blank=True, help_text='Solo para la política de auditor fijo', limit_choices_to={'user_type': 'employee'}, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='audit_schedules', to=settings.AUTH_USER_MODEL, verbose_name='Auditor Fijo')),
+                ('branches', models.ManyToManyField(blank=True, help_text='Vacío = todas las sucursales activas de la empresa', related_name='audit_schedules', to='companies.branch', verbose_name='Sucursales')),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='audit_schedules', to='companies.company', verbose_name='Empresa')),
+                ('created_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='created_audit_schedules', to=settings.AUTH_USER_MODEL, verbose_name='Creado por')),
+                ('template', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='schedules', to='templates.audittemplate', verbose_name='Plantilla')),
+            ],
+            options={
+                'verbose_name': 'Programación de Auditoría',
+                'verbose_name_plural': 'Programaciones de Auditoría',
+                'db_table': 'audit_schedules',
+                'ordering': ['next_run', 'id'],
+            },
+        ),
+        migrations.AddField(
+            model_name='audit',
+            name='schedule',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='audits', to='audits.auditschedule', verbose_name='Programación'),
+        ),
+        migrations.AddConstraint(
+            model_name='audit',
+            constraint=models.UniqueConstraint(condition=models.Q(('schedule__isnull', False)), fields=('schedule', 'branch', 'scheduled_date'), name='unique_schedule_occurrence'),
+        ),
+        migrations.AddIndex(
+            model_name='auditschedule',
+            index=models.Index(fields=['is_active', 'next_run'], name='audit_sched_is_acti_5fbbd9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='auditschedule',
+            index=models.Index(fields=['company'], name='audit_sched_company_dffda0_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0 on 2026-10-18 23:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audits', '0003_auditschedule'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='audit',
+            name='version',
+            field=models.PositiveIntegerField(default=1, help_text='Se incrementa en cada cambio de estado o respuesta', verbose_name='Versión'),
+        ),
+    ]
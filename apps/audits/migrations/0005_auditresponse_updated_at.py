@@ -0,0 +1,20 @@
+# Generated by Django 5.0 on 2026-10-18 23:58
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audits', '0004_audit_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='auditresponse',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, verbose_name='Actualizado en'),
+            preserve_default=False,
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.0 on 2026-10-18 23:47
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audits', '0005_auditresponse_updated_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IdempotencyKey',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=255, verbose_name='Clave')),
+                ('request_hash', models.CharField(help_text='SHA-256 de método, ruta y cuerpo', max_length=64, verbose_name='Hash de la petición')),
+                ('status_code', models.PositiveSmallIntegerField(blank=True, help_text='Vacío mientras la petición original está en proceso', null=True, verbose_name='Código de estado')),
+                ('response_body', models.JSONField(blank=True, null=True, verbose_name='Respuesta')),
+                ('response_headers', models.JSONField(blank=True, default=dict, verbose_name='Headers de la respuesta')),
+                ('expires_at', models.DateTimeField(verbose_name='Expira')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='idempotency_keys', to=settings.AUTH_USER_MODEL, verbose_name='Usuario')),
+            ],
+            options={
+                'verbose_name': 'Clave de Idempotencia',
+                'verbose_name_plural': 'Claves de Idempotencia',
+                'db_table': 'idempotency_keys',
+                'indexes': [models.Index(fields=['expires_at'], name='idempotency_expires_6c9d28_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='idempotencykey',
+            constraint=models.UniqueConstraint(fields=('user', 'key'), name='unique_idempotency_key'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+from django.db import migrations, models
+from django.db.models import F
+
+
+def populate_anchor_date(apps, schema_editor):
+    AuditSchedule = apps.get_model('audits', 'AuditSchedule')
+    AuditSchedule.objects.update(anchor_date=F('next_run'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audits', '0006_idempotencykey'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='auditschedule',
+            name='anchor_date',
+            field=models.DateField(editable=False, null=True, help_text='Las ocurrencias se calculan desde esta fecha (se reinicia al cambiar next_run)', verbose_name='Fecha Base'),
+        ),
+        migrations.RunPython(populate_anchor_date, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='auditschedule',
+            name='anchor_date',
+            field=models.DateField(editable=False, help_text='Las ocurrencias se calculan desde esta fecha (se reinicia al cambiar next_run)', verbose_name='Fecha Base'),
+        ),
+    ]
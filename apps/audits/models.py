@@ -109,6 +109,23 @@ class Audit(models.Model):
         verbose_name='Notas Generales'
     )
 
+    # Programación recurrente que generó la auditoría (si aplica)
+    schedule = models.ForeignKey(
+        'AuditSchedule',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='audits',
+        verbose_name='Programación'
+    )
+
+    # Control de concurrencia optimista (ETag / If-Match)
+    version = models.PositiveIntegerField(
+        default=1,
+        verbose_name='Versión',
+        help_text='Se incrementa en cada cambio de estado o respuesta'
+    )
+
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -125,10 +142,28 @@ class Audit(models.Model):
             models.Index(fields=['assigned_to']),
             models.Index(fields=['created_by']),
         ]
+        constraints = [
+            # Una ocurrencia por sucursal y fecha: hace idempotente generate_due_audits
+            models.UniqueConstraint(
+                fields=['schedule', 'branch', 'scheduled_date'],
+                condition=models.Q(schedule__isnull=False),
+                name='unique_schedule_occurrence'
+            ),
+        ]
 
     def __str__(self):
         return f"{self.title} - {self.company.name}"
 
+    @classmethod
+    def branch_title(cls, title, branch_name):
+        """
+        Título "<title> - <sucursal>" para auditorías generadas por sucursal.
+        Recorta title para no superar max_length (conserva la sucursal).
+        """
+        suffix = f' - {branch_name}'
+        max_length = cls._meta.get_field('title').max_length
+        return title[:max(max_length - len(suffix), 0)] + suffix
+
     @property
     def progress_percentage(self):
         """Calcula el porcentaje de preguntas respondidas"""
@@ -249,6 +284,10 @@ class AuditResponse(models.Model):
         auto_now_add=True,
         verbose_name='Respondido en'
     )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Actualizado en'
+    )
 
     class Meta:
         db_table = 'audit_responses'
@@ -279,3 +318,193 @@ class AuditResponse(models.Model):
             raise ValidationError({
                 'question': 'La pregunta no pertenece a la plantilla de esta auditoría'
             })
+
+
+class AuditSchedule(models.Model):
+    """
+    Programación recurrente de auditorías.
+    Ej: "auditoría ISO 27701 en todas las sucursales cada trimestre".
+    """
+
+    FREQUENCY_CHOICES = [
+        ('weekly', 'Semanal'),
+        ('monthly', 'Mensual'),
+        ('quarterly', 'Trimestral'),
+        ('yearly', 'Anual'),
+    ]
+
+    ASSIGNEE_POLICY_CHOICES = [
+        ('fixed', 'Auditor Fijo'),
+        ('balanced', 'Balanceado por Carga'),
+    ]
+
+    name = models.CharField(
+        max_length=200,
+        verbose_name='Nombre de la Programación'
+    )
+    template = models.ForeignKey(
+        AuditTemplate,
+        on_delete=models.CASCADE,
+        related_name='schedules',
+        verbose_name='Plantilla'
+    )
+
+    # Alcance
+    company = models.ForeignKey(
+        Company,
+        on_delete=models.CASCADE,
+        related_name='audit_schedules',
+        verbose_name='Empresa'
+    )
+    branches = models.ManyToManyField(
+        Branch,
+        blank=True,
+        related_name='audit_schedules',
+        verbose_name='Sucursales',
+        help_text='Vacío = todas las sucursales activas de la empresa'
+    )
+
+    # Regla de recurrencia
+    frequency = models.CharField(
+        max_length=20,
+        choices=FREQUENCY_CHOICES,
+        verbose_name='Frecuencia'
+    )
+    interval = models.PositiveIntegerField(
+        default=1,
+        validators=[MinValueValidator(1)],
+        verbose_name='Intervalo',
+        help_text='Cada cuántas unidades de frecuencia se repite'
+    )
+    next_run = models.DateField(
+        verbose_name='Próxima Ejecución'
+    )
+    anchor_date = models.DateField(
+        editable=False,
+        verbose_name='Fecha Base',
+        help_text='Las ocurrencias se calculan desde esta fecha (se reinicia al cambiar next_run)'
+    )
+    end_date = models.DateField(
+        null=True,
+        blank=True,
+        verbose_name='Fecha de Fin'
+    )
+
+    # Política de asignación
+    assignee_policy = models.CharField(
+        max_length=20,
+        choices=ASSIGNEE_POLICY_CHOICES,
+        default='balanced',
+        verbose_name='Política de Asignación'
+    )
+    assigned_to = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='audit_schedules',
+        verbose_name='Auditor Fijo',
+        limit_choices_to={'user_type': 'employee'},
+        help_text='Solo para la política de auditor fijo'
+    )
+
+    is_active = models.BooleanField(
+        default=True,
+        verbose_name='Activa'
+    )
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='created_audit_schedules',
+        verbose_name='Creado por'
+    )
+    last_run_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Última Ejecución'
+    )
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'audit_schedules'
+        verbose_name = 'Programación de Auditoría'
+        verbose_name_plural = 'Programaciones de Auditoría'
+        ordering = ['next_run', 'id']
+        indexes = [
+            models.Index(fields=['is_active', 'next_run']),
+            models.Index(fields=['company']),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.get_frequency_display()})"
+
+    def save(self, *args, **kwargs):
+        """La primera próxima ejecución es la fecha base"""
+        if self.anchor_date is None:
+            self.anchor_date = self.next_run
+        super().save(*args, **kwargs)
+
+
+class IdempotencyKey(models.Model):
+    """
+    Clave de idempotencia enviada por el cliente en el header
+    Idempotency-Key. Guarda el hash de la petición original y su respuesta
+    para devolverla tal cual en los reintentos, sin volver a ejecutar la
+    operación.
+    """
+
+    key = models.CharField(
+        max_length=255,
+        verbose_name='Clave'
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='idempotency_keys',
+        verbose_name='Usuario'
+    )
+    request_hash = models.CharField(
+        max_length=64,
+        verbose_name='Hash de la petición',
+        help_text='SHA-256 de método, ruta y cuerpo'
+    )
+    status_code = models.PositiveSmallIntegerField(
+        null=True,
+        blank=True,
+        verbose_name='Código de estado',
+        help_text='Vacío mientras la petición original está en proceso'
+    )
+    response_body = models.JSONField(
+        null=True,
+        blank=True,
+        verbose_name='Respuesta'
+    )
+    response_headers = models.JSONField(
+        default=dict,
+        blank=True,
+        verbose_name='Headers de la respuesta'
+    )
+    expires_at = models.DateTimeField(
+        verbose_name='Expira'
+    )
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'idempotency_keys'
+        verbose_name = 'Clave de Idempotencia'
+        verbose_name_plural = 'Claves de Idempotencia'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'key'],
+                name='unique_idempotency_key'
+            )
+        ]
+        indexes = [
+            models.Index(fields=['expires_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.key} ({self.user_id})"
@@ -1,6 +1,8 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
-from .models import Audit, AuditResponse
+from .models import Audit, AuditResponse, AuditSchedule
+from apps.companies.models import Company
+from apps.templates.models import AuditTemplate
 from apps.companies.serializers import CompanySerializer, BranchSerializer
 from apps.templates.serializers import AuditTemplateSerializer, TemplateQuestionSerializer
 
@@ -179,8 +181,10 @@ class AuditDetailSerializer(serializers.ModelSerializer):
             'scheduled_date', 'started_at', 'completed_at',
             'total_score', 'max_possible_score', 'score_percentage',
             'progress', 'answered_questions', 'total_questions',
-            'notes', 'created_at', 'updated_at'
+            'notes', 'version', 'created_at', 'updated_at'
         ]
+        # La versión solo la incrementa el servidor (ver AuditViewSet.update)
+        read_only_fields = ['version']
 
     def get_assigned_to(self, obj):
         return {
@@ -236,3 +240,168 @@ class AuditCreateSerializer(serializers.ModelSerializer):
         validated_data['max_possible_score'] = template.max_possible_score
 
         return super().create(validated_data)
+
+
+class AuditRolloutSerializer(serializers.Serializer):
+    """Serializer para programar una plantilla en varias sucursales"""
+
+    template = serializers.PrimaryKeyRelatedField(
+        queryset=AuditTemplate.objects.filter(is_active=True)
+    )
+    company = serializers.PrimaryKeyRelatedField(
+        queryset=Company.objects.all()
+    )
+    branches = serializers.ListField(
+        child=serializers.IntegerField(),
+        required=False,
+        help_text='IDs de sucursales. Vacío = todas las sucursales activas de la empresa'
+    )
+    start_date = serializers.DateField(required=False)
+    interval_days = serializers.IntegerField(
+        min_value=0,
+        max_value=365,
+        default=1,
+        help_text='Días entre auditorías consecutivas de un mismo auditor'
+    )
+    title = serializers.CharField(max_length=250, required=False)
+
+    def validate(self, attrs):
+        """Validar que la empresa sea del owner y las sucursales de la empresa"""
+        company = attrs['company']
+
+        if company.owner_id != self.context['request'].user.id:
+            raise serializers.ValidationError({
+                'company': 'No tienes permiso sobre esta empresa'
+            })
+
+        branch_ids = attrs.get('branches')
+        if branch_ids:
+            if len(set(branch_ids)) != len(branch_ids):
+                raise serializers.ValidationError({
+                    'branches': 'No puede haber sucursales duplicadas'
+                })
+
+            # Una sola consulta para todas las sucursales
+            branches = company.branches.in_bulk(branch_ids)
+            foreign = [b for b in branch_ids if b not in branches]
+            if foreign:
+                raise serializers.ValidationError({
+                    'branches': f'Las sucursales {foreign} no existen o no pertenecen a la empresa seleccionada'
+                })
+            attrs['branches'] = [branches[b] for b in branch_ids]
+        else:
+            attrs['branches'] = list(company.branches.filter(is_active=True))
+            if not attrs['branches']:
+                raise serializers.ValidationError({
+                    'branches': 'La empresa no tiene sucursales activas'
+                })
+
+        return attrs
+
+
+class AuditBulkCreateSerializer(AuditRolloutSerializer):
+    """
+    Serializer para crear auditorías de una plantilla en varias sucursales.
+    Sin assigned_to, los auditores se asignan por carga de trabajo.
+    """
+
+    assigned_to = serializers.PrimaryKeyRelatedField(
+        queryset=User.objects.all(),
+        required=False
+    )
+    # La fecha de inicio es scheduled_date (start_date solo aplica a rollout)
+    start_date = None
+    scheduled_date = serializers.DateField(required=False)
+    notes = serializers.CharField(required=False, allow_blank=True, default='')
+
+    def validate_assigned_to(self, value):
+        """Validar que el asignado sea tipo employee"""
+        if value.user_type != 'employee':
+            raise serializers.ValidationError(
+                "El auditor debe ser un usuario de tipo 'employee'"
+            )
+        return value
+
+    def validate(self, attrs):
+        if 'start_date' in self.initial_data:
+            raise serializers.ValidationError({
+                'start_date': 'Usa scheduled_date para la fecha de las auditorías'
+            })
+        return super().validate(attrs)
+
+
+class AuditScheduleSerializer(serializers.ModelSerializer):
+    """Serializer para Programaciones de Auditoría recurrentes"""
+
+    template_name = serializers.CharField(source='template.name', read_only=True)
+    company_name = serializers.CharField(source='company.name', read_only=True)
+    frequency_display = serializers.CharField(
+        source='get_frequency_display',
+        read_only=True
+    )
+    assignee_policy_display = serializers.CharField(
+        source='get_assignee_policy_display',
+        read_only=True
+    )
+
+    class Meta:
+        model = AuditSchedule
+        fields = [
+            'id', 'name', 'template', 'template_name', 'company',
+            'company_name', 'branches', 'frequency', 'frequency_display',
+            'interval', 'next_run', 'anchor_date', 'end_date', 'assignee_policy',
+            'assignee_policy_display', 'assigned_to', 'is_active',
+            'last_run_at', 'created_at', 'updated_at'
+        ]
+        read_only_fields = ['id', 'anchor_date', 'last_run_at', 'created_at', 'updated_at']
+
+    def validate(self, attrs):
+        """Validar empresa, sucursales, fechas y política de asignación"""
+        def current(field):
+            if field in attrs:
+                return attrs[field]
+            return getattr(self.instance, field, None) if self.instance else None
+
+        company = current('company')
+        if company.owner_id != self.context['request'].user.id:
+            raise serializers.ValidationError({
+                'company': 'No tienes permiso sobre esta empresa'
+            })
+
+        branches = attrs.get('branches') or []
+        if any(branch.company_id != company.id for branch in branches):
+            raise serializers.ValidationError({
+                'branches': 'Las sucursales deben pertenecer a la empresa seleccionada'
+            })
+
+        end_date = current('end_date')
+        if end_date and end_date < current('next_run'):
+            raise serializers.ValidationError({
+                'end_date': 'La fecha de fin debe ser posterior a la próxima ejecución'
+            })
+
+        assigned_to = current('assigned_to')
+        if current('assignee_policy') == 'fixed':
+            if assigned_to is None:
+                raise serializers.ValidationError({
+                    'assigned_to': 'La política de auditor fijo requiere un auditor'
+                })
+            if assigned_to.user_type != 'employee':
+                raise serializers.ValidationError({
+                    'assigned_to': "El auditor debe ser un usuario de tipo 'employee'"
+                })
+
+        return attrs
+
+    def create(self, validated_data):
+        validated_data['created_by'] = self.context['request'].user
+        return super().create(validated_data)
+
+    def update(self, instance, validated_data):
+        # Una nueva próxima ejecución o frecuencia reinicia la fecha base
+        if any(
+            field in validated_data and validated_data[field] != getattr(instance, field)
+            for field in ['next_run', 'frequency', 'interval']
+        ):
+            validated_data['anchor_date'] = validated_data.get('next_run', instance.next_run)
+        return super().update(instance, validated_data)
@@ -1,24 +1,119 @@
 from django.utils import timezone
 from django.db import transaction
+from django.db.models import Q
 from django.core.exceptions import ValidationError
 from apps.audits.models import Audit, AuditResponse
 from apps.templates.models import TemplateQuestion
+from apps.sync.services import SyncService
+
+
+class AuditVersionConflict(ValidationError):
+    """La versión esperada (If-Match) no coincide con la actual"""
 
 
 class AuditService:
     """
     Servicio para manejar la lógica de negocio de auditorías.
     Contiene los métodos para gestionar el ciclo de vida completo.
+
+    Las transiciones y respuestas bloquean la fila de la auditoría
+    (SELECT ... FOR UPDATE) e incrementan Audit.version, de modo que
+    escrituras concurrentes se serializan en lugar de pisarse.
     """
 
     @staticmethod
-    def start_audit(audit_id, user):
+    def get_visible_audits(user):
+        """
+        Auditorías visibles para el usuario. Regla compartida por
+        AuditViewSet, la sincronización offline y la búsqueda:
+        - Owners: auditorías de sus empresas o que crearon
+        - Employees: auditorías donde están asignados
+        """
+        if user.user_type == 'owner':
+            return Audit.objects.filter(
+                Q(company__owner=user) | Q(created_by=user)
+            )
+        return Audit.objects.filter(assigned_to=user)
+
+    @staticmethod
+    def _lock_audit(audit_id, expected_version=None, select_template=False):
+        """
+        Obtiene la auditoría bloqueada para escritura.
+        Debe llamarse dentro de una transacción.
+
+        Si expected_version no es None y difiere de la versión actual
+        lanza AuditVersionConflict.
+        """
+        queryset = Audit.objects.select_for_update(of=('self',))
+        if select_template:
+            queryset = queryset.select_related('template')
+
+        audit = queryset.get(id=audit_id)
+
+        if expected_version is not None and audit.version != expected_version:
+            raise AuditVersionConflict(
+                "La auditoría fue modificada por otra sesión. "
+                f"Versión actual: {audit.version}"
+            )
+
+        return audit
+
+    @staticmethod
+    @transaction.atomic
+    def bulk_create_audits(template, company, branches, created_by,
+                           assignments, title=None, notes=''):
+        """
+        Crea una auditoría de la plantilla por sucursal con un solo INSERT.
+
+        Args:
+        - branches: sucursales de la empresa
+        - assignments: dict {branch_id: (assigned_to_id, scheduled_date)}
+        - title: prefijo del título (por defecto el nombre de la plantilla),
+          recortado para que el título con la sucursal quepa en Audit.title
+
+        El puntaje máximo de la plantilla se calcula una sola vez.
+        Retorna: lista de Audit creadas (en el orden de branches)
+        """
+        max_possible_score = template.max_possible_score
+        title = title or template.name
+
+        audits = Audit.objects.bulk_create([
+            Audit(
+                title=Audit.branch_title(title, branch.name),
+                template=template,
+                company=company,
+                branch=branch,
+                assigned_to_id=assignments[branch.id][0],
+                scheduled_date=assignments[branch.id][1],
+                created_by=created_by,
+                max_possible_score=max_possible_score,
+                notes=notes
+            )
+            for branch in branches
+        ])
+
+        # bulk_create no emite señales
+        SyncService.record(audits, created=True)
+        return audits
+
+    @staticmethod
+    def lock_for_edit(audit_id, expected_version=None):
+        """
+        Bloquea la auditoría para una edición directa (PUT/PATCH) y valida
+        la versión esperada. Debe llamarse dentro de una transacción; quien
+        edita incrementa version al guardar.
+        """
+        return AuditService._lock_audit(audit_id, expected_version)
+
+    @staticmethod
+    @transaction.atomic
+    def start_audit(audit_id, user, expected_version=None):
         """
         Inicia una auditoría cambiando su estado a 'in_progress'.
         Solo puede iniciarse si está en estado 'draft'.
         """
         try:
-            audit = Audit.objects.get(id=audit_id)
+            audit = AuditService._lock_audit(audit_id, expected_version)
 
             # Validar que el usuario pueda iniciarla
             if audit.assigned_to != user and audit.created_by != user:
@@ -35,6 +130,7 @@ class AuditService:
             # Iniciar
             audit.status = 'in_progress'
             audit.started_at = timezone.now()
+            audit.version += 1
             audit.save()
 
             return audit
@@ -44,13 +140,20 @@ class AuditService:
 
     @staticmethod
     @transaction.atomic
-    def save_response(audit_id, question_id, score, notes, evidence_file, user, response_type=None):
+    def save_response(audit_id, question_id, score, notes, evidence_file, user,
+                      response_type=None, expected_version=None):
         """
         Guarda o actualiza una respuesta a una pregunta de auditoría.
         Recalcula el score automáticamente.
+
+        La fila de la auditoría queda bloqueada hasta el commit, por lo que
+        respuestas concurrentes desde varios dispositivos recalculan el
+        score una tras otra sobre datos consistentes.
         """
         try:
-            audit = Audit.objects.select_related('template').get(id=audit_id)
+            audit = AuditService._lock_audit(
+                audit_id, expected_version, select_template=True
+            )
             question = TemplateQuestion.objects.get(id=question_id)
 
             # Validar permisos
@@ -91,6 +194,7 @@ class AuditService:
             )
 
             # Recalcular score de la auditoría
+            audit.version += 1
             audit.calculate_score()
 
             return response
@@ -100,13 +204,15 @@ class AuditService:
 
     @staticmethod
     @transaction.atomic
-    def complete_audit(audit_id, user):
+    def complete_audit(audit_id, user, expected_version=None):
         """
         Completa una auditoría verificando que todas las preguntas
         obligatorias estén respondidas.
         """
         try:
-            audit = Audit.objects.select_related('template').get(id=audit_id)
+            audit = AuditService._lock_audit(
+                audit_id, expected_version, select_template=True
+            )
 
             # Validar permisos
             if audit.assigned_to != user and audit.created_by != user:
@@ -143,6 +249,7 @@ class AuditService:
             # Completar
             audit.status = 'completed'
             audit.completed_at = timezone.now()
+            audit.version += 1
             audit.save()
 
             return audit
@@ -151,13 +258,14 @@ class AuditService:
             raise ValidationError("Auditoría no encontrada")
 
     @staticmethod
-    def cancel_audit(audit_id, user):
+    @transaction.atomic
+    def cancel_audit(audit_id, user, expected_version=None):
         """
         Cancela una auditoría.
         Solo puede cancelarse si no está completada.
         """
         try:
-            audit = Audit.objects.get(id=audit_id)
+            audit = AuditService._lock_audit(audit_id, expected_version)
 
             # Validar permisos
             if audit.created_by != user:
@@ -173,6 +281,7 @@ class AuditService:
 
             # Cancelar
             audit.status = 'cancelled'
+            audit.version += 1
             audit.save()
 
             return audit
@@ -0,0 +1,192 @@
+import hashlib
+import json
+from datetime import timedelta
+from functools import wraps
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from apps.audits.models import IdempotencyKey
+
+
+class IdempotencyService:
+    """
+    Servicio de claves de idempotencia para endpoints que modifican datos.
+
+    La primera petición con una clave la reserva y, si termina con 2xx,
+    guarda su respuesta. Los reintentos con la misma clave y el mismo
+    cuerpo reciben esa respuesta sin ejecutar la operación otra vez; si la
+    original sigue en proceso se responde 409. Las respuestas con error no
+    se guardan: la clave se libera para poder reintentar.
+
+    La reserva dura IDEMPOTENCY_LEASE_SECONDS: si la petición original no
+    respondió en ese plazo (el worker murió) un reintento toma la clave.
+    created_at marca la reserva vigente; finish y release solo actúan si
+    la reserva sigue siendo suya.
+    """
+
+    HEADER = 'Idempotency-Key'
+    MAX_KEY_LENGTH = 255
+
+    # Headers de la respuesta original que se repiten en los reintentos
+    STORED_HEADERS = ['ETag', 'Location']
+
+    @staticmethod
+    def get_request_hash(request):
+        """SHA-256 de método, ruta y cuerpo (normalizado) de la petición"""
+        body = json.dumps(request.data, sort_keys=True, default=str)
+        raw = f'{request.method}:{request.path}:{body}'
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    @staticmethod
+    def begin(user, key, request_hash):
+        """
+        Reserva la clave para una petición nueva.
+
+        Retorna (IdempotencyKey, None) si la petición debe ejecutarse, o
+        (None, Response) con la respuesta guardada o el error a devolver.
+        """
+        now = timezone.now()
+
+        record = IdempotencyKey.objects.filter(user=user, key=key).first()
+        if record is not None and record.expires_at <= now:
+            record.delete()
+            record = None
+
+        if record is None:
+            try:
+                with transaction.atomic():
+                    record = IdempotencyKey.objects.create(
+                        user=user,
+                        key=key,
+                        request_hash=request_hash,
+                        expires_at=now + timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS)
+                    )
+                return record, None
+            except IntegrityError:
+                # Una petición concurrente con la misma clave la reservó
+                return None, Response(
+                    {'error': 'Ya hay una petición en proceso con esta Idempotency-Key'},
+                    status=status.HTTP_409_CONFLICT
+                )
+
+        if record.status_code is None:
+            # Reserva abandonada: se toma con un UPDATE condicional para que
+            # solo uno de varios reintentos concurrentes la obtenga
+            lease = timedelta(seconds=settings.IDEMPOTENCY_LEASE_SECONDS)
+            taken = IdempotencyKey.objects.filter(
+                pk=record.pk, status_code=None, created_at__lt=now - lease
+            ).update(
+                created_at=now,
+                request_hash=request_hash,
+                expires_at=now + timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS)
+            )
+            if taken:
+                record.created_at = now
+                record.request_hash = request_hash
+                return record, None
+
+        if record.request_hash != request_hash:
+            return None, Response(
+                {'error': 'La Idempotency-Key ya se usó con una petición diferente'},
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY
+            )
+
+        if record.status_code is None:
+            return None, Response(
+                {'error': 'Ya hay una petición en proceso con esta Idempotency-Key'},
+                status=status.HTTP_409_CONFLICT
+            )
+
+        response = Response(record.response_body, status=record.status_code)
+        for header, value in record.response_headers.items():
+            response[header] = value
+        response['Idempotent-Replayed'] = 'true'
+        return None, response
+
+    @staticmethod
+    def owned(record):
+        """Queryset de la clave mientras la reserva sea de esta petición"""
+        return IdempotencyKey.objects.filter(
+            pk=record.pk, status_code=None, created_at=record.created_at
+        )
+
+    @staticmethod
+    def release(record):
+        """Libera la clave (si otra petición no la tomó)"""
+        IdempotencyService.owned(record).delete()
+
+    @staticmethod
+    def finish(record, response):
+        """Guarda la respuesta si fue exitosa; si no, libera la clave"""
+        if not status.is_success(response.status_code):
+            IdempotencyService.release(record)
+            return
+
+        # Se guarda el JSON tal como lo recibió el cliente
+        IdempotencyService.owned(record).update(
+            status_code=response.status_code,
+            response_body=json.loads(JSONRenderer().render(response.data) or 'null'),
+            response_headers={
+                header: response[header]
+                for header in IdempotencyService.STORED_HEADERS
+                if response.has_header(header)
+            }
+        )
+
+    @staticmethod
+    def prune_expired(batch_size=1000, dry_run=False):
+        """
+        Elimina las claves expiradas en lotes de batch_size (cada DELETE
+        toca pocas filas y no bloquea la tabla por mucho tiempo).
+
+        Retorna: cantidad de claves eliminadas (o por eliminar en dry_run)
+        """
+        expired = IdempotencyKey.objects.filter(expires_at__lte=timezone.now())
+
+        if dry_run:
+            return expired.count()
+
+        deleted = 0
+        while True:
+            ids = list(expired.order_by('id').values_list('id', flat=True)[:batch_size])
+            if not ids:
+                return deleted
+            deleted += IdempotencyKey.objects.filter(id__in=ids).delete()[0]
+
+
+def idempotent(method):
+    """
+    Decorador para acciones DRF que modifican datos. Sin header
+    Idempotency-Key la acción se ejecuta normalmente.
+    """
+    @wraps(method)
+    def wrapper(self, request, *args, **kwargs):
+        key = request.headers.get(IdempotencyService.HEADER)
+        if not key:
+            return method(self, request, *args, **kwargs)
+
+        if len(key) > IdempotencyService.MAX_KEY_LENGTH:
+            return Response(
+                {'error': f'Idempotency-Key admite hasta {IdempotencyService.MAX_KEY_LENGTH} caracteres'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        record, response = IdempotencyService.begin(
+            request.user, key, IdempotencyService.get_request_hash(request)
+        )
+        if response is not None:
+            return response
+
+        try:
+            response = method(self, request, *args, **kwargs)
+        except Exception:
+            IdempotencyService.release(record)
+            raise
+
+        IdempotencyService.finish(record, response)
+        return response
+
+    return wrapper
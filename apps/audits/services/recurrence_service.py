@@ -0,0 +1,275 @@
+import calendar
+from datetime import timedelta
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Sum
+from django.utils import timezone
+from apps.audits.models import Audit, AuditSchedule
+from apps.audits.services.scheduling_service import AuditSchedulingService
+from apps.sync.services import SyncService
+
+
+class RecurringAuditService:
+    """
+    Servicio para materializar las ocurrencias de AuditSchedule.
+
+    Procesa las programaciones vencidas por lotes (keyset por id) usando el
+    índice (is_active, next_run). Cada lote se bloquea con SELECT ... FOR UPDATE
+    SKIP LOCKED, así ejecuciones concurrentes toman programaciones
+    distintas; la restricción unique_schedule_occurrence descarta cualquier
+    ocurrencia repetida (bulk_create con ignore_conflicts).
+    """
+
+    # Meses que avanza cada frecuencia mensual
+    MONTHS_PER_FREQUENCY = {
+        'monthly': 1,
+        'quarterly': 3,
+        'yearly': 12,
+    }
+
+    @staticmethod
+    def add_months(value, months):
+        """Suma meses a una fecha ajustando el día al fin de mes"""
+        month_index = value.month - 1 + months
+        year = value.year + month_index // 12
+        month = month_index % 12 + 1
+        day = min(value.day, calendar.monthrange(year, month)[1])
+        return value.replace(year=year, month=month, day=day)
+
+    @staticmethod
+    def next_occurrence(schedule, current):
+        """
+        Fecha de la ocurrencia siguiente a current.
+
+        Las frecuencias mensuales se calculan desde anchor_date (ocurrencia
+        N = anchor + N períodos) y no desde current: así el ajuste a fin de
+        mes no se arrastra (31 ene → 28 feb → 31 mar).
+        """
+        if schedule.frequency == 'weekly':
+            return current + timedelta(weeks=schedule.interval)
+
+        months = RecurringAuditService.MONTHS_PER_FREQUENCY[schedule.frequency] * schedule.interval
+        anchor = schedule.anchor_date or schedule.next_run
+        elapsed = (current.year - anchor.year) * 12 + current.month - anchor.month
+        return RecurringAuditService.add_months(anchor, (elapsed // months + 1) * months)
+
+    @staticmethod
+    def get_occurrences(schedule, until):
+        """
+        Ocurrencias pendientes hasta until (inclusive) y la fecha de la
+        siguiente ejecución posterior.
+
+        Retorna: (lista de fechas, próxima fecha)
+        """
+        occurrences = []
+        current = schedule.next_run
+
+        while current <= until and (schedule.end_date is None or current <= schedule.end_date):
+            occurrences.append(current)
+            current = RecurringAuditService.next_occurrence(schedule, current)
+
+        return occurrences, current
+
+    @staticmethod
+    def _load_branches(schedules):
+        """
+        Sucursales objetivo de cada programación (dos consultas).
+
+        Retorna dict {schedule_id: [(branch_id, branch_name), ...]}
+        """
+        from apps.companies.models import Branch
+
+        explicit = {}
+        for schedule_id, branch_id, name in AuditSchedule.branches.through.objects.filter(
+            auditschedule_id__in=[schedule.id for schedule in schedules],
+            branch__is_active=True
+        ).values_list('auditschedule_id', 'branch_id', 'branch__name').order_by('branch__name'):
+            explicit.setdefault(schedule_id, []).append((branch_id, name))
+
+        # Programaciones sin sucursales explícitas: todas las activas
+        company_ids = {s.company_id for s in schedules if s.id not in explicit}
+        by_company = {}
+        for company_id, branch_id, name in Branch.objects.filter(
+            company_id__in=company_ids,
+            is_active=True
+        ).values_list('company_id', 'id', 'name').order_by('name'):
+            by_company.setdefault(company_id, []).append((branch_id, name))
+
+        return {
+            schedule.id: explicit.get(schedule.id) or by_company.get(schedule.company_id, [])
+            for schedule in schedules
+        }
+
+    @staticmethod
+    def _process_batch(schedules, until, dry_run):
+        """
+        Genera las auditorías de un lote de programaciones.
+
+        Retorna: (auditorías generadas, {schedule_id: motivo} omitidas)
+        """
+        from apps.templates.models import TemplateQuestion
+
+        branches = RecurringAuditService._load_branches(schedules)
+
+        max_scores = dict(TemplateQuestion.objects.filter(
+            template_id__in={s.template_id for s in schedules}
+        ).values('template_id').annotate(
+            total=Sum('max_score')
+        ).values_list('template_id', 'total'))
+
+        balanced = [s for s in schedules if s.assignee_policy == 'balanced']
+        pools = AuditSchedulingService.get_candidate_pools(
+            {s.company_id for s in balanced}
+        )
+        user_ids = {
+            user_id for _, company_pool in pools.values() for user_id in company_pool
+        }
+        workloads = AuditSchedulingService.get_workloads(
+            user_ids, timezone.localdate(), 0
+        )
+
+        audits = []
+        skipped = {}
+        processed = []
+        now = timezone.now()
+
+        for schedule in schedules:
+            occurrences, next_run = RecurringAuditService.get_occurrences(schedule, until)
+            targets = branches[schedule.id]
+
+            if not targets:
+                skipped[schedule.id] = 'sin sucursales activas'
+                continue
+            if schedule.assignee_policy == 'fixed' and schedule.assigned_to_id is None:
+                skipped[schedule.id] = 'sin auditor fijo'
+                continue
+
+            schedule_audits = []
+            try:
+                for occurrence in occurrences:
+                    if schedule.assignee_policy == 'fixed':
+                        assignees = {b: schedule.assigned_to_id for b, _ in targets}
+                    else:
+                        candidates = AuditSchedulingService.get_candidates(
+                            schedule.company_id, [b for b, _ in targets], pools
+                        )
+                        assignees = {
+                            branch_id: user_id
+                            for branch_id, (user_id, _) in AuditSchedulingService.assign(
+                                candidates, workloads, 0
+                            ).items()
+                        }
+
+                    for branch_id, branch_name in targets:
+                        schedule_audits.append(Audit(
+                            title=Audit.branch_title(schedule.name, branch_name),
+                            template_id=schedule.template_id,
+                            company_id=schedule.company_id,
+                            branch_id=branch_id,
+                            assigned_to_id=assignees[branch_id],
+                            created_by_id=schedule.created_by_id,
+                            scheduled_date=occurrence,
+                            schedule=schedule,
+                            max_possible_score=max_scores.get(schedule.template_id) or 0
+                        ))
+            except ValidationError as e:
+                skipped[schedule.id] = e.messages[0]
+                continue
+
+            audits.extend(schedule_audits)
+
+            schedule.next_run = next_run
+            schedule.last_run_at = now
+            if schedule.end_date is not None and next_run > schedule.end_date:
+                schedule.is_active = False
+            processed.append(schedule)
+
+        # Ocurrencias que ya existen (p. ej. next_run retrocedido a mano) no
+        # se vuelven a crear ni cuentan como generadas
+        existing = RecurringAuditService._existing_occurrences(processed, audits)
+        audits = [a for a in audits if RecurringAuditService._key(a) not in existing]
+
+        if dry_run:
+            return len(audits), skipped
+
+        Audit.objects.bulk_create(audits, batch_size=1000, ignore_conflicts=True)
+        # Con ignore_conflicts no se obtienen los IDs: se leen por las claves
+        # (schedule, branch, scheduled_date) intentadas. Las programaciones están
+        # bloqueadas, así que ninguna otra ejecución inserta esas claves.
+        attempted = {RecurringAuditService._key(a) for a in audits}
+        created = [
+            audit for audit in RecurringAuditService._occurrences(processed, audits).only(
+                'id', 'template_id', 'company_id', 'assigned_to_id', 'created_by_id',
+                'schedule_id', 'branch_id', 'scheduled_date'
+            )
+            if RecurringAuditService._key(audit) in attempted
+        ]
+        SyncService.record(created, created=True)
+        AuditSchedule.objects.bulk_update(
+            processed, ['next_run', 'last_run_at', 'is_active'], batch_size=1000
+        )
+
+        return len(created), skipped
+
+    @staticmethod
+    def _key(audit):
+        return audit.schedule_id, audit.branch_id, audit.scheduled_date
+
+    @staticmethod
+    def _occurrences(schedules, audits):
+        """
+        Auditorías que pueden coincidir con las ocurrencias de audits; el
+        filtro exacto por clave se aplica en Python.
+        """
+        return Audit.objects.filter(
+            schedule__in=schedules,
+            branch_id__in={a.branch_id for a in audits},
+            scheduled_date__in={a.scheduled_date for a in audits}
+        )
+
+    @staticmethod
+    def _existing_occurrences(schedules, audits):
+        if not audits:
+            return set()
+        return set(
+            RecurringAuditService._occurrences(schedules, audits).values_list(
+                'schedule_id', 'branch_id', 'scheduled_date'
+            )
+        )
+
+    @staticmethod
+    def generate_due_audits(until=None, batch_size=500, dry_run=False):
+        """
+        Materializa todas las ocurrencias vencidas hasta until (por defecto hoy).
+
+        Retorna dict con programaciones procesadas, auditorías generadas y
+        programaciones omitidas con su motivo.
+        """
+        until = until or timezone.localdate()
+
+        result = {'schedules': 0, 'audits': 0, 'skipped': {}}
+        last_id = 0
+
+        while True:
+            with transaction.atomic():
+                schedules = list(AuditSchedule.objects.select_for_update(
+                    skip_locked=True
+                ).filter(
+                    is_active=True,
+                    next_run__lte=until,
+                    id__gt=last_id
+                ).order_by('id')[:batch_size])
+
+                if not schedules:
+                    break
+
+                created, skipped = RecurringAuditService._process_batch(
+                    schedules, until, dry_run
+                )
+
+            last_id = schedules[-1].id
+            result['schedules'] += len(schedules) - len(skipped)
+            result['audits'] += created
+            result['skipped'].update(skipped)
+
+        return result
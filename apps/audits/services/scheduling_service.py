@@ -0,0 +1,174 @@
+import heapq
+from datetime import timedelta
+from django.db import transaction
+from django.db.models import Count, Max
+from django.core.exceptions import ValidationError
+from django.utils import timezone
+from apps.audits.models import Audit
+from apps.audits.services.audit_service import AuditService
+
+
+class AuditSchedulingService:
+    """
+    Servicio para asignar auditores y programar auditorías en lote.
+
+    Los candidatos de cada sucursal son los miembros de sus equipos; si una
+    sucursal no tiene equipos se usan los miembros de toda la empresa. La
+    asignación es greedy: cada sucursal recibe al candidato con menos
+    auditorías abiertas y, en empate, con la fecha disponible más temprana.
+    """
+
+    # Estados que cuentan como carga de trabajo pendiente
+    OPEN_STATUSES = ['draft', 'in_progress']
+
+    @staticmethod
+    def get_candidate_pools(company_ids):
+        """
+        Miembros de equipos activos agrupados por empresa y sucursal
+        (una consulta para todas las empresas).
+
+        Retorna dict {company_id: ({branch_id: set(user_ids)}, set(user_ids))}
+        """
+        from apps.teams.models import TeamMember
+
+        memberships = TeamMember.objects.filter(
+            company_id__in=company_ids,
+            team__is_active=True,
+            user__is_active=True
+        ).values_list('company_id', 'branch_id', 'user_id').distinct()
+
+        pools = {company_id: ({}, set()) for company_id in company_ids}
+        for company_id, branch_id, user_id in memberships:
+            by_branch, company_pool = pools[company_id]
+            by_branch.setdefault(branch_id, set()).add(user_id)
+            company_pool.add(user_id)
+
+        return pools
+
+    @staticmethod
+    def get_candidates(company_id, branch_ids, pools=None):
+        """
+        Auditores candidatos por sucursal.
+
+        Retorna dict {branch_id: [user_id, ...]} usando el pool de toda la
+        empresa para las sucursales sin miembros propios.
+        """
+        if pools is None:
+            pools = AuditSchedulingService.get_candidate_pools([company_id])
+        by_branch, company_pool = pools[company_id]
+
+        return {
+            branch_id: sorted(by_branch.get(branch_id) or company_pool)
+            for branch_id in branch_ids
+        }
+
+    @staticmethod
+    def get_workloads(user_ids, start_date, interval_days):
+        """
+        Carga actual de cada auditor (una consulta agrupada).
+
+        Retorna dict {user_id: [auditorías abiertas, próxima fecha libre]}.
+        La próxima fecha libre es interval_days después de su última
+        auditoría abierta programada, nunca antes de start_date.
+        """
+        rows = Audit.objects.filter(
+            assigned_to_id__in=user_ids,
+            status__in=AuditSchedulingService.OPEN_STATUSES
+        ).values('assigned_to_id').annotate(
+            open_count=Count('id'),
+            last_scheduled=Max('scheduled_date')
+        )
+
+        workloads = {user_id: [0, start_date] for user_id in user_ids}
+        for row in rows:
+            next_date = start_date
+            if row['last_scheduled']:
+                next_date = max(
+                    start_date,
+                    row['last_scheduled'] + timedelta(days=interval_days)
+                )
+            workloads[row['assigned_to_id']] = [row['open_count'], next_date]
+
+        return workloads
+
+    @staticmethod
+    def assign(candidates, workloads, interval_days):
+        """
+        Asigna un auditor y una fecha a cada sucursal.
+
+        Mantiene un heap por pool de candidatos con (carga, fecha, user_id).
+        Como los pools comparten auditores, las entradas cuya carga quedó
+        desactualizada se descartan al extraerlas (lazy deletion) y se
+        reinsertan con el valor vigente.
+
+        Retorna dict {branch_id: (user_id, scheduled_date)}
+        """
+        heaps = {}
+        assignments = {}
+
+        for branch_id, pool in candidates.items():
+            if not pool:
+                raise ValidationError(
+                    f"La sucursal {branch_id} no tiene auditores disponibles en sus equipos"
+                )
+
+            key = tuple(pool)
+            heap = heaps.get(key)
+            if heap is None:
+                heap = [
+                    (workloads[user_id][0], workloads[user_id][1], user_id)
+                    for user_id in pool
+                ]
+                heapq.heapify(heap)
+                heaps[key] = heap
+
+            while True:
+                load, next_date, user_id = heapq.heappop(heap)
+                current = workloads[user_id]
+                if (load, next_date) == (current[0], current[1]):
+                    break
+                heapq.heappush(heap, (current[0], current[1], user_id))
+
+            assignments[branch_id] = (user_id, next_date)
+
+            current[0] += 1
+            current[1] = next_date + timedelta(days=interval_days)
+            heapq.heappush(heap, (current[0], current[1], user_id))
+
+        return assignments
+
+    @staticmethod
+    @transaction.atomic
+    def schedule_rollout(template, company, branches, created_by,
+                         start_date=None, interval_days=1, title=None,
+                         notes=''):
+        """
+        Crea una auditoría de la plantilla en cada sucursal, asignando
+        auditores balanceados por carga y fecha.
+
+        Usa un número fijo de consultas: candidatos, cargas y las de
+        AuditService.bulk_create_audits.
+
+        Retorna: lista de Audit creadas (en el orden de branches)
+        """
+        start_date = start_date or timezone.localdate()
+        branch_ids = [branch.id for branch in branches]
+
+        candidates = AuditSchedulingService.get_candidates(company.id, branch_ids)
+        user_ids = {user_id for pool in candidates.values() for user_id in pool}
+        workloads = AuditSchedulingService.get_workloads(
+            user_ids, start_date, interval_days
+        )
+        assignments = AuditSchedulingService.assign(
+            candidates, workloads, interval_days
+        )
+
+        return AuditService.bulk_create_audits(
+            template=template,
+            company=company,
+            branches=branches,
+            created_by=created_by,
+            assignments=assignments,
+            title=title,
+            notes=notes
+        )
@@ -1,4 +1,4 @@
-from django.db.models import Avg, Sum, Count, Q
+from django.db.models import Avg, Sum, Count, Min, Q
 from apps.audits.models import Audit, AuditResponse
 
 
@@ -7,36 +7,50 @@ class ScoringService:
     Servicio para cálculos de scores y estadísticas de auditorías.
     """
 
+    # Incrementar al cambiar la forma de calcular scores; invalida los
+    # resultados de comparaciones cacheados
+    SCORING_VERSION = 1
+
     @staticmethod
     def get_score_by_category(audit):
         """
         Obtiene los scores agrupados por categoría.
         Retorna dict con info por cada categoría.
         """
-        responses = audit.responses.select_related('question').all()
-
-        categories = {}
-        for response in responses:
-            category = response.question.category
+        return ScoringService.get_scores_by_category_bulk([audit.id]).get(audit.id, {})
 
-            if category not in categories:
-                categories[category] = {
-                    'total_score': 0,
-                    'max_score': 0,
-                    'answered': 0,
-                    'total_questions': 0
-                }
+    @staticmethod
+    def get_scores_by_category_bulk(audit_ids):
+        """
+        Obtiene los scores por categoría de varias auditorías con una
+        sola consulta agrupada por (auditoría, categoría).
 
-            categories[category]['total_questions'] += 1
-            categories[category]['max_score'] += response.question.max_score
+        Retorna dict {audit_id: {categoría: info}} con el mismo formato
+        que get_score_by_category. Las categorías se ordenan según la
+        primera pregunta de cada una.
+        """
+        rows = AuditResponse.objects.filter(
+            audit_id__in=audit_ids
+        ).values(
+            'audit_id', 'question__category'
+        ).annotate(
+            total_score=Sum('score'),
+            max_score=Sum('question__max_score'),
+            answered=Count('score'),
+            total_questions=Count('id'),
+            first_order=Min('question__order_num')
+        ).order_by('audit_id', 'first_order')
 
-            if response.score is not None:
-                categories[category]['total_score'] += response.score
-                categories[category]['answered'] += 1
+        results = {}
+        for row in rows:
+            data = {
+                'total_score': row['total_score'] or 0,
+                'max_score': row['max_score'] or 0,
+                'answered': row['answered'],
+                'total_questions': row['total_questions']
+            }
 
-        # Calcular porcentajes
-        for category in categories:
-            data = categories[category]
+            # Calcular porcentajes
             if data['max_score'] > 0:
                 data['percentage'] = round(
                     (data['total_score'] / data['max_score']) * 100,
@@ -54,7 +68,9 @@ class ScoringService:
             else:
                 data['average_score'] = 0
 
-        return categories
+            results.setdefault(row['audit_id'], {})[row['question__category']] = data
+
+        return results
 
     @staticmethod
     def get_audit_summary(audit):
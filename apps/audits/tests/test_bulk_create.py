@@ -0,0 +1,54 @@
+from django.test import TestCase
+from rest_framework.test import APIClient
+from apps.audits.models import Audit
+from apps.companies.models import Company, Branch
+from apps.templates.models import AuditTemplate
+from core.testing import create_user
+
+
+class AuditBulkCreateTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = create_user('owner@test.com', 'owner')
+        cls.employee = create_user('employee@test.com')
+        cls.company = Company.objects.create(name='ACME', owner=cls.owner)
+        cls.branch = Branch.objects.create(name='B' * 200, company=cls.company)
+        cls.template = AuditTemplate.objects.create(
+            name='ISO', iso_standard='27701', created_by=cls.owner
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+
+    def bulk(self, **fields):
+        return self.client.post('/api/audits/bulk/', {
+            'template': self.template.id,
+            'company': self.company.id,
+            'assigned_to': self.employee.id,
+            **fields
+        }, format='json')
+
+    def test_long_title_is_truncated_to_fit_branch(self):
+        response = self.bulk(title='T' * 250)
+
+        self.assertEqual(response.status_code, 201)
+        audit = Audit.objects.get(id=response.data['ids'][0])
+        max_length = Audit._meta.get_field('title').max_length
+        self.assertEqual(len(audit.title), max_length)
+        self.assertTrue(audit.title.endswith(f' - {self.branch.name}'))
+
+    def test_short_title_is_kept(self):
+        response = self.bulk(title='Anual')
+
+        self.assertEqual(response.status_code, 201)
+        audit = Audit.objects.get(id=response.data['ids'][0])
+        self.assertEqual(audit.title, f'Anual - {self.branch.name}')
+
+    def test_start_date_is_rejected(self):
+        response = self.bulk(start_date='2025-01-15')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('start_date', response.data)
+        self.assertFalse(Audit.objects.exists())
@@ -0,0 +1,98 @@
+from django.test import TestCase
+from rest_framework.test import APIClient
+from apps.audits.models import Audit
+from apps.companies.models import Company, Branch
+from apps.templates.models import AuditTemplate, TemplateQuestion
+from core.testing import create_user
+
+
+class AuditVersionConflictTests(TestCase):
+    """If-Match sobre la versión de la auditoría (412 si cambió)"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = create_user('owner@test.com', 'owner')
+        cls.employee = create_user('employee@test.com')
+        cls.company = Company.objects.create(name='ACME', owner=cls.owner)
+        cls.branch = Branch.objects.create(name='Centro', company=cls.company)
+        cls.template = AuditTemplate.objects.create(
+            name='ISO', iso_standard='27701', created_by=cls.owner
+        )
+        cls.question = TemplateQuestion.objects.create(
+            template=cls.template, category='A', question_text='¿Pregunta?',
+            order_num=1, max_score=4
+        )
+
+    def setUp(self):
+        self.audit = Audit.objects.create(
+            title='Auditoría', template=self.template, company=self.company,
+            branch=self.branch, assigned_to=self.employee, created_by=self.owner
+        )
+        self.url = f'/api/audits/{self.audit.id}/'
+
+    def client_for(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client
+
+    def etag(self, client):
+        return client.get(self.url)['ETag']
+
+    def test_patch_bumps_version_and_etag(self):
+        client = self.client_for(self.owner)
+        etag = self.etag(client)
+
+        response = client.patch(self.url, {'notes': 'Editado'}, format='json', HTTP_IF_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['version'], self.audit.version + 1)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response['ETag'], self.etag(client))
+
+    def test_stale_patch_from_second_device_gets_412(self):
+        first, second = self.client_for(self.owner), self.client_for(self.owner)
+        etag = self.etag(first)
+        self.assertEqual(self.etag(second), etag)
+
+        first.patch(self.url, {'notes': 'Dispositivo 1'}, format='json', HTTP_IF_MATCH=etag)
+        response = second.patch(self.url, {'notes': 'Dispositivo 2'}, format='json', HTTP_IF_MATCH=etag)
+
+        self.assertEqual(response.status_code, 412)
+        self.assertEqual(response.data['current_version'], self.audit.version + 1)
+        self.assertEqual(response['ETag'], self.etag(first))
+        self.audit.refresh_from_db()
+        self.assertEqual(self.audit.notes, 'Dispositivo 1')
+
+    def test_version_is_read_only(self):
+        client = self.client_for(self.owner)
+
+        response = client.patch(self.url, {'version': 99}, format='json')
+
+        self.assertEqual(response.data['version'], self.audit.version + 1)
+
+    def test_if_match_of_other_audit_gets_412(self):
+        client = self.client_for(self.owner)
+
+        response = client.patch(self.url, {'notes': 'x'}, format='json', HTTP_IF_MATCH='"0-1"')
+
+        self.assertEqual(response.status_code, 412)
+
+    def test_stale_respond_gets_412(self):
+        client = self.client_for(self.employee)
+        etag = self.etag(client)
+        start = client.post(f'{self.url}start/', HTTP_IF_MATCH=etag)
+        self.assertEqual(start.status_code, 200)
+
+        response = client.post(
+            f'{self.url}respond/', {'question_id': self.question.id, 'response': 'yes'},
+            format='json', HTTP_IF_MATCH=etag
+        )
+
+        self.assertEqual(response.status_code, 412)
+        self.assertFalse(self.audit.responses.exists())
+
+        response = client.post(
+            f'{self.url}respond/', {'question_id': self.question.id, 'response': 'yes'},
+            format='json', HTTP_IF_MATCH=start['ETag']
+        )
+        self.assertEqual(response.status_code, 200)
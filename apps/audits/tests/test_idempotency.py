@@ -0,0 +1,103 @@
+from datetime import timedelta
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+from apps.audits.models import Audit, IdempotencyKey
+from apps.audits.services.idempotency_service import IdempotencyService
+from apps.companies.models import Company, Branch
+from apps.templates.models import AuditTemplate
+from core.testing import create_user
+
+
+@override_settings(IDEMPOTENCY_LEASE_SECONDS=60)
+class IdempotencyTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = create_user('owner@test.com', 'owner')
+        cls.employee = create_user('employee@test.com')
+        cls.company = Company.objects.create(name='ACME', owner=cls.owner)
+        Branch.objects.create(name='Centro', company=cls.company)
+        cls.template = AuditTemplate.objects.create(
+            name='ISO', iso_standard='27701', created_by=cls.owner
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+
+    def bulk(self, key='key-1', **fields):
+        return self.client.post('/api/audits/bulk/', {
+            'template': self.template.id,
+            'company': self.company.id,
+            'assigned_to': self.employee.id,
+            **fields
+        }, format='json', HTTP_IDEMPOTENCY_KEY=key)
+
+    def reserve(self, age):
+        """Clave pendiente reservada hace age segundos"""
+        record = IdempotencyKey.objects.create(
+            user=self.owner, key='key-1', request_hash='x' * 64,
+            expires_at=timezone.now() + timedelta(hours=1)
+        )
+        IdempotencyKey.objects.filter(pk=record.pk).update(
+            created_at=timezone.now() - timedelta(seconds=age)
+        )
+        record.refresh_from_db()
+        return record
+
+    def test_retry_replays_response(self):
+        first = self.bulk(notes='a')
+        second = self.bulk(notes='a')
+
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(second.status_code, 201)
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(second['Idempotent-Replayed'], 'true')
+        self.assertEqual(Audit.objects.count(), 1)
+
+    def test_different_body_is_rejected(self):
+        self.bulk(notes='a')
+
+        response = self.bulk(notes='b')
+
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(Audit.objects.count(), 1)
+
+    def test_pending_within_lease_conflicts(self):
+        self.bulk()
+        # Misma petición aún en proceso (sin respuesta guardada)
+        IdempotencyKey.objects.update(status_code=None, created_at=timezone.now())
+
+        response = self.bulk()
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(Audit.objects.count(), 1)
+
+    def test_abandoned_reservation_is_taken_over(self):
+        self.reserve(age=120)
+
+        response = self.bulk()
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Audit.objects.count(), 1)
+        record = IdempotencyKey.objects.get(user=self.owner, key='key-1')
+        self.assertEqual(record.status_code, 201)
+        self.assertEqual(self.bulk()['Idempotent-Replayed'], 'true')
+
+    def test_stale_owner_cannot_overwrite_takeover(self):
+        stale = self.reserve(age=120)
+        request_hash = 'y' * 64
+        record, response = IdempotencyService.begin(self.owner, 'key-1', request_hash)
+        self.assertIsNone(response)
+
+        # La petición original termina después de perder la reserva
+        IdempotencyService.finish(stale, Response({'stale': True}, status=201))
+        IdempotencyService.release(stale)
+
+        record.refresh_from_db()
+        self.assertIsNone(record.status_code)
+        IdempotencyService.finish(record, Response({'ok': True}, status=201))
+        record.refresh_from_db()
+        self.assertEqual(record.response_body, {'ok': True})
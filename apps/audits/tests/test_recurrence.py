@@ -0,0 +1,90 @@
+from datetime import date
+from django.test import TestCase
+from apps.audits.models import Audit, AuditSchedule
+from apps.audits.services.recurrence_service import RecurringAuditService
+from apps.companies.models import Company, Branch
+from apps.sync.models import SyncChange
+from apps.templates.models import AuditTemplate
+from core.testing import create_user
+
+
+class RecurringAuditServiceTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = create_user('owner@test.com', 'owner')
+        cls.employee = create_user('employee@test.com')
+        cls.company = Company.objects.create(name='ACME', owner=cls.owner)
+        cls.template = AuditTemplate.objects.create(
+            name='ISO', iso_standard='27701', created_by=cls.owner
+        )
+
+    def create_schedule(self, next_run, frequency='monthly', **fields):
+        return AuditSchedule.objects.create(
+            name=fields.pop('name', 'Mensual'), template=self.template,
+            company=self.company, frequency=frequency, interval=1,
+            next_run=next_run, assignee_policy='fixed',
+            assigned_to=self.employee, created_by=self.owner, **fields
+        )
+
+    def test_month_end_does_not_drift(self):
+        schedule = self.create_schedule(date(2025, 1, 31))
+
+        occurrences, next_run = RecurringAuditService.get_occurrences(
+            schedule, date(2025, 5, 1)
+        )
+
+        self.assertEqual(occurrences, [
+            date(2025, 1, 31), date(2025, 2, 28), date(2025, 3, 31), date(2025, 4, 30)
+        ])
+        self.assertEqual(next_run, date(2025, 5, 31))
+
+    def test_anchor_kept_across_runs(self):
+        schedule = self.create_schedule(date(2025, 1, 31), frequency='quarterly')
+        schedule.next_run = date(2025, 4, 30)
+        schedule.save()
+
+        occurrences, next_run = RecurringAuditService.get_occurrences(
+            schedule, date(2025, 8, 1)
+        )
+
+        self.assertEqual(occurrences, [date(2025, 4, 30), date(2025, 7, 31)])
+        self.assertEqual(next_run, date(2025, 10, 31))
+
+    def test_weekly(self):
+        schedule = self.create_schedule(date(2025, 1, 1), frequency='weekly')
+
+        occurrences, _ = RecurringAuditService.get_occurrences(schedule, date(2025, 1, 20))
+
+        self.assertEqual(occurrences, [date(2025, 1, 1), date(2025, 1, 8), date(2025, 1, 15)])
+
+    def test_generated_title_fits_max_length(self):
+        Branch.objects.create(name='S' * 200, company=self.company)
+        self.create_schedule(date(2025, 1, 1), name='N' * 200, end_date=date(2025, 1, 1))
+
+        result = RecurringAuditService.generate_due_audits(until=date(2025, 1, 1))
+
+        self.assertEqual(result['audits'], 1)
+        title = Audit.objects.get().title
+        self.assertEqual(len(title), 300)
+        self.assertTrue(title.endswith(' - ' + 'S' * 200))
+
+    def test_existing_occurrence_not_counted_or_recorded(self):
+        branch = Branch.objects.create(name='Centro', company=self.company)
+        schedule = self.create_schedule(date(2025, 1, 1))
+        existing = Audit.objects.create(
+            title='Mensual - Centro', template=self.template, company=self.company,
+            branch=branch, assigned_to=self.employee, created_by=self.owner,
+            scheduled_date=date(2025, 1, 1), schedule=schedule
+        )
+        SyncChange.objects.all().delete()
+
+        result = RecurringAuditService.generate_due_audits(until=date(2025, 2, 1))
+
+        self.assertEqual(result['audits'], 1)
+        generated = Audit.objects.exclude(id=existing.id).get()
+        self.assertEqual(generated.scheduled_date, date(2025, 2, 1))
+        self.assertEqual(
+            list(SyncChange.objects.values_list('object_id', 'created')),
+            [(generated.id, True)]
+        )
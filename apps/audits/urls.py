@@ -1,11 +1,12 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import AuditViewSet
+from .views import AuditViewSet, AuditScheduleViewSet
 
 app_name = 'audits'
 
 router = DefaultRouter()
 router.register(r'audits', AuditViewSet, basename='audit')
+router.register(r'audit-schedules', AuditScheduleViewSet, basename='audit_schedule')
 
 urlpatterns = [
     path('', include(router.urls)),
@@ -2,16 +2,98 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.db.models import Q, Count, Sum
+from django.db import transaction
+from django.db.models import Count, Max, OuterRef, Subquery, Sum
 from django.core.exceptions import ValidationError as DjangoValidationError
-from .models import Audit, AuditResponse
+from django.utils.http import parse_etags, quote_etag
+from .models import AuditResponse, AuditSchedule
 from .serializers import (
     AuditListSerializer, AuditDetailSerializer, AuditCreateSerializer,
-    AuditResponseSerializer, AuditResponseCreateSerializer
+    AuditResponseSerializer, AuditResponseCreateSerializer,
+    AuditRolloutSerializer, AuditBulkCreateSerializer,
+    AuditScheduleSerializer
 )
-from .services.audit_service import AuditService
+from .services.audit_service import AuditService, AuditVersionConflict
+from .services.idempotency_service import idempotent
+from .services.scheduling_service import AuditSchedulingService
 from .services.scoring_service import ScoringService
 from apps.authentication.permissions import IsOwner
+from apps.templates.models import TemplateQuestion
+from audit_system.conditional import conditional_get
+
+
+def audit_etag(audit):
+    """ETag de una auditoría según su versión"""
+    return quote_etag(f'{audit.id}-{audit.version}')
+
+
+def get_expected_version(request, audit):
+    """
+    Versión esperada según el header If-Match.
+
+    Retorna None si no se envía o es '*'. Lanza AuditVersionConflict si
+    ninguno de los ETags corresponde a la auditoría.
+    """
+    header = request.headers.get('If-Match')
+    if not header:
+        return None
+
+    etags = parse_etags(header)
+    if '*' in etags:
+        return None
+
+    for etag in etags:
+        audit_id, _, version = etag.removeprefix('W/').strip('"').partition('-')
+        if audit_id == str(audit.id) and version.isdigit():
+            return int(version)
+
+    raise AuditVersionConflict(
+        f"If-Match no corresponde a la auditoría. Versión actual: {audit.version}"
+    )
+
+
+def version_conflict_response(error, audit):
+    """Respuesta 412 con la versión vigente de la auditoría"""
+    audit.refresh_from_db(fields=['version'])
+    response = Response(
+        {'error': error.messages[0], 'current_version': audit.version},
+        status=status.HTTP_412_PRECONDITION_FAILED
+    )
+    response['ETag'] = audit_etag(audit)
+    return response
+
+
+def audit_questions_state(view, request, pk=None, **kwargs):
+    """
+    Versión de las preguntas y respuestas de una auditoría visible para el
+    usuario: updated_at de la auditoría y de la plantilla, más conteo y
+    última modificación de respuestas y preguntas (una consulta).
+    """
+    questions = TemplateQuestion.objects.filter(
+        template_id=OuterRef('template_id')
+    ).order_by().values('template_id')
+
+    try:
+        state = view.get_queryset().filter(pk=pk).annotate(
+            responses_count=Count('responses'),
+            responses_updated=Max('responses__updated_at'),
+            questions_count=Subquery(questions.annotate(total=Count('id')).values('total')),
+            questions_updated=Subquery(questions.annotate(last=Max('updated_at')).values('last'))
+        ).values_list(
+            'updated_at', 'template__updated_at', 'responses_count',
+            'responses_updated', 'questions_count', 'questions_updated'
+        ).first()
+    except (ValueError, TypeError):
+        return None
+
+    if state is None:
+        return None
+
+    updated_at, template_updated, _, responses_updated, _, questions_updated = state
+    last_modified = max(filter(None, [
+        updated_at, template_updated, responses_updated, questions_updated
+    ]))
+    return state, last_modified
 
 
 class AuditViewSet(viewsets.ModelViewSet):
@@ -34,22 +116,13 @@ class AuditViewSet(viewsets.ModelViewSet):
         - Owners: auditorías de sus empresas o que crearon
         - Employees: auditorías donde están asignados
         """
-        user = self.request.user
-
-        queryset = Audit.objects.select_related(
+        queryset = AuditService.get_visible_audits(
+            self.request.user
+        ).select_related(
             'template', 'company', 'branch',
             'assigned_to', 'created_by'
         )
 
-        if user.user_type == 'owner':
-            # Owners ven auditorías de sus empresas O que ellos crearon
-            queryset = queryset.filter(
-                Q(company__owner=user) | Q(created_by=user)
-            )
-        else:
-            # Employees ven auditorías donde están asignados
-            queryset = queryset.filter(assigned_to=user)
-
         # Filtros opcionales por query params
         status_filter = self.request.query_params.get('status')
         if status_filter:
@@ -71,10 +144,158 @@ class AuditViewSet(viewsets.ModelViewSet):
 
     def get_permissions(self):
         """Permisos: solo owners pueden crear auditorías"""
-        if self.action in ['create']:
+        if self.action in ['create', 'rollout', 'bulk']:
             return [IsAuthenticated(), IsOwner()]
         return super().get_permissions()
 
+    @idempotent
+    def create(self, request, *args, **kwargs):
+        """Creación con soporte de Idempotency-Key"""
+        return super().create(request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        """Detalle con ETag para usar en If-Match"""
+        response = super().retrieve(request, *args, **kwargs)
+        response['ETag'] = quote_etag(f"{response.data['id']}-{response.data['version']}")
+        return response
+
+    def update(self, request, *args, **kwargs):
+        """
+        PUT/PATCH con la misma concurrencia optimista que las acciones:
+        bloquea la fila, valida If-Match (412 si no coincide) e incrementa
+        version al guardar.
+        """
+        audit = self.get_object()
+
+        try:
+            with transaction.atomic():
+                AuditService.lock_for_edit(
+                    audit.id, get_expected_version(request, audit)
+                )
+                response = super().update(request, *args, **kwargs)
+        except AuditVersionConflict as e:
+            return version_conflict_response(e, audit)
+
+        response['ETag'] = quote_etag(f"{response.data['id']}-{response.data['version']}")
+        return response
+
+    def perform_update(self, serializer):
+        """Cada edición invalida los ETags anteriores"""
+        serializer.save(version=serializer.instance.version + 1)
+
+    @action(detail=False, methods=['post'])
+    @idempotent
+    def bulk(self, request):
+        """
+        POST /api/audits/bulk/
+        Crea auditorías de una plantilla en varias sucursales con un
+        solo INSERT
+
+        Body: {
+            "template": 1,
+            "company": 1,
+            "branches": [1, 2, 3],  // opcional, por defecto todas las activas
+            "assigned_to": 5,  // opcional, por defecto según carga de trabajo
+            "scheduled_date": "2025-01-15"
+        }
+        """
+        serializer = AuditBulkCreateSerializer(
+            data=request.data,
+            context={'request': request}
+        )
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        try:
+            if data.get('assigned_to'):
+                audits = AuditService.bulk_create_audits(
+                    template=data['template'],
+                    company=data['company'],
+                    branches=data['branches'],
+                    created_by=request.user,
+                    assignments={
+                        branch.id: (data['assigned_to'].id, data.get('scheduled_date'))
+                        for branch in data['branches']
+                    },
+                    title=data.get('title'),
+                    notes=data['notes']
+                )
+            else:
+                audits = AuditSchedulingService.schedule_rollout(
+                    template=data['template'],
+                    company=data['company'],
+                    branches=data['branches'],
+                    created_by=request.user,
+                    start_date=data.get('scheduled_date'),
+                    interval_days=data['interval_days'],
+                    title=data.get('title'),
+                    notes=data['notes']
+                )
+
+            return Response({
+                'message': f'{len(audits)} auditorías creadas',
+                'ids': [audit.id for audit in audits]
+            }, status=status.HTTP_201_CREATED)
+
+        except DjangoValidationError as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+    @action(detail=False, methods=['post'])
+    @idempotent
+    def rollout(self, request):
+        """
+        POST /api/audits/rollout/
+        Programa una plantilla en varias sucursales asignando auditores
+        de sus equipos según carga de trabajo y fechas
+
+        Body: {
+            "template": 1,
+            "company": 1,
+            "branches": [1, 2, 3],  // opcional, por defecto todas las activas
+            "start_date": "2025-01-15",  // opcional, por defecto hoy
+            "interval_days": 1
+        }
+        """
+        serializer = AuditRolloutSerializer(
+            data=request.data,
+            context={'request': request}
+        )
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        try:
+            audits = AuditSchedulingService.schedule_rollout(
+                template=data['template'],
+                company=data['company'],
+                branches=data['branches'],
+                created_by=request.user,
+                start_date=data.get('start_date'),
+                interval_days=data['interval_days'],
+                title=data.get('title')
+            )
+
+            return Response({
+                'message': f'{len(audits)} auditorías programadas',
+                'audits': [
+                    {
+                        'id': audit.id,
+                        'branch': audit.branch_id,
+                        'assigned_to': audit.assigned_to_id,
+                        'scheduled_date': audit.scheduled_date
+                    }
+                    for audit in audits
+                ]
+            }, status=status.HTTP_201_CREATED)
+
+        except DjangoValidationError as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
     @action(detail=True, methods=['post'])
     def start(self, request, pk=None):
         """
@@ -84,13 +305,21 @@ class AuditViewSet(viewsets.ModelViewSet):
         audit = self.get_object()
 
         try:
-            audit = AuditService.start_audit(audit.id, request.user)
+            audit = AuditService.start_audit(
+                audit.id, request.user,
+                expected_version=get_expected_version(request, audit)
+            )
             serializer = AuditDetailSerializer(audit)
 
-            return Response({
+            response = Response({
                 'message': 'Auditoría iniciada exitosamente',
                 'audit': serializer.data
             })
+            response['ETag'] = audit_etag(audit)
+            return response
+
+        except AuditVersionConflict as e:
+            return version_conflict_response(e, audit)
 
         except DjangoValidationError as e:
             return Response(
@@ -99,6 +328,7 @@ class AuditViewSet(viewsets.ModelViewSet):
             )
 
     @action(detail=True, methods=['get'])
+    @conditional_get(audit_questions_state)
     def questions(self, request, pk=None):
         """
         GET /api/audits/{id}/questions/
@@ -145,6 +375,7 @@ class AuditViewSet(viewsets.ModelViewSet):
         })
 
     @action(detail=True, methods=['post'])
+    @idempotent
     def respond(self, request, pk=None):
         """
         POST /api/audits/{id}/respond/
@@ -163,6 +394,7 @@ class AuditViewSet(viewsets.ModelViewSet):
         serializer.is_valid(raise_exception=True)
 
         try:
+            expected_version = get_expected_version(request, audit)
             response = AuditService.save_response(
                 audit_id=audit.id,
                 question_id=serializer.validated_data['question_id'],
@@ -170,13 +402,14 @@ class AuditViewSet(viewsets.ModelViewSet):
                 notes=serializer.validated_data.get('notes', ''),
                 evidence_file=serializer.validated_data.get('evidence_file', ''),
                 user=request.user,
-                response_type=serializer.validated_data.get('response')
+                response_type=serializer.validated_data.get('response'),
+                expected_version=expected_version
             )
 
             # Refrescar audit para obtener scores actualizados
             audit.refresh_from_db()
 
-            return Response({
+            result = Response({
                 'message': 'Respuesta guardada exitosamente',
                 'response': AuditResponseSerializer(response).data,
                 'audit_progress': {
@@ -186,8 +419,14 @@ class AuditViewSet(viewsets.ModelViewSet):
                     'current_score': float(audit.total_score),
                     'max_score': float(audit.max_possible_score),
                     'score_percentage': float(audit.score_percentage)
-                }
+                },
+                'version': audit.version
             })
+            result['ETag'] = audit_etag(audit)
+            return result
+
+        except AuditVersionConflict as e:
+            return version_conflict_response(e, audit)
 
         except DjangoValidationError as e:
             return Response(
@@ -196,6 +435,7 @@ class AuditViewSet(viewsets.ModelViewSet):
             )
 
     @action(detail=True, methods=['post'])
+    @idempotent
     def complete(self, request, pk=None):
         """
         POST /api/audits/{id}/complete/
@@ -204,15 +444,24 @@ class AuditViewSet(viewsets.ModelViewSet):
         audit = self.get_object()
 
         try:
-            audit = AuditService.complete_audit(audit.id, request.user)
+            audit = AuditService.complete_audit(
+                audit.id, request.user,
+                expected_version=get_expected_version(request, audit)
+            )
 
             # Generar resumen
             summary = ScoringService.get_audit_summary(audit)
 
-            return Response({
+            response = Response({
                 'message': 'Auditoría completada exitosamente',
-                'summary': summary
+                'summary': summary,
+                'version': audit.version
             })
+            response['ETag'] = audit_etag(audit)
+            return response
+
+        except AuditVersionConflict as e:
+            return version_conflict_response(e, audit)
 
         except DjangoValidationError as e:
             return Response(
@@ -229,12 +478,20 @@ class AuditViewSet(viewsets.ModelViewSet):
         audit = self.get_object()
 
         try:
-            audit = AuditService.cancel_audit(audit.id, request.user)
+            audit = AuditService.cancel_audit(
+                audit.id, request.user,
+                expected_version=get_expected_version(request, audit)
+            )
 
-            return Response({
+            response = Response({
                 'message': 'Auditoría cancelada exitosamente',
                 'audit': AuditDetailSerializer(audit).data
             })
+            response['ETag'] = audit_etag(audit)
+            return response
+
+        except AuditVersionConflict as e:
+            return version_conflict_response(e, audit)
 
         except DjangoValidationError as e:
             return Response(
@@ -300,3 +557,27 @@ class AuditViewSet(viewsets.ModelViewSet):
             'percentage': summary['score_percentage'],
             'categories': summary['categories']
         })
+
+
+class AuditScheduleViewSet(viewsets.ModelViewSet):
+    """
+    ViewSet para gestión de Programaciones de Auditoría recurrentes.
+
+    Las ocurrencias vencidas se generan con el comando
+    `python manage.py generate_due_audits`.
+    """
+
+    serializer_class = AuditScheduleSerializer
+    permission_classes = [IsAuthenticated, IsOwner]
+
+    def get_queryset(self):
+        """Programaciones de las empresas del owner"""
+        queryset = AuditSchedule.objects.filter(
+            company__owner=self.request.user
+        ).select_related('template', 'company').prefetch_related('branches')
+
+        company_id = self.request.query_params.get('company')
+        if company_id:
+            queryset = queryset.filter(company_id=company_id)
+
+        return queryset
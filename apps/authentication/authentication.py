@@ -0,0 +1,74 @@
+import time
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication que resuelve request.user desde la cache.
+
+    El usuario se guarda bajo una clave con su id y un contador de versión
+    por usuario. Al guardar o eliminar el usuario (cambio de contraseña,
+    desactivación, cambio de tipo...) se incrementa la versión y las
+    entradas anteriores dejan de leerse; expiran solas a los
+    AUTH_USER_CACHE_TIMEOUT segundos. Si no está en cache se consulta la
+    base como JWTAuthentication.
+
+    Requiere cache compartida (REDIS_URL): con cache local la versión solo
+    cambia en el worker que guardó el usuario. Por eso settings solo la
+    activa cuando REDIS_URL está definido.
+    """
+
+    VERSION_CACHE_KEY = 'user_token_version:{user_id}'
+    USER_CACHE_KEY = 'auth_user:{user_id}:{version}'
+
+    @staticmethod
+    def get_version(user_id):
+        """Versión actual del usuario (se inicializa si no existe)"""
+        key = CachedJWTAuthentication.VERSION_CACHE_KEY.format(user_id=user_id)
+        version = cache.get(key)
+        if version is None:
+            # Valor inicial basado en el tiempo: si la cache descarta el
+            # contador, la nueva versión no coincide con entradas anteriores
+            cache.add(key, time.time_ns(), None)
+            version = cache.get(key)
+        return version
+
+    @staticmethod
+    def bump_version(user_id):
+        """Invalida el usuario cacheado incrementando su versión"""
+        key = CachedJWTAuthentication.VERSION_CACHE_KEY.format(user_id=user_id)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Sin contador no hay entradas válidas: se crea uno nuevo
+            cache.set(key, time.time_ns(), None)
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        # La versión se lee antes de consultar la base: si el usuario cambia
+        # mientras tanto, lo guardado queda bajo una versión ya descartada
+        key = self.USER_CACHE_KEY.format(
+            user_id=user_id, version=self.get_version(user_id)
+        )
+
+        user = cache.get(key)
+        if user is None:
+            try:
+                user = self.user_model.objects.get(**{api_settings.USER_ID_FIELD: user_id})
+            except self.user_model.DoesNotExist:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found")
+            cache.set(key, user, settings.AUTH_USER_CACHE_TIMEOUT)
+
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        return user
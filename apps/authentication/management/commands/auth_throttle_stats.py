@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from apps.authentication.throttles import AuthRateThrottle
+
+
+class Command(BaseCommand):
+    help = 'Muestra los intentos de autenticación rechazados por límite (429)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help='Reinicia los contadores después de mostrarlos'
+        )
+
+    def handle(self, *args, **options):
+        for scope, count in AuthRateThrottle.get_rejected_counts().items():
+            self.stdout.write(f'{scope}: {count}')
+
+        if options['reset']:
+            AuthRateThrottle.reset_rejected_counts()
+            self.stdout.write(self.style.SUCCESS('Contadores reiniciados'))
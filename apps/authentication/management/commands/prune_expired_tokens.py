@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from apps.authentication.services import TokenBlacklistService
+
+
+class Command(BaseCommand):
+    help = 'Elimina los refresh tokens expirados (pendientes y en lista negra)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Tokens eliminados por DELETE'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Solo cuenta los tokens expirados'
+        )
+
+    def handle(self, *args, **options):
+        result = TokenBlacklistService.prune_expired(
+            batch_size=options['batch_size'],
+            dry_run=options['dry_run']
+        )
+
+        prefix = '[dry-run] ' if options['dry_run'] else ''
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix}{result['outstanding']} tokens expirados eliminados "
+            f"({result['blacklisted']} en lista negra)"
+        ))
@@ -0,0 +1,34 @@
+from django.db import migrations
+
+# Índices para la búsqueda por prefijo del directorio de empleados
+# (campo__istartswith compila a UPPER(campo) LIKE 'X%'). En PostgreSQL
+# LIKE solo usa el índice con text_pattern_ops si la collation no es C.
+INDEXES = [
+    ('users_first_name_prefix_idx', 'first_name'),
+    ('users_last_name_prefix_idx', 'last_name'),
+    ('users_email_prefix_idx', 'email'),
+]
+
+
+def create_indexes(apps, schema_editor):
+    opclass = ' text_pattern_ops' if schema_editor.connection.vendor == 'postgresql' else ''
+    for name, column in INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {name} ON users (UPPER({column}){opclass})'
+        )
+
+
+def drop_indexes(apps, schema_editor):
+    for name, _ in INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
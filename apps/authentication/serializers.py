@@ -1,6 +1,8 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from .tokens import CachedRefreshToken
 
 User = get_user_model()
 
@@ -17,6 +19,15 @@ class UserSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'date_joined']
 
 
+class EmployeeDirectorySerializer(serializers.ModelSerializer):
+    """Versión compacta para selectores de empleados"""
+    full_name = serializers.CharField(source='get_full_name', read_only=True)
+
+    class Meta:
+        model = User
+        fields = ['id', 'email', 'full_name']
+
+
 class RegisterSerializer(serializers.ModelSerializer):
     password = serializers.CharField(
         write_only=True,
@@ -90,3 +101,8 @@ class ChangePasswordSerializer(serializers.Serializer):
                 "new_password": "Las contraseñas nuevas no coinciden"
             })
         return attrs
+
+
+class CachedTokenRefreshSerializer(TokenRefreshSerializer):
+    """Refresh con rotación usando la lista negra cacheada"""
+    token_class = CachedRefreshToken
@@ -0,0 +1,3 @@
+from .token_blacklist_service import TokenBlacklistService
+
+__all__ = ['TokenBlacklistService']
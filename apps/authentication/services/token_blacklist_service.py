@@ -0,0 +1,117 @@
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+
+class TokenBlacklistService:
+    """
+    Servicio de la lista negra de refresh tokens.
+
+    Con ROTATE_REFRESH_TOKENS y BLACKLIST_AFTER_ROTATION cada refresh pone
+    en lista negra el token usado. Los JTI en lista negra se guardan además
+    en cache hasta que el token expira: un token ya rotado (reintentos,
+    varias pestañas) se rechaza sin consultar la base. La base sigue siendo
+    la fuente de verdad cuando el JTI no está en cache.
+    """
+
+    CACHE_KEY = 'blacklisted_jti:{jti}'
+
+    @staticmethod
+    def cache_blacklisted(jti, exp):
+        """Guarda el JTI en cache hasta la expiración del token"""
+        timeout = int(exp - timezone.now().timestamp())
+        if timeout > 0:
+            cache.set(TokenBlacklistService.CACHE_KEY.format(jti=jti), True, timeout)
+
+    @staticmethod
+    def get_outstanding(jti, exp):
+        """
+        Busca el token en la lista de pendientes con una sola consulta.
+
+        Retorna (outstanding_id, en_lista_negra); outstanding_id es None si
+        el token nunca se registró (los refresh emitidos por rotación).
+        """
+        if cache.get(TokenBlacklistService.CACHE_KEY.format(jti=jti)):
+            return None, True
+
+        row = OutstandingToken.objects.filter(jti=jti).values_list(
+            'id', 'blacklistedtoken__id'
+        ).first()
+        if row is None:
+            return None, False
+
+        outstanding_id, blacklisted_id = row
+        if blacklisted_id is not None:
+            TokenBlacklistService.cache_blacklisted(jti, exp)
+            return outstanding_id, True
+        return outstanding_id, False
+
+    @staticmethod
+    def blacklist(token, outstanding_id=None):
+        """
+        Pone el token en lista negra. outstanding_id es el obtenido con
+        get_outstanding; si es None el token pendiente se crea.
+
+        Retorna False si ya estaba (otra petición lo rotó primero): con
+        dos refresh simultáneos del mismo token solo uno tiene éxito.
+        """
+        jti = token.payload[api_settings.JTI_CLAIM]
+        exp = token.payload['exp']
+
+        try:
+            with transaction.atomic():
+                if outstanding_id is None:
+                    outstanding_id = OutstandingToken.objects.create(
+                        jti=jti,
+                        token=str(token),
+                        expires_at=datetime_from_epoch(exp)
+                    ).id
+                BlacklistedToken.objects.create(token_id=outstanding_id)
+        except IntegrityError:
+            TokenBlacklistService.cache_blacklisted(jti, exp)
+            return False
+
+        TokenBlacklistService.cache_blacklisted(jti, exp)
+        return True
+
+    @staticmethod
+    def prune_expired(batch_size=1000, dry_run=False):
+        """
+        Elimina los tokens expirados (pendientes y en lista negra) en lotes
+        de batch_size. Un token expirado ya es rechazado por su claim exp,
+        así que su fila no es necesaria.
+
+        expires_at no tiene índice: los lotes avanzan por id (keyset sobre
+        la clave primaria) y cada DELETE toca pocas filas.
+
+        Retorna: dict con la cantidad de tokens pendientes y en lista negra
+        eliminados (o por eliminar en dry_run)
+        """
+        expired = OutstandingToken.objects.filter(expires_at__lte=timezone.now())
+
+        if dry_run:
+            return {
+                'outstanding': expired.count(),
+                'blacklisted': BlacklistedToken.objects.filter(token__in=expired).count()
+            }
+
+        result = {'outstanding': 0, 'blacklisted': 0}
+        last_id = 0
+        while True:
+            ids = list(
+                expired.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:batch_size]
+            )
+            if not ids:
+                return result
+
+            with transaction.atomic():
+                result['blacklisted'] += BlacklistedToken.objects.filter(
+                    token_id__in=ids
+                ).delete()[0]
+                result['outstanding'] += OutstandingToken.objects.filter(
+                    id__in=ids
+                ).delete()[0]
+            last_id = ids[-1]
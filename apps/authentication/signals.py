@@ -0,0 +1,26 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .authentication import CachedJWTAuthentication
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=User)
+def invalidate_cached_user(sender, instance, update_fields=None, **kwargs):
+    """Invalida el usuario cacheado para la autenticación JWT"""
+    # Actualizar solo last_login no cambia permisos ni estado
+    if update_fields is not None and set(update_fields) == {'last_login'}:
+        return
+    # Tras el commit: una petición concurrente que lea la fila anterior
+    # antes del commit la guarda bajo una versión que queda descartada
+    user_id = instance.pk
+    transaction.on_commit(lambda: CachedJWTAuthentication.bump_version(user_id))
+
+
+@receiver(post_delete, sender=User)
+def invalidate_deleted_user(sender, instance, **kwargs):
+    """Descarta el usuario cacheado al eliminarlo"""
+    user_id = instance.pk
+    transaction.on_commit(lambda: CachedJWTAuthentication.bump_version(user_id))
@@ -0,0 +1,81 @@
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.tokens import AccessToken
+from apps.authentication.authentication import CachedJWTAuthentication
+from core.testing import create_user
+
+
+class CachedJWTAuthenticationTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = create_user('employee@test.com')
+        self.token = str(AccessToken.for_user(self.user))
+
+    def authenticate(self):
+        request = APIRequestFactory().get(
+            '/api/auth/profile/', HTTP_AUTHORIZATION=f'Bearer {self.token}'
+        )
+        user, _ = CachedJWTAuthentication().authenticate(request)
+        return user
+
+    def save_user(self, **fields):
+        with self.captureOnCommitCallbacks(execute=True):
+            for field, value in fields.items():
+                setattr(self.user, field, value)
+            self.user.save()
+
+    def test_second_request_uses_cache(self):
+        self.authenticate()
+
+        with self.assertNumQueries(0):
+            user = self.authenticate()
+
+        self.assertEqual(user.pk, self.user.pk)
+
+    def test_type_change_invalidates_cache(self):
+        self.authenticate()
+        self.save_user(user_type='owner')
+
+        with self.assertNumQueries(1):
+            user = self.authenticate()
+
+        self.assertEqual(user.user_type, 'owner')
+
+    def test_deactivation_rejects_next_request(self):
+        self.authenticate()
+        self.save_user(is_active=False)
+
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    def test_deleted_user_rejected(self):
+        self.authenticate()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.delete()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    def test_last_login_does_not_invalidate(self):
+        self.authenticate()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save(update_fields=['last_login'])
+
+        with self.assertNumQueries(0):
+            self.authenticate()
+
+    def test_version_bumped_after_commit(self):
+        self.authenticate()
+
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            self.user.user_type = 'owner'
+            self.user.save()
+            # Antes del commit se sigue leyendo la versión anterior
+            self.assertEqual(self.authenticate().user_type, 'employee')
+
+        self.assertEqual(len(callbacks), 1)
+        callbacks[0]()
+        self.assertEqual(self.authenticate().user_type, 'owner')
@@ -0,0 +1,165 @@
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from apps.companies.models import Company, Branch, Department
+from apps.teams.models import Team, TeamMember
+from core.testing import create_user
+
+
+class UnassignedEmployeeLookupTests(TestCase):
+    """unassigned=true solo resuelve un email exacto"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = create_user('owner@test.com', 'owner')
+        cls.free = create_user('ana@test.com')
+        create_user('anabel@test.com')
+        cls.member = create_user('bruno@test.com')
+
+        company = Company.objects.create(name='ACME', owner=cls.owner)
+        branch = Branch.objects.create(name='Centro', company=company)
+        department = Department.objects.create(name='Ventas', branch=branch)
+        team = Team.objects.create(name='Auditores', department=department, team_type='miembro_equipo')
+        TeamMember.objects.create(team=team, user=cls.member, role='member')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+
+    def get(self, **params):
+        return self.client.get('/api/auth/employees/', {'unassigned': 'true', **params})
+
+    def test_requires_email(self):
+        self.assertEqual(self.get().status_code, 400)
+        self.assertEqual(self.get(search='an').status_code, 400)
+
+    def test_exact_email_match(self):
+        response = self.get(email='ANA@test.com ')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['id'] for row in response.data['results']], [self.free.id])
+
+    def test_prefix_does_not_match(self):
+        response = self.get(email='ana')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['results'], [])
+
+    def test_team_members_excluded(self):
+        response = self.get(email='bruno@test.com')
+
+        self.assertEqual(response.data['results'], [])
+
+
+def create_team(company, name='Auditores'):
+    branch = Branch.objects.create(name=name, company=company)
+    department = Department.objects.create(name='Ventas', branch=branch)
+    return Team.objects.create(name=name, department=department, team_type='miembro_equipo')
+
+
+class EmployeeDirectoryTests(TestCase):
+    """Alcance por equipos, filtro por empresa y búsqueda por prefijos"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = create_user('owner@test.com', 'owner')
+        other_owner = create_user('other@test.com', 'owner')
+        cls.acme = Company.objects.create(name='ACME', owner=cls.owner)
+        cls.beta = Company.objects.create(name='Beta', owner=cls.owner)
+        cls.foreign = Company.objects.create(name='Otra', owner=other_owner)
+
+        acme_team = create_team(cls.acme)
+        beta_team = create_team(cls.beta)
+        foreign_team = create_team(cls.foreign)
+
+        cls.ana_lopez = create_user('ana.lopez@test.com', first_name='Ana', last_name='Lopez')
+        cls.ana_martinez = create_user('ana.martinez@test.com', first_name='Ana', last_name='Martinez')
+        cls.bruno = create_user('bruno@test.com')
+        cls.carla = create_user('carla@test.com')
+        create_user('diego@test.com')
+
+        for team, user in [
+            (acme_team, cls.ana_lopez), (acme_team, cls.bruno),
+            (beta_team, cls.ana_martinez), (foreign_team, cls.carla)
+        ]:
+            TeamMember.objects.create(team=team, user=user, role='member')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+
+    def emails(self, **params):
+        response = self.client.get('/api/auth/employees/', params)
+        self.assertEqual(response.status_code, 200)
+        return [row['email'] for row in response.data['results']]
+
+    def test_owner_sees_only_own_company_teams(self):
+        self.assertEqual(self.emails(), [
+            'ana.lopez@test.com', 'ana.martinez@test.com', 'bruno@test.com'
+        ])
+
+    def test_employee_sees_own_companies(self):
+        self.client.force_authenticate(self.bruno)
+
+        self.assertEqual(self.emails(), ['ana.lopez@test.com', 'bruno@test.com'])
+
+    def test_company_filter(self):
+        self.assertEqual(
+            self.emails(company=self.acme.id), ['ana.lopez@test.com', 'bruno@test.com']
+        )
+        self.assertEqual(self.emails(company=self.foreign.id), [])
+
+    def test_company_filter_must_be_numeric(self):
+        response = self.client.get('/api/auth/employees/', {'company': 'acme'})
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_multi_term_prefix_search(self):
+        self.assertEqual(
+            self.emails(search='ana'), ['ana.lopez@test.com', 'ana.martinez@test.com']
+        )
+        self.assertEqual(self.emails(search='ANA mar'), ['ana.martinez@test.com'])
+        self.assertEqual(self.emails(search='  lopez   ana.l '), ['ana.lopez@test.com'])
+        # Cada término debe coincidir y solo por prefijo
+        self.assertEqual(self.emails(search='ana bruno'), [])
+        self.assertEqual(self.emails(search='opez'), [])
+
+
+# Hasher rápido: se crean más de cien empleados
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class EmployeeDirectoryPaginationTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = create_user('owner@test.com', 'owner')
+        team = create_team(Company.objects.create(name='ACME', owner=cls.owner))
+        for i in range(105):
+            TeamMember.objects.create(
+                team=team, user=create_user(f'e{i:03}@test.com'), role='member'
+            )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+
+    def get(self, **params):
+        return self.client.get('/api/auth/employees/', params).data
+
+    def test_default_page_size(self):
+        data = self.get()
+
+        self.assertEqual(data['count'], 105)
+        self.assertEqual(len(data['results']), 20)
+        self.assertIsNotNone(data['next'])
+
+    def test_page_size_param(self):
+        first = self.get(page_size=50)
+        last = self.get(page_size=50, page=3)
+
+        self.assertEqual(len(first['results']), 50)
+        self.assertEqual(first['results'][0]['email'], 'e000@test.com')
+        self.assertEqual(len(last['results']), 5)
+        self.assertEqual(last['results'][-1]['email'], 'e104@test.com')
+        self.assertIsNone(last['next'])
+
+    def test_page_size_capped(self):
+        self.assertEqual(len(self.get(page_size=500)['results']), 100)
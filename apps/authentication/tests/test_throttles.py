@@ -0,0 +1,63 @@
+from io import StringIO
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from apps.authentication.throttles import AuthRateThrottle
+from core.testing import create_user
+
+
+# Hasher rápido: los tests hacen decenas de logins fallidos
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class AuthThrottleTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = create_user('owner@test.com', 'owner')
+
+    def login(self, email, **extra):
+        return self.client.post(
+            '/api/auth/login/', {'email': email, 'password': 'incorrecta'},
+            format='json', **extra
+        )
+
+    def test_email_limit_returns_429(self):
+        codes = [self.login('Owner@test.com ').status_code for _ in range(6)]
+
+        self.assertEqual(codes, [401] * 5 + [429])
+        self.assertIn('Retry-After', self.login('owner@test.com'))
+
+    def test_ip_limit_ignores_forwarded_for(self):
+        responses = [
+            self.login(f'user{i}@test.com', HTTP_X_FORWARDED_FOR=f'10.0.0.{i}')
+            for i in range(31)
+        ]
+
+        self.assertEqual(responses[29].status_code, 401)
+        self.assertEqual(responses[30].status_code, 429)
+
+    def test_refresh_does_not_use_login_budget(self):
+        for i in range(30):
+            self.login(f'user{i}@test.com')
+
+        refresh = str(RefreshToken.for_user(self.user))
+        response = self.client.post(
+            '/api/auth/token/refresh/', {'refresh': refresh}, format='json'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.login('other@test.com').status_code, 429)
+
+    def test_rejections_are_counted(self):
+        for _ in range(7):
+            self.login('owner@test.com')
+
+        self.assertEqual(AuthRateThrottle.get_rejected_counts()['auth_email'], 2)
+
+        out = StringIO()
+        call_command('auth_throttle_stats', '--reset', stdout=out)
+
+        self.assertIn('auth_email: 2', out.getvalue())
+        self.assertEqual(AuthRateThrottle.get_rejected_counts()['auth_email'], 0)
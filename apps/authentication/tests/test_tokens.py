@@ -0,0 +1,96 @@
+from datetime import timedelta
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken
+from apps.authentication.services import TokenBlacklistService
+from apps.authentication.tokens import CachedRefreshToken
+from core.testing import create_user
+
+
+class TokenRefreshTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = create_user('employee@test.com')
+
+    def refresh(self, token):
+        return self.client.post('/api/auth/token/refresh/', {'refresh': token})
+
+    def test_replayed_refresh_rejected_from_cache(self):
+        token = str(RefreshToken.for_user(self.user))
+
+        response = self.refresh(token)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.data['refresh'], token)
+
+        with self.assertNumQueries(0):
+            response = self.refresh(token)
+
+        self.assertEqual(response.status_code, 401)
+
+    def test_replay_rejected_after_cache_loss(self):
+        token = str(RefreshToken.for_user(self.user))
+        self.refresh(token)
+        cache.clear()
+
+        response = self.refresh(token)
+
+        self.assertEqual(response.status_code, 401)
+
+    def test_rotated_token_blacklisted_once(self):
+        # Los refresh emitidos por rotación no se registran como pendientes
+        rotated = self.refresh(str(RefreshToken.for_user(self.user))).data['refresh']
+        cache.clear()
+
+        token = CachedRefreshToken(rotated)
+        token.blacklist()
+        with self.assertRaises(TokenError):
+            CachedRefreshToken(rotated).blacklist()
+
+        jti = token['jti']
+        self.assertEqual(OutstandingToken.objects.filter(jti=jti).count(), 1)
+        self.assertEqual(BlacklistedToken.objects.filter(token__jti=jti).count(), 1)
+
+
+class PruneExpiredTokensTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user('employee@test.com')
+
+    def create_token(self, jti, expires_at, blacklisted=False):
+        token = OutstandingToken.objects.create(
+            user=self.user, jti=jti, token=jti, expires_at=expires_at
+        )
+        if blacklisted:
+            BlacklistedToken.objects.create(token=token)
+        return token
+
+    def test_prune_deletes_only_expired_across_batches(self):
+        now = timezone.now()
+        kept = []
+        # Expirados y vigentes intercalados para que cada lote cruce ambos
+        for i in range(5):
+            self.create_token(f'expired-{i}', now - timedelta(days=1), blacklisted=i % 2 == 0)
+            kept.append(self.create_token(f'valid-{i}', now + timedelta(days=1), blacklisted=i == 0))
+
+        result = TokenBlacklistService.prune_expired(batch_size=2)
+
+        self.assertEqual(result, {'outstanding': 5, 'blacklisted': 3})
+        self.assertQuerySetEqual(
+            OutstandingToken.objects.order_by('id'), kept
+        )
+        self.assertEqual(BlacklistedToken.objects.get().token_id, kept[0].id)
+
+    def test_prune_dry_run_deletes_nothing(self):
+        self.create_token('expired', timezone.now() - timedelta(days=1), blacklisted=True)
+
+        result = TokenBlacklistService.prune_expired(dry_run=True)
+
+        self.assertEqual(result, {'outstanding': 1, 'blacklisted': 1})
+        self.assertEqual(OutstandingToken.objects.count(), 1)
@@ -0,0 +1,94 @@
+import logging
+from django.core.cache import cache
+from rest_framework.throttling import SimpleRateThrottle
+
+logger = logging.getLogger(__name__)
+
+
+class AuthRateThrottle(SimpleRateThrottle):
+    """
+    Límite de ventana deslizante para los endpoints de autenticación.
+
+    Los throttles de DRF se evalúan antes del método de la vista, así que
+    una petición rechazada responde 429 sin calcular ningún hash de
+    contraseña. El historial de cada clave vive en la cache de Django
+    (compartida entre workers con REDIS_URL). Cada rechazo incrementa un
+    contador por scope (comando auth_throttle_stats).
+    """
+
+    REJECTED_CACHE_KEY = 'auth_throttle_rejected:{scope}'
+
+    def get_cache_key(self, request, view):
+        ident = self.get_ident_value(request)
+        if not ident:
+            return None
+        return self.cache_format % {'scope': self.scope, 'ident': ident}
+
+    def get_ident_value(self, request):
+        raise NotImplementedError
+
+    def throttle_failure(self):
+        key = self.REJECTED_CACHE_KEY.format(scope=self.scope)
+        cache.add(key, 0, None)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # La cache descartó el contador entre add e incr
+            cache.set(key, 1, None)
+        logger.warning('Intento de autenticación limitado (%s): %s', self.scope, self.key)
+        return super().throttle_failure()
+
+    @staticmethod
+    def get_rejected_counts():
+        """Rechazos acumulados por scope"""
+        scopes = [
+            AuthIPThrottle.scope, AuthEmailThrottle.scope, AuthRefreshThrottle.scope
+        ]
+        return {
+            scope: cache.get(AuthRateThrottle.REJECTED_CACHE_KEY.format(scope=scope), 0)
+            for scope in scopes
+        }
+
+    @staticmethod
+    def reset_rejected_counts():
+        """Reinicia los contadores de rechazos"""
+        cache.delete_many([
+            AuthRateThrottle.REJECTED_CACHE_KEY.format(scope=scope)
+            for scope in AuthRateThrottle.get_rejected_counts()
+        ])
+
+
+class AuthIPThrottle(AuthRateThrottle):
+    """Intentos por IP del cliente"""
+
+    scope = 'auth_ip'
+
+    def get_ident_value(self, request):
+        return self.get_ident(request)
+
+
+class AuthRefreshThrottle(AuthIPThrottle):
+    """
+    Refresh de tokens por IP. Scope propio: los refresh normales de una
+    sesión no consumen el límite de login.
+    """
+
+    scope = 'auth_refresh'
+
+
+class AuthEmailThrottle(AuthRateThrottle):
+    """
+    Intentos por email: el del body (login, registro) o el del usuario
+    autenticado (cambio de contraseña). Sin email no aplica.
+    """
+
+    scope = 'auth_email'
+
+    def get_ident_value(self, request):
+        if request.user and request.user.is_authenticated:
+            return request.user.email.lower()
+
+        email = request.data.get('email') if hasattr(request.data, 'get') else None
+        if not isinstance(email, str):
+            return None
+        return email.strip().lower() or None
@@ -0,0 +1,26 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from .services import TokenBlacklistService
+
+
+class CachedRefreshToken(RefreshToken):
+    """
+    RefreshToken que consulta la lista negra a través de
+    TokenBlacklistService: cache primero y una sola consulta si no está.
+    El id del token pendiente se reutiliza al ponerlo en lista negra.
+    """
+
+    _outstanding_id = None
+
+    def check_blacklist(self):
+        self._outstanding_id, blacklisted = TokenBlacklistService.get_outstanding(
+            self.payload[api_settings.JTI_CLAIM], self.payload['exp']
+        )
+        if blacklisted:
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self):
+        if not TokenBlacklistService.blacklist(self, self._outstanding_id):
+            raise TokenError(_("Token is blacklisted"))
@@ -4,13 +4,14 @@ from .views import (
     RegisterView, LoginView, ProfileView,
     ChangePasswordView, EmployeeListView
 )
+from .throttles import AuthRefreshThrottle
 
 app_name = 'authentication'
 
 urlpatterns = [
     path('register/', RegisterView.as_view(), name='register'),
     path('login/', LoginView.as_view(), name='login'),
-    path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('token/refresh/', TokenRefreshView.as_view(throttle_classes=[AuthRefreshThrottle]), name='token_refresh'),
     path('profile/', ProfileView.as_view(), name='profile'),
     path('change-password/', ChangePasswordView.as_view(), name='change_password'),
     path('employees/', EmployeeListView.as_view(), name='employees'),
@@ -1,15 +1,19 @@
 from rest_framework import status, generics
+from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import authenticate, get_user_model
+from django.db.models import Q
 from .serializers import (
     UserSerializer,
+    EmployeeDirectorySerializer,
     RegisterSerializer,
     LoginSerializer,
     ChangePasswordSerializer
 )
+from .throttles import AuthIPThrottle, AuthEmailThrottle
 
 User = get_user_model()
 
@@ -17,6 +21,7 @@ User = get_user_model()
 class RegisterView(generics.CreateAPIView):
     """Registro de nuevos usuarios"""
     permission_classes = [AllowAny]
+    throttle_classes = [AuthIPThrottle, AuthEmailThrottle]
     serializer_class = RegisterSerializer
 
     def create(self, request, *args, **kwargs):
@@ -39,6 +44,7 @@ class RegisterView(generics.CreateAPIView):
 class LoginView(generics.GenericAPIView):
     """Login de usuarios"""
     permission_classes = [AllowAny]
+    throttle_classes = [AuthIPThrottle, AuthEmailThrottle]
     serializer_class = LoginSerializer
 
     def post(self, request):
@@ -95,6 +101,7 @@ class ProfileView(generics.RetrieveUpdateAPIView):
 class ChangePasswordView(APIView):
     """Cambiar contraseña del usuario"""
     permission_classes = [IsAuthenticated]
+    throttle_classes = [AuthIPThrottle, AuthEmailThrottle]
 
     def post(self, request):
         serializer = ChangePasswordSerializer(data=request.data)
@@ -123,25 +130,92 @@ class ChangePasswordView(APIView):
         }, status=status.HTTP_200_OK)
 
 
-class EmployeeListView(APIView):
-    """Lista de empleados filtrada por compañía"""
+class EmployeeDirectoryPagination(PageNumberPagination):
+    """Páginas de 20 empleados; el selector puede pedir hasta 100"""
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class EmployeeListView(generics.ListAPIView):
+    """
+    GET /api/auth/employees/
+
+    Directorio de empleados activos, paginado.
+
+    Query params:
+    - company: ID de empresa (opcional)
+    - search: prefijo de nombre, apellido o email; con varias palabras
+      cada una debe coincidir con alguno de los campos
+    - unassigned: true para buscar un empleado sin ningún equipo por su
+      email exacto (parámetro email; solo owners, para invitarlo a sus
+      equipos). No permite recorrer empleados de otras empresas.
+
+    Alcance por membresía de equipos: owners ven los empleados de los
+    equipos de sus empresas; employees, los de las empresas donde son
+    miembros.
+    """
     permission_classes = [IsAuthenticated]
+    serializer_class = EmployeeDirectorySerializer
+    pagination_class = EmployeeDirectoryPagination
 
-    def get(self, request):
-        user = request.user
+    def list(self, request, *args, **kwargs):
         company_id = request.query_params.get('company')
+        if company_id and not company_id.isdigit():
+            return Response(
+                {'error': 'company debe ser un ID numérico'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if self.is_unassigned_lookup() and not request.query_params.get('email', '').strip():
+            return Response(
+                {'error': 'unassigned=true requiere el email exacto del empleado'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return super().list(request, *args, **kwargs)
+
+    def is_unassigned_lookup(self):
+        """Búsqueda de un empleado sin equipo por email (solo owners)"""
+        return (
+            self.request.query_params.get('unassigned') == 'true'
+            and self.request.user.user_type == 'owner'
+        )
+
+    def get_queryset(self):
+        from apps.teams.models import TeamMember
+
+        user = self.request.user
+        params = self.request.query_params
+        company_id = params.get('company')
+
+        employees = User.objects.filter(
+            user_type='employee',
+            is_active=True
+        ).only('id', 'email', 'first_name', 'last_name')
+
+        if self.is_unassigned_lookup():
+            # Solo coincidencia exacta: a lo sumo un resultado
+            return employees.filter(
+                email__iexact=params['email'].strip()
+            ).exclude(
+                id__in=TeamMember.objects.values('user_id')
+            ).order_by('id')
 
-        # Filtrar empleados tipo 'employee'
-        employees = User.objects.filter(user_type='employee', is_active=True)
-
-        # Si el usuario es owner, filtrar por sus compañías
         if user.user_type == 'owner':
-            from apps.companies.models import Company
-            companies = Company.objects.filter(owner=user)
-            if company_id:
-                companies = companies.filter(id=company_id)
-            # No aplicamos filtro de compañía aquí, devolvemos todos los employees
-            # El owner puede asignar cualquier employee a sus equipos
-
-        serializer = UserSerializer(employees, many=True)
-        return Response(serializer.data)
+            memberships = TeamMember.objects.filter(company__owner=user)
+        else:
+            memberships = TeamMember.objects.filter(
+                company_id__in=TeamMember.objects.filter(user=user).values('company_id')
+            )
+        if company_id:
+            memberships = memberships.filter(company_id=company_id)
+        employees = employees.filter(id__in=memberships.values('user_id'))
+
+        # Cada término usa los índices UPPER(...) de prefijo (migración 0002)
+        for term in params.get('search', '').split():
+            employees = employees.filter(
+                Q(first_name__istartswith=term) |
+                Q(last_name__istartswith=term) |
+                Q(email__istartswith=term)
+            )
+
+        return employees.order_by('first_name', 'last_name', 'id')
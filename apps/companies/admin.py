@@ -47,7 +47,7 @@ class BranchAdmin(admin.ModelAdmin):
 @admin.register(Department)
 class DepartmentAdmin(admin.ModelAdmin):
     list_display = ['name', 'branch', 'get_company', 'created_at']
-    list_filter = ['created_at', 'branch__company']
+    list_filter = ['created_at', 'company']
     search_fields = ['name', 'branch__name', 'branch__company__name']
     readonly_fields = ['created_at', 'updated_at']
 
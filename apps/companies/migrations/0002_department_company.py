@@ -0,0 +1,45 @@
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def populate_company(apps, schema_editor):
+    Branch = apps.get_model('companies', 'Branch')
+    Department = apps.get_model('companies', 'Department')
+
+    Department.objects.update(
+        company_id=Subquery(
+            Branch.objects.filter(id=OuterRef('branch_id')).values('company_id')[:1]
+        )
+    )
+
+    # En PostgreSQL las FK son DEFERRABLE INITIALLY DEFERRED: el UPDATE deja
+    # verificaciones pendientes y el ALTER TABLE posterior (misma
+    # transacción) fallaría con "pending trigger events". Se ejecutan ahora.
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='department',
+            name='company',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='departments', to='companies.company', verbose_name='Empresa'),
+        ),
+        migrations.RunPython(populate_company, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='department',
+            name='company',
+            field=models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='departments', to='companies.company', verbose_name='Empresa'),
+        ),
+        migrations.AddIndex(
+            model_name='department',
+            index=models.Index(fields=['company'], name='departments_company_d64605_idx'),
+        ),
+    ]
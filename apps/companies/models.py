@@ -53,13 +53,23 @@ class Company(models.Model):
 
     @property
     def total_branches(self):
-        """Cantidad total de sucursales"""
+        """
+        Cantidad total de sucursales.
+        Usa la anotación branches_count del queryset si está disponible.
+        """
+        if hasattr(self, 'branches_count'):
+            return self.branches_count
         return self.branches.count()
 
     @property
     def total_departments(self):
-        """Cantidad total de departamentos en todas las sucursales"""
-        return Department.objects.filter(branch__company=self).count()
+        """
+        Cantidad total de departamentos en todas las sucursales.
+        Usa la anotación departments_count del queryset si está disponible.
+        """
+        if hasattr(self, 'departments_count'):
+            return self.departments_count
+        return self.departments.count()
 
 
 class Branch(models.Model):
@@ -115,9 +125,43 @@ class Branch(models.Model):
     def __str__(self):
         return f"{self.company.name} - {self.name}"
 
+    def save(self, *args, **kwargs):
+        """
+        Propaga la empresa a departamentos, equipos y miembros si cambia.
+
+        update() no dispara señales: se invalida explícitamente la
+        jerarquía cacheada de la empresa anterior y de la nueva.
+        """
+        adding = self._state.adding
+        previous_company_id = None
+        if not adding:
+            previous_company_id = Branch.objects.filter(
+                pk=self.pk
+            ).values_list('company_id', flat=True).first()
+
+        super().save(*args, **kwargs)
+        if adding or previous_company_id == self.company_id:
+            return
+
+        from apps.teams.models import Team, TeamMember
+        from apps.teams.services.team_service import TeamService
+        for model in (Department, Team, TeamMember):
+            model.objects.filter(branch=self).exclude(
+                company_id=self.company_id
+            ).update(company_id=self.company_id)
+
+        for company_id in (previous_company_id, self.company_id):
+            if company_id is not None:
+                TeamService.invalidate_hierarchy(company_id)
+
     @property
     def total_departments(self):
-        """Cantidad de departamentos en esta sucursal"""
+        """
+        Cantidad de departamentos en esta sucursal.
+        Usa la anotación departments_count del queryset si está disponible.
+        """
+        if hasattr(self, 'departments_count'):
+            return self.departments_count
         return self.departments.count()
 
 
@@ -134,6 +178,14 @@ class Department(models.Model):
         related_name='departments',
         verbose_name='Sucursal'
     )
+    # Desnormalizado desde branch; se mantiene en save()
+    company = models.ForeignKey(
+        Company,
+        on_delete=models.CASCADE,
+        related_name='departments',
+        editable=False,
+        verbose_name='Empresa'
+    )
     description = models.TextField(
         blank=True,
         verbose_name='Descripción'
@@ -149,7 +201,38 @@ class Department(models.Model):
         ordering = ['branch', 'name']
         indexes = [
             models.Index(fields=['branch']),
+            models.Index(fields=['company']),
         ]
 
     def __str__(self):
         return f"{self.branch.name} - {self.name}"
+
+    def save(self, *args, **kwargs):
+        """
+        Sincroniza company con la sucursal y la propaga a equipos y miembros.
+        Si cambia de empresa invalida también la jerarquía de la anterior
+        (la señal post_save solo conoce la nueva).
+        """
+        self.company_id = self.branch.company_id
+        adding = self._state.adding
+        previous_company_id = None
+        if not adding:
+            previous_company_id = Department.objects.filter(
+                pk=self.pk
+            ).values_list('company_id', flat=True).first()
+
+        super().save(*args, **kwargs)
+        if adding:
+            return
+
+        from apps.teams.models import Team, TeamMember
+        Team.objects.filter(department=self).exclude(
+            branch_id=self.branch_id, company_id=self.company_id
+        ).update(branch_id=self.branch_id, company_id=self.company_id)
+        TeamMember.objects.filter(team__department=self).exclude(
+            branch_id=self.branch_id, company_id=self.company_id
+        ).update(branch_id=self.branch_id, company_id=self.company_id)
+
+        if previous_company_id not in (None, self.company_id):
+            from apps.teams.services.team_service import TeamService
+            TeamService.invalidate_hierarchy(previous_company_id)
@@ -13,7 +13,7 @@ class DepartmentSerializer(serializers.ModelSerializer):
         read_only=True
     )
     company_name = serializers.CharField(
-        source='branch.company.name',
+        source='company.name',
         read_only=True
     )
 
@@ -0,0 +1,3 @@
+from .company_service import CompanyService
+
+__all__ = ['CompanyService']
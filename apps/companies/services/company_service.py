@@ -0,0 +1,97 @@
+from django.db.models import Count, Max, Q, Sum
+from apps.audits.models import Audit
+from apps.companies.models import Branch
+
+
+class CompanyService:
+    """
+    Servicio para estadísticas de una empresa.
+    """
+
+    @staticmethod
+    def _audit_block(row):
+        """Conteos por estado, promedio y última completada de un grupo de auditorías"""
+        completed = row['completed']
+        return {
+            'total': row['total'],
+            'by_status': {
+                status: row[status] for status, _ in Audit.STATUS_CHOICES
+            },
+            'average_score': round(float(row['score_sum'] or 0) / completed, 2) if completed else None,
+            'last_completed_at': row['last_completed_at'].isoformat() if row['last_completed_at'] else None
+        }
+
+    @staticmethod
+    def get_company_stats(company):
+        """
+        Estadísticas de estructura y auditorías de una empresa con dos
+        consultas agrupadas: sucursales (con sus departamentos) y
+        auditorías por sucursal. Los totales de la empresa se suman en
+        memoria a partir de esas filas.
+
+        Retorna dict con los conteos de estructura y un bloque audits con
+        totales por estado, promedio de score (auditorías completadas),
+        última auditoría completada y el mismo detalle por sucursal.
+        """
+        branches = list(Branch.objects.filter(
+            company=company
+        ).values(
+            'id', 'name', 'is_active', 'manager_id'
+        ).annotate(
+            departments_count=Count('departments')
+        ).order_by('name'))
+
+        status_counts = {
+            status: Count('id', filter=Q(status=status))
+            for status, _ in Audit.STATUS_CHOICES
+        }
+        rows = Audit.objects.filter(
+            company=company
+        ).values('branch_id').annotate(
+            total=Count('id'),
+            score_sum=Sum('score_percentage', filter=Q(status='completed')),
+            last_completed_at=Max('completed_at', filter=Q(status='completed')),
+            **status_counts
+        ).order_by()
+
+        empty = {
+            'total': 0, 'score_sum': 0, 'last_completed_at': None,
+            **{status: 0 for status in status_counts}
+        }
+        totals = dict(empty)
+        by_branch = {}
+        for row in rows:
+            by_branch[row['branch_id']] = row
+            for key in ['total', *status_counts]:
+                totals[key] += row[key]
+            totals['score_sum'] += row['score_sum'] or 0
+            if row['last_completed_at'] and (
+                totals['last_completed_at'] is None or
+                row['last_completed_at'] > totals['last_completed_at']
+            ):
+                totals['last_completed_at'] = row['last_completed_at']
+
+        branches_data = []
+        for branch in branches:
+            row = by_branch.get(branch['id'], empty)
+            branches_data.append({
+                'branch_id': branch['id'],
+                'branch_name': branch['name'],
+                'is_active': branch['is_active'],
+                'departments_count': branch['departments_count'],
+                **CompanyService._audit_block(row)
+            })
+
+        audits = CompanyService._audit_block(totals)
+        # Auditorías sin sucursal asignada
+        audits['without_branch'] = by_branch[None]['total'] if None in by_branch else 0
+        audits['branches'] = branches_data
+
+        return {
+            'company_name': company.name,
+            'total_branches': len(branches),
+            'active_branches': sum(1 for b in branches if b['is_active']),
+            'total_departments': sum(b['departments_count'] for b in branches),
+            'branches_with_manager': sum(1 for b in branches if b['manager_id']),
+            'audits': audits
+        }
@@ -0,0 +1,58 @@
+from django.core.cache import cache
+from django.test import TestCase
+from apps.companies.models import Company, Branch, Department
+from apps.teams.services.team_service import TeamService
+from core.testing import create_user
+
+
+class CompanyChangeCacheTests(TestCase):
+    """Mover nodos entre empresas invalida la jerarquía de ambas"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = create_user('owner@test.com', 'owner')
+        cls.source = Company.objects.create(name='Origen', owner=cls.owner)
+        cls.target = Company.objects.create(name='Destino', owner=cls.owner)
+
+    def setUp(self):
+        cache.clear()
+        self.branch = Branch.objects.create(name='Centro', company=self.source)
+        self.department = Department.objects.create(name='Ventas', branch=self.branch)
+
+    def cached(self, company):
+        return cache.get(TeamService.HIERARCHY_CACHE_KEY.format(company_id=company.id))
+
+    def warm(self):
+        for company in (self.source, self.target):
+            TeamService.get_hierarchy(company.id)
+            self.assertIsNotNone(self.cached(company))
+
+    def test_branch_move_invalidates_both_companies(self):
+        self.warm()
+
+        self.branch.company = self.target
+        self.branch.save()
+
+        self.assertIsNone(self.cached(self.source))
+        self.assertIsNone(self.cached(self.target))
+        self.department.refresh_from_db()
+        self.assertEqual(self.department.company_id, self.target.id)
+
+    def test_department_move_invalidates_both_companies(self):
+        other = Branch.objects.create(name='Norte', company=self.target)
+        self.warm()
+
+        self.department.branch = other
+        self.department.save()
+
+        self.assertIsNone(self.cached(self.source))
+        self.assertIsNone(self.cached(self.target))
+
+    def test_branch_rename_keeps_other_company_cached(self):
+        self.warm()
+
+        self.branch.name = 'Sur'
+        self.branch.save()
+
+        self.assertIsNone(self.cached(self.source))
+        self.assertIsNotNone(self.cached(self.target))
@@ -0,0 +1,65 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from apps.companies.models import Company, Branch, Department
+from core.testing import create_user
+
+
+class ListQueryCountTests(TestCase):
+    """Las listas usan un número de consultas fijo (sin N+1)"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = create_user('owner@test.com', 'owner')
+        cls.manager = create_user('manager@test.com')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+
+    def create_company(self, index):
+        """Empresa con dos sucursales y un departamento en cada una"""
+        company = Company.objects.create(name=f'Empresa {index}', owner=self.owner)
+        for number in range(2):
+            branch = Branch.objects.create(
+                name=f'Sucursal {index}-{number}', company=company, manager=self.manager
+            )
+            Department.objects.create(name='Ventas', branch=branch)
+        return company
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(context), response.data['results']
+
+    def test_company_list(self):
+        self.create_company(0)
+        one, results = self.count_queries('/api/companies/')
+        self.assertEqual(len(results), 1)
+
+        for index in range(1, 5):
+            self.create_company(index)
+        many, results = self.count_queries('/api/companies/')
+
+        self.assertEqual(len(results), 5)
+        self.assertEqual(many, one)
+        self.assertEqual(
+            {(row['total_branches'], row['total_departments']) for row in results},
+            {(2, 2)}
+        )
+
+    def test_branch_list(self):
+        self.create_company(0)
+        one, results = self.count_queries('/api/branches/')
+        self.assertEqual(len(results), 2)
+
+        for index in range(1, 5):
+            self.create_company(index)
+        many, results = self.count_queries('/api/branches/')
+
+        self.assertEqual(len(results), 10)
+        self.assertEqual(many, one)
+        self.assertEqual({row['total_departments'] for row in results}, {1})
+        self.assertEqual({row['manager_name'] for row in results}, {'Manager Test'})
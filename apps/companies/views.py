@@ -2,7 +2,8 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.db.models import Count
+from django.db.models import Count, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Coalesce
 from .models import Company, Branch, Department
 from .serializers import (
     CompanySerializer, CompanyListSerializer,
@@ -10,6 +11,7 @@ from .serializers import (
     DepartmentSerializer, DepartmentListSerializer
 )
 from .permissions import IsCompanyOwner, IsCompanyOwnerOrReadOnly
+from .services import CompanyService
 
 
 class CompanyViewSet(viewsets.ModelViewSet):
@@ -32,7 +34,33 @@ class CompanyViewSet(viewsets.ModelViewSet):
         user = self.request.user
 
         if user.user_type == 'owner':
-            return Company.objects.filter(owner=user)
+            # Conteos con subconsultas (sin multiplicar filas por el join
+            # sucursales x departamentos)
+            branches = Branch.objects.filter(
+                company=OuterRef('pk')
+            ).order_by().values('company')
+            departments = Department.objects.filter(
+                company=OuterRef('pk')
+            ).order_by().values('company')
+
+            queryset = Company.objects.filter(owner=user).annotate(
+                branches_count=Coalesce(
+                    Subquery(branches.annotate(total=Count('id')).values('total')), 0
+                ),
+                departments_count=Coalesce(
+                    Subquery(departments.annotate(total=Count('id')).values('total')), 0
+                )
+            )
+
+            if self.action in ['retrieve', 'branches']:
+                queryset = queryset.prefetch_related(Prefetch(
+                    'branches',
+                    queryset=Branch.objects.select_related('manager').annotate(
+                        departments_count=Count('departments')
+                    ).order_by('name')
+                ))
+
+            return queryset
         else:
             # Employees ven empresas donde están asignados
             # Por ahora retornamos vacío, se implementará con Teams en Fase 3
@@ -76,23 +104,11 @@ class CompanyViewSet(viewsets.ModelViewSet):
     def stats(self, request, pk=None):
         """
         Endpoint personalizado: GET /api/companies/{id}/stats/
-        Estadísticas de la empresa
+        Estadísticas de estructura y auditorías de la empresa
+        (global y por sucursal)
         """
         company = self.get_object()
-
-        stats = {
-            'company_name': company.name,
-            'total_branches': company.branches.count(),
-            'active_branches': company.branches.filter(is_active=True).count(),
-            'total_departments': Department.objects.filter(
-                branch__company=company
-            ).count(),
-            'branches_with_manager': company.branches.filter(
-                manager__isnull=False
-            ).count(),
-        }
-
-        return Response(stats)
+        return Response(CompanyService.get_company_stats(company))
 
 
 class BranchViewSet(viewsets.ModelViewSet):
@@ -111,11 +127,18 @@ class BranchViewSet(viewsets.ModelViewSet):
 
         if user.user_type == 'owner':
             # Owners ven sucursales de sus empresas
-            return Branch.objects.filter(
+            queryset = Branch.objects.filter(
                 company__owner=user
             ).select_related(
                 'company', 'manager'
-            )
+            ).annotate(
+                departments_count=Count('departments')
+            ).order_by('company', 'name')
+
+            if self.action in ['retrieve', 'departments']:
+                queryset = queryset.prefetch_related('departments')
+
+            return queryset
         else:
             # Employees ven sucursales donde trabajan
             return Branch.objects.none()
@@ -191,8 +214,8 @@ class DepartmentViewSet(viewsets.ModelViewSet):
         if user.user_type == 'owner':
             # Owners ven departamentos de sus empresas
             return Department.objects.filter(
-                branch__company__owner=user
-            ).select_related('branch', 'branch__company')
+                company__owner=user
+            ).select_related('branch', 'company')
         else:
             # Employees ven departamentos donde trabajan
             return Department.objects.none()
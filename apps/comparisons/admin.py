@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Comparison, ComparisonAudit, Recommendation
+from .models import Comparison, ComparisonAudit, Recommendation, RecommendationRule
 
 
 class ComparisonAuditInline(admin.TabularInline):
@@ -51,3 +51,34 @@ class RecommendationAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
     )
+
+
+@admin.register(RecommendationRule)
+class RecommendationRuleAdmin(admin.ModelAdmin):
+    list_display = [
+        'name', 'scope', 'template', 'company', 'category',
+        'min_percentage', 'max_percentage', 'priority', 'is_active'
+    ]
+    list_filter = ['scope', 'priority', 'is_active', 'template', 'company']
+    search_fields = ['name', 'category', 'text_template']
+    readonly_fields = ['created_at', 'updated_at']
+    raw_id_fields = ['question']
+
+    fieldsets = (
+        ('Información Básica', {
+            'fields': ('name', 'scope', 'order', 'is_active')
+        }),
+        ('Alcance', {
+            'fields': ('template', 'company', 'category', 'question', 'response_type')
+        }),
+        ('Condición', {
+            'fields': ('min_percentage', 'max_percentage')
+        }),
+        ('Recomendación', {
+            'fields': ('priority', 'text_template')
+        }),
+        ('Metadata', {
+            'fields': ('created_at', 'updated_at'),
+            'classes': ('collapse',)
+        }),
+    )
@@ -5,3 +5,6 @@ class ComparisonsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.comparisons'
     verbose_name = 'Comparaciones y Recomendaciones'
+
+    def ready(self):
+        from . import signals  # noqa: F401
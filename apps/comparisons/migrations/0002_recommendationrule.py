@@ -0,0 +1,44 @@
+# Generated by Django 5.0 on 2026-10-18 23:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0001_initial'),
+        ('comparisons', '0001_initial'),
+        ('templates', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecommendationRule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=200, verbose_name='Nombre de la Regla')),
+                ('scope', models.CharField(choices=[('category', 'Por Categoría'), ('general', 'Score General'), ('question', 'Por Pregunta')], default='category', max_length=20, verbose_name='Alcance')),
+                ('category', models.CharField(blank=True, help_text='Vacío = aplica a todas las categorías', max_length=200, verbose_name='Categoría')),
+                ('response_type', models.CharField(blank=True, choices=[('yes', 'Sí'), ('no', 'No'), ('partial', 'Parcial'), ('na', 'No Aplica')], help_text='Solo para reglas por pregunta. Dispara la regla con este tipo de respuesta', max_length=10, verbose_name='Tipo de Respuesta')),
+                ('min_percentage', models.DecimalField(blank=True, decimal_places=2, help_text='Límite inferior inclusivo. Vacío = sin límite', max_digits=5, null=True, verbose_name='Porcentaje Mínimo')),
+                ('max_percentage', models.DecimalField(blank=True, decimal_places=2, help_text='Límite superior exclusivo. Vacío = sin límite', max_digits=5, null=True, verbose_name='Porcentaje Máximo')),
+                ('priority', models.CharField(choices=[('high', 'Alta'), ('medium', 'Media'), ('low', 'Baja')], max_length=20, verbose_name='Prioridad')),
+                ('text_template', models.TextField(help_text='Variables disponibles: {category}, {percentage}, {question}, {order_num}, {score}, {max_score}', verbose_name='Plantilla de Texto')),
+                ('order', models.IntegerField(default=0, help_text='Desempate entre reglas con la misma especificidad', verbose_name='Orden')),
+                ('is_active', models.BooleanField(default=True, verbose_name='Activa')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('company', models.ForeignKey(blank=True, help_text='Vacío = aplica a todas las empresas', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='recommendation_rules', to='companies.company', verbose_name='Empresa')),
+                ('question', models.ForeignKey(blank=True, help_text='Solo para reglas por pregunta. Vacío = cualquier pregunta', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='recommendation_rules', to='templates.templatequestion', verbose_name='Pregunta')),
+                ('template', models.ForeignKey(blank=True, help_text='Vacío = aplica a todas las plantillas', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='recommendation_rules', to='templates.audittemplate', verbose_name='Plantilla')),
+            ],
+            options={
+                'verbose_name': 'Regla de Recomendación',
+                'verbose_name_plural': 'Reglas de Recomendación',
+                'db_table': 'recommendation_rules',
+                'ordering': ['scope', 'order', 'id'],
+                'indexes': [models.Index(fields=['template', 'is_active'], name='recommendat_templat_339b57_idx'), models.Index(fields=['company', 'is_active'], name='recommendat_company_9f0fc0_idx')],
+            },
+        ),
+    ]
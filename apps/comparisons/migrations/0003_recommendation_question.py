@@ -0,0 +1,20 @@
+# Generated by Django 5.0 on 2026-10-18 23:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('comparisons', '0002_recommendationrule'),
+        ('templates', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recommendation',
+            name='question',
+            field=models.ForeignKey(blank=True, help_text='Solo para recomendaciones a nivel de pregunta', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='recommendations', to='templates.templatequestion', verbose_name='Pregunta'),
+        ),
+    ]
@@ -1,6 +1,8 @@
 from django.db import models
 from django.conf import settings
-from apps.audits.models import Audit
+from apps.audits.models import Audit, AuditResponse
+from apps.companies.models import Company
+from apps.templates.models import AuditTemplate, TemplateQuestion
 
 
 class Comparison(models.Model):
@@ -47,7 +49,12 @@ class Comparison(models.Model):
 
     @property
     def audit_count(self):
-        """Cantidad de auditorías en la comparación"""
+        """
+        Cantidad de auditorías en la comparación.
+        Usa la anotación audits_count del queryset si está disponible.
+        """
+        if hasattr(self, 'audits_count'):
+            return self.audits_count
         return self.audits.count()
 
 
@@ -104,6 +111,15 @@ class Recommendation(models.Model):
         max_length=200,
         verbose_name='Categoría'
     )
+    question = models.ForeignKey(
+        TemplateQuestion,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='recommendations',
+        verbose_name='Pregunta',
+        help_text='Solo para recomendaciones a nivel de pregunta'
+    )
     recommendation_text = models.TextField(
         verbose_name='Texto de Recomendación'
     )
@@ -140,3 +156,123 @@ class Recommendation(models.Model):
 
     def __str__(self):
         return f"{self.audit.title} - {self.category} ({self.get_priority_display()})"
+
+
+class RecommendationRule(models.Model):
+    """
+    Regla configurable para la generación automática de recomendaciones.
+
+    Una regla aplica a una banda de porcentaje [min_percentage, max_percentage)
+    y puede limitarse a una plantilla, a una empresa, a una categoría o a una
+    pregunta concreta. Las reglas más específicas tienen precedencia.
+    """
+
+    SCOPE_CHOICES = [
+        ('category', 'Por Categoría'),
+        ('general', 'Score General'),
+        ('question', 'Por Pregunta'),
+    ]
+
+    name = models.CharField(
+        max_length=200,
+        verbose_name='Nombre de la Regla'
+    )
+    scope = models.CharField(
+        max_length=20,
+        choices=SCOPE_CHOICES,
+        default='category',
+        verbose_name='Alcance'
+    )
+    template = models.ForeignKey(
+        AuditTemplate,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='recommendation_rules',
+        verbose_name='Plantilla',
+        help_text='Vacío = aplica a todas las plantillas'
+    )
+    company = models.ForeignKey(
+        Company,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='recommendation_rules',
+        verbose_name='Empresa',
+        help_text='Vacío = aplica a todas las empresas'
+    )
+    category = models.CharField(
+        max_length=200,
+        blank=True,
+        verbose_name='Categoría',
+        help_text='Vacío = aplica a todas las categorías'
+    )
+    question = models.ForeignKey(
+        TemplateQuestion,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='recommendation_rules',
+        verbose_name='Pregunta',
+        help_text='Solo para reglas por pregunta. Vacío = cualquier pregunta'
+    )
+    response_type = models.CharField(
+        max_length=10,
+        blank=True,
+        choices=AuditResponse.RESPONSE_TYPE_CHOICES,
+        verbose_name='Tipo de Respuesta',
+        help_text='Solo para reglas por pregunta. Dispara la regla con este tipo de respuesta'
+    )
+    min_percentage = models.DecimalField(
+        max_digits=5,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        verbose_name='Porcentaje Mínimo',
+        help_text='Límite inferior inclusivo. Vacío = sin límite'
+    )
+    max_percentage = models.DecimalField(
+        max_digits=5,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        verbose_name='Porcentaje Máximo',
+        help_text='Límite superior exclusivo. Vacío = sin límite'
+    )
+    priority = models.CharField(
+        max_length=20,
+        choices=Recommendation.PRIORITY_CHOICES,
+        verbose_name='Prioridad'
+    )
+    text_template = models.TextField(
+        verbose_name='Plantilla de Texto',
+        help_text=(
+            'Variables disponibles: {category}, {percentage}, '
+            '{question}, {order_num}, {score}, {max_score}'
+        )
+    )
+    order = models.IntegerField(
+        default=0,
+        verbose_name='Orden',
+        help_text='Desempate entre reglas con la misma especificidad'
+    )
+    is_active = models.BooleanField(
+        default=True,
+        verbose_name='Activa'
+    )
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'recommendation_rules'
+        verbose_name = 'Regla de Recomendación'
+        verbose_name_plural = 'Reglas de Recomendación'
+        ordering = ['scope', 'order', 'id']
+        indexes = [
+            models.Index(fields=['template', 'is_active']),
+            models.Index(fields=['company', 'is_active']),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.get_scope_display()})"
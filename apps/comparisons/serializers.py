@@ -1,6 +1,7 @@
 from rest_framework import serializers
-from .models import Comparison, ComparisonAudit, Recommendation
+from .models import Comparison, ComparisonAudit, Recommendation, RecommendationRule
 from apps.audits.serializers import AuditListSerializer
+from .services.comparison_service import ComparisonService
 
 
 class RecommendationSerializer(serializers.ModelSerializer):
@@ -19,11 +20,11 @@ class RecommendationSerializer(serializers.ModelSerializer):
     class Meta:
         model = Recommendation
         fields = [
-            'id', 'audit', 'audit_title', 'category',
+            'id', 'audit', 'audit_title', 'category', 'question',
             'recommendation_text', 'priority', 'is_auto_generated',
             'created_by', 'created_by_name', 'created_at'
         ]
-        read_only_fields = ['id', 'created_at']
+        read_only_fields = ['id', 'question', 'created_at']
 
 
 class RecommendationCreateSerializer(serializers.ModelSerializer):
@@ -42,6 +43,89 @@ class RecommendationCreateSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
+class RecommendationRuleSerializer(serializers.ModelSerializer):
+    """Serializer para Reglas de Recomendación"""
+
+    scope_display = serializers.CharField(
+        source='get_scope_display',
+        read_only=True
+    )
+
+    class Meta:
+        model = RecommendationRule
+        fields = [
+            'id', 'name', 'scope', 'scope_display', 'template', 'company',
+            'category', 'question', 'response_type', 'min_percentage',
+            'max_percentage', 'priority', 'text_template', 'order',
+            'is_active', 'created_at', 'updated_at'
+        ]
+        read_only_fields = ['id', 'created_at', 'updated_at']
+
+    def validate_text_template(self, value):
+        """Validar que la plantilla de texto sea formateable"""
+        try:
+            value.format_map({
+                'category': '', 'percentage': 0.0, 'question': '',
+                'order_num': 0, 'score': 0, 'max_score': 0
+            })
+        except (KeyError, ValueError, IndexError, AttributeError):
+            raise serializers.ValidationError(
+                "La plantilla de texto contiene variables no válidas"
+            )
+        return value
+
+    def validate(self, attrs):
+        """Validar alcance, pertenencia y banda de porcentajes"""
+        user = self.context['request'].user
+
+        def current(field):
+            if field in attrs:
+                return attrs[field]
+            return getattr(self.instance, field, None) if self.instance else None
+
+        template = current('template')
+        company = current('company')
+        question = current('question')
+        scope = current('scope') or 'category'
+        min_percentage = current('min_percentage')
+        max_percentage = current('max_percentage')
+
+        if company is None and template is None:
+            raise serializers.ValidationError(
+                "La regla debe asociarse a una empresa o a una plantilla"
+            )
+
+        if company is not None and company.owner != user:
+            raise serializers.ValidationError({
+                'company': 'No tienes permiso sobre esta empresa'
+            })
+
+        if company is None and template.created_by != user:
+            raise serializers.ValidationError({
+                'template': 'Solo el creador de la plantilla puede definir reglas globales para ella'
+            })
+
+        if question is not None:
+            if scope != 'question':
+                raise serializers.ValidationError({
+                    'question': 'Solo las reglas por pregunta pueden referenciar una pregunta'
+                })
+            if template is None or question.template_id != template.id:
+                raise serializers.ValidationError({
+                    'question': 'La pregunta no pertenece a la plantilla de la regla'
+                })
+
+        if (
+            min_percentage is not None and max_percentage is not None and
+            min_percentage >= max_percentage
+        ):
+            raise serializers.ValidationError({
+                'max_percentage': 'El porcentaje máximo debe ser mayor al mínimo'
+            })
+
+        return attrs
+
+
 class ComparisonAuditSerializer(serializers.ModelSerializer):
     """Serializer para auditorías en comparación"""
 
@@ -83,20 +167,20 @@ class ComparisonCreateSerializer(serializers.Serializer):
     description = serializers.CharField(required=False, allow_blank=True)
     audit_ids = serializers.ListField(
         child=serializers.IntegerField(),
-        min_length=2,
-        max_length=5,
+        min_length=ComparisonService.MIN_AUDITS,
+        max_length=ComparisonService.MAX_AUDITS,
         write_only=True
     )
 
     def validate_audit_ids(self, value):
-        """Validar que haya entre 2 y 5 auditorías"""
-        if len(value) < 2:
+        """Validar que haya entre MIN_AUDITS y MAX_AUDITS auditorías"""
+        if len(value) < ComparisonService.MIN_AUDITS:
             raise serializers.ValidationError(
                 "Debes seleccionar al menos 2 auditorías"
             )
-        if len(value) > 5:
+        if len(value) > ComparisonService.MAX_AUDITS:
             raise serializers.ValidationError(
-                "Puedes comparar hasta 5 auditorías"
+                f"Puedes comparar hasta {ComparisonService.MAX_AUDITS} auditorías"
             )
 
         # Validar que no haya duplicados
@@ -115,11 +199,12 @@ class ComparisonCreateSerializer(serializers.Serializer):
         user = self.context['request'].user
 
         # Validar que todas las auditorías existan y estén completadas
+        audits_by_id = Audit.objects.select_related('company').in_bulk(audit_ids)
+
         audits = []
         for audit_id in audit_ids:
-            try:
-                audit = Audit.objects.get(id=audit_id)
-            except Audit.DoesNotExist:
+            audit = audits_by_id.get(audit_id)
+            if audit is None:
                 raise serializers.ValidationError({
                     'audit_ids': f'La auditoría con ID {audit_id} no existe. Por favor usa IDs de auditorías válidas.'
                 })
@@ -132,7 +217,7 @@ class ComparisonCreateSerializer(serializers.Serializer):
 
             # Verificar permisos del usuario
             if hasattr(user, 'owner_profile'):
-                if audit.company.owner != user:
+                if audit.company.owner_id != user.id:
                     raise serializers.ValidationError({
                         'audit_ids': f'No tienes permiso para acceder a la auditoría con ID {audit_id}.'
                     })
@@ -146,12 +231,14 @@ class ComparisonCreateSerializer(serializers.Serializer):
         )
 
         # Asociar auditorías en orden
-        for order, audit in enumerate(audits, start=1):
-            ComparisonAudit.objects.create(
+        ComparisonAudit.objects.bulk_create([
+            ComparisonAudit(
                 comparison=comparison,
                 audit=audit,
                 order=order
             )
+            for order, audit in enumerate(audits, start=1)
+        ])
 
         return comparison
 
@@ -161,18 +248,18 @@ class CompareAuditsSerializer(serializers.Serializer):
 
     audit_ids = serializers.ListField(
         child=serializers.IntegerField(),
-        min_length=2,
-        max_length=5
+        min_length=ComparisonService.MIN_AUDITS,
+        max_length=ComparisonService.MAX_AUDITS
     )
 
     def validate_audit_ids(self, value):
-        if len(value) < 2:
+        if len(value) < ComparisonService.MIN_AUDITS:
             raise serializers.ValidationError(
                 "Debes seleccionar al menos 2 auditorías"
             )
-        if len(value) > 5:
+        if len(value) > ComparisonService.MAX_AUDITS:
             raise serializers.ValidationError(
-                "Puedes comparar hasta 5 auditorías"
+                f"Puedes comparar hasta {ComparisonService.MAX_AUDITS} auditorías"
             )
         if len(value) != len(set(value)):
             raise serializers.ValidationError(
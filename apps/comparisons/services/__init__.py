@@ -1,4 +1,6 @@
 from .comparison_service import ComparisonService
 from .recommendation_service import RecommendationService
+from .rule_engine import RecommendationRuleEngine
+from .benchmark_service import BenchmarkService
 
-__all__ = ['ComparisonService', 'RecommendationService']
+__all__ = ['ComparisonService', 'RecommendationService', 'RecommendationRuleEngine', 'BenchmarkService']
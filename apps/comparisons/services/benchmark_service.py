@@ -0,0 +1,233 @@
+from django.db.models import F, Q, Sum, Window, FloatField, ExpressionWrapper
+from django.db.models.functions import Cast, Coalesce, NullIf, CumeDist, Rank, RowNumber
+from apps.audits.models import Audit, AuditResponse
+from apps.templates.models import AuditTemplate
+
+
+class BenchmarkService:
+    """
+    Servicio de benchmarking entre sucursales sobre una misma plantilla.
+
+    Toma la última auditoría completada de cada sucursal y calcula, por
+    categoría, rankings, percentiles y medianas globales y por empresa.
+    El número de consultas es fijo (3) sin importar cuántas sucursales haya.
+    """
+
+    PERCENTILES = (25, 50, 75, 90)
+
+    @staticmethod
+    def _percentile(sorted_values, percentile):
+        """Percentil con interpolación lineal sobre una lista ordenada"""
+        if not sorted_values:
+            return None
+        if len(sorted_values) == 1:
+            return round(sorted_values[0], 2)
+
+        position = (len(sorted_values) - 1) * percentile / 100
+        lower = int(position)
+        upper = min(lower + 1, len(sorted_values) - 1)
+        fraction = position - lower
+
+        value = sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * fraction
+        return round(value, 2)
+
+    @staticmethod
+    def _distribution(values):
+        """Resumen estadístico (promedio, mínimo, máximo y percentiles)"""
+        values = sorted(values)
+        distribution = {
+            'count': len(values),
+            'average': round(sum(values) / len(values), 2) if values else None,
+            'min': round(values[0], 2) if values else None,
+            'max': round(values[-1], 2) if values else None,
+            'median': BenchmarkService._percentile(values, 50),
+        }
+        for percentile in BenchmarkService.PERCENTILES:
+            distribution[f'p{percentile}'] = BenchmarkService._percentile(values, percentile)
+        return distribution
+
+    @staticmethod
+    def get_latest_audits(template, user, company_id=None, date_from=None, date_to=None):
+        """
+        QuerySet con la última auditoría completada de cada sucursal
+        (ROW_NUMBER particionado por sucursal).
+        """
+        audits = Audit.objects.filter(
+            template=template,
+            company__owner=user,
+            status='completed',
+            branch__isnull=False
+        )
+
+        if company_id:
+            audits = audits.filter(company_id=company_id)
+        if date_from:
+            audits = audits.filter(completed_at__date__gte=date_from)
+        if date_to:
+            audits = audits.filter(completed_at__date__lte=date_to)
+
+        return audits.annotate(
+            branch_row=Window(
+                RowNumber(),
+                partition_by=[F('branch_id')],
+                order_by=[F('completed_at').desc(), F('id').desc()]
+            )
+        ).filter(branch_row=1)
+
+    @staticmethod
+    def benchmark_template(template_id, user, company_id=None, date_from=None, date_to=None):
+        """
+        Ranking de sucursales por categoría para una plantilla.
+
+        Retorna:
+        - template: datos de la plantilla
+        - categories: distribución global por categoría
+        - companies: distribución por empresa y categoría
+        - branches: sucursales ordenadas por ranking general, con
+          ranking y percentil por categoría (global y dentro de su empresa)
+        """
+        try:
+            template = AuditTemplate.objects.get(
+                Q(is_active=True) | Q(created_by=user),
+                id=template_id
+            )
+        except AuditTemplate.DoesNotExist:
+            raise ValueError("Plantilla no encontrada")
+
+        latest = BenchmarkService.get_latest_audits(
+            template, user, company_id, date_from, date_to
+        )
+
+        # Rankings sobre las últimas auditorías ya filtradas (una ventana en
+        # latest se calcularía antes de descartar las anteriores). El Cast
+        # evita que SQLite envuelva en CAST el ORDER BY de un DecimalField.
+        audit_score = Cast('score_percentage', FloatField())
+        audits = list(Audit.objects.filter(
+            id__in=latest.values('id')
+        ).values(
+            'id', 'branch_id', 'branch__name', 'company_id', 'company__name',
+            'completed_at', 'score_percentage'
+        ).annotate(
+            rank=Window(Rank(), order_by=[audit_score.desc()]),
+            company_rank=Window(
+                Rank(),
+                partition_by=[F('company_id')],
+                order_by=[audit_score.desc()]
+            )
+        ))
+
+        # Porcentaje por (auditoría, categoría) con rankings por ventana
+        percentage = ExpressionWrapper(
+            Cast(Coalesce(Sum('score'), 0), FloatField()) * 100.0 /
+            NullIf(Sum('question__max_score'), 0),
+            output_field=FloatField()
+        )
+
+        rows = AuditResponse.objects.filter(
+            audit_id__in=latest.values('id')
+        ).values(
+            'audit_id', 'question__category'
+        ).annotate(
+            percentage=percentage
+        ).annotate(
+            rank=Window(
+                Rank(),
+                partition_by=[F('question__category')],
+                order_by=[percentage.desc()]
+            ),
+            percentile=Window(
+                CumeDist(),
+                partition_by=[F('question__category')],
+                order_by=[percentage.asc()]
+            ),
+            company_rank=Window(
+                Rank(),
+                partition_by=[F('audit__company_id'), F('question__category')],
+                order_by=[percentage.desc()]
+            )
+        ).order_by('question__category', 'rank')
+
+        audits_by_id = {}
+        for audit in audits:
+            audit['categories'] = {}
+            audits_by_id[audit['id']] = audit
+
+        category_values = {}
+        company_values = {}
+        for row in rows:
+            audit = audits_by_id.get(row['audit_id'])
+            if audit is None or row['percentage'] is None:
+                continue
+
+            category = row['question__category']
+            value = round(row['percentage'], 2)
+
+            audit['categories'][category] = {
+                'percentage': value,
+                'rank': row['rank'],
+                'percentile': round(row['percentile'] * 100, 2),
+                'company_rank': row['company_rank']
+            }
+
+            category_values.setdefault(category, []).append(value)
+            company_values.setdefault(audit['company_id'], {}).setdefault(category, []).append(value)
+
+        # Ranking general por score de la auditoría
+        audits.sort(key=lambda a: (-a['score_percentage'], a['branch__name']))
+
+        branches = []
+        companies = {}
+        for audit in audits:
+            score = float(audit['score_percentage'])
+
+            company = companies.setdefault(audit['company_id'], {
+                'company_id': audit['company_id'],
+                'company_name': audit['company__name'],
+                'scores': []
+            })
+            company['scores'].append(score)
+
+            branches.append({
+                'branch_id': audit['branch_id'],
+                'branch_name': audit['branch__name'],
+                'company_id': audit['company_id'],
+                'company_name': audit['company__name'],
+                'audit_id': audit['id'],
+                'completed_at': audit['completed_at'].isoformat(),
+                'score_percentage': score,
+                'rank': audit['rank'],
+                'company_rank': audit['company_rank'],
+                'categories': audit['categories']
+            })
+
+        companies_data = []
+        for company_id, company in companies.items():
+            companies_data.append({
+                'company_id': company_id,
+                'company_name': company['company_name'],
+                'branches_count': len(company['scores']),
+                'score': BenchmarkService._distribution(company['scores']),
+                'categories': {
+                    category: BenchmarkService._distribution(values)
+                    for category, values in company_values.get(company_id, {}).items()
+                }
+            })
+
+        return {
+            'template': {
+                'id': template.id,
+                'name': template.name,
+                'iso_standard': template.iso_standard,
+                'version': template.version
+            },
+            'date_from': date_from.isoformat() if date_from else None,
+            'date_to': date_to.isoformat() if date_to else None,
+            'branches_count': len(branches),
+            'score': BenchmarkService._distribution([b['score_percentage'] for b in branches]),
+            'categories': {
+                category: BenchmarkService._distribution(values)
+                for category, values in category_values.items()
+            },
+            'companies': companies_data,
+            'branches': branches
+        }
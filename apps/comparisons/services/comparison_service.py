@@ -1,3 +1,6 @@
+import hashlib
+from django.conf import settings
+from django.core.cache import cache
 from django.db.models import Avg, Count, Q
 from apps.audits.models import Audit
 from apps.audits.services.scoring_service import ScoringService
@@ -8,10 +11,25 @@ class ComparisonService:
     Servicio para manejar comparaciones entre auditorías.
     """
 
+    # Límites de auditorías por comparación
+    MIN_AUDITS = 2
+    MAX_AUDITS = 50
+
+    # Ventana de la media móvil y pendiente mínima (puntos por auditoría)
+    # para considerar una tendencia como improving/declining
+    TREND_WINDOW = 3
+    TREND_TOLERANCE = 0.5
+
+    # Prefijo de las claves de resultados cacheados
+    CACHE_PREFIX = 'comparison_result'
+
     @staticmethod
     def compare_audits(audit_ids, user):
         """
-        Compara múltiples auditorías (hasta 5).
+        Compara múltiples auditorías (hasta MAX_AUDITS).
+
+        Los scores por categoría de todas las auditorías se obtienen
+        con una sola consulta agrupada por (auditoría, categoría).
 
         Retorna:
         - audits: Lista de auditorías con sus datos
@@ -20,24 +38,31 @@ class ComparisonService:
         - trends: Tendencias si son de la misma plantilla
         """
         # Validar cantidad
-        if len(audit_ids) < 2:
+        if len(audit_ids) < ComparisonService.MIN_AUDITS:
             raise ValueError("Debes seleccionar al menos 2 auditorías para comparar")
 
-        if len(audit_ids) > 5:
-            raise ValueError("Puedes comparar hasta 5 auditorías simultáneamente")
+        if len(audit_ids) > ComparisonService.MAX_AUDITS:
+            raise ValueError(
+                f"Puedes comparar hasta {ComparisonService.MAX_AUDITS} auditorías simultáneamente"
+            )
 
         # Obtener auditorías
-        audits = Audit.objects.filter(
+        audits = list(Audit.objects.filter(
             id__in=audit_ids,
             company__owner=user,
             status='completed'
         ).select_related(
-            'company', 'branch', 'template', 'assigned_to'
-        ).order_by('-completed_at')
+            'company', 'branch', 'template'
+        ).order_by('-completed_at'))
 
-        if audits.count() != len(audit_ids):
+        if len(audits) != len(set(audit_ids)):
             raise ValueError("Algunas auditorías no existen o no están completadas")
 
+        # Scores por categoría de todas las auditorías (una consulta)
+        scores_by_audit = ScoringService.get_scores_by_category_bulk(
+            [audit.id for audit in audits]
+        )
+
         # Verificar si son de la misma plantilla
         templates = set(audit.template_id for audit in audits)
         same_template = len(templates) == 1
@@ -47,8 +72,7 @@ class ComparisonService:
         all_categories = {}
 
         for audit in audits:
-            # Obtener scores por categoría
-            score_by_category = ScoringService.get_score_by_category(audit)
+            score_by_category = scores_by_audit.get(audit.id, {})
 
             audits_data.append({
                 'id': audit.id,
@@ -66,9 +90,7 @@ class ComparisonService:
 
             # Agregar categorías al diccionario global
             for category, data in score_by_category.items():
-                if category not in all_categories:
-                    all_categories[category] = []
-                all_categories[category].append({
+                all_categories.setdefault(category, []).append({
                     'audit_id': audit.id,
                     'audit_title': audit.title,
                     'percentage': data['percentage']
@@ -76,25 +98,28 @@ class ComparisonService:
 
         # Análisis comparativo
         scores = [a['score_percentage'] for a in audits_data]
+        highest = audits_data[scores.index(max(scores))]
+        lowest = audits_data[scores.index(min(scores))]
+        average = sum(scores) / len(scores)
 
         comparative_analysis = {
             'same_template': same_template,
             'template_name': audits_data[0]['template'] if same_template else 'Mixto',
             'total_audits': len(audits_data),
             'highest_score': {
-                'audit_id': audits_data[scores.index(max(scores))]['id'],
-                'audit_title': audits_data[scores.index(max(scores))]['title'],
-                'score': max(scores)
+                'audit_id': highest['id'],
+                'audit_title': highest['title'],
+                'score': highest['score_percentage']
             },
             'lowest_score': {
-                'audit_id': audits_data[scores.index(min(scores))]['id'],
-                'audit_title': audits_data[scores.index(min(scores))]['title'],
-                'score': min(scores)
+                'audit_id': lowest['id'],
+                'audit_title': lowest['title'],
+                'score': lowest['score_percentage']
             },
-            'average_score': round(sum(scores) / len(scores), 2),
+            'average_score': round(average, 2),
             'score_range': round(max(scores) - min(scores), 2),
             'score_variance': round(
-                sum((s - sum(scores)/len(scores))**2 for s in scores) / len(scores),
+                sum((s - average) ** 2 for s in scores) / len(scores),
                 2
             )
         }
@@ -119,19 +144,69 @@ class ComparisonService:
             'categories_comparison': categories_comparison
         }
 
+    @staticmethod
+    def _trend_statistics(values):
+        """
+        Estadísticas de tendencia de una serie cronológica de porcentajes.
+
+        - slope: pendiente por mínimos cuadrados (puntos por auditoría)
+        - intercept: ordenada al origen de la recta ajustada
+        - moving_average: media móvil de TREND_WINDOW auditorías
+        - trend: improving/declining/stable según la pendiente
+        - change_percentage: cambio porcentual primera vs última
+        """
+        n = len(values)
+        mean_x = (n - 1) / 2
+        mean_y = sum(values) / n
+
+        sxx = sum((x - mean_x) ** 2 for x in range(n))
+        sxy = sum((x - mean_x) * (y - mean_y) for x, y in enumerate(values))
+        slope = sxy / sxx if sxx else 0
+        intercept = mean_y - slope * mean_x
+
+        window = min(ComparisonService.TREND_WINDOW, n)
+        moving_average = []
+        running = 0
+        for index, value in enumerate(values):
+            running += value
+            if index >= window:
+                running -= values[index - window]
+            if index >= window - 1:
+                moving_average.append(round(running / window, 2))
+
+        if slope > ComparisonService.TREND_TOLERANCE:
+            trend = "improving"
+        elif slope < -ComparisonService.TREND_TOLERANCE:
+            trend = "declining"
+        else:
+            trend = "stable"
+
+        change_percentage = round(((values[-1] - values[0]) / values[0]) * 100, 2) if values[0] > 0 else 0
+
+        return {
+            'trend': trend,
+            'change_percentage': change_percentage,
+            'slope': round(slope, 4),
+            'intercept': round(intercept, 2),
+            'moving_average': moving_average
+        }
+
     @staticmethod
     def get_trends(audit_ids, user):
         """
         Analiza tendencias entre auditorías ordenadas cronológicamente.
         Solo funciona si son de la misma plantilla.
+
+        Los scores por categoría se obtienen con una sola consulta
+        agrupada; la tendencia se calcula con regresión lineal.
         """
-        audits = Audit.objects.filter(
+        audits = list(Audit.objects.filter(
             id__in=audit_ids,
             company__owner=user,
             status='completed'
-        ).order_by('completed_at')
+        ).order_by('completed_at'))
 
-        if audits.count() < 2:
+        if len(audits) < 2:
             raise ValueError("Se necesitan al menos 2 auditorías para analizar tendencias")
 
         # Verificar misma plantilla
@@ -139,43 +214,85 @@ class ComparisonService:
         if len(templates) > 1:
             raise ValueError("Para analizar tendencias, todas las auditorías deben usar la misma plantilla")
 
-        # Calcular tendencia general
+        # Tendencia general
         scores = [float(audit.score_percentage) for audit in audits]
+        overall = ComparisonService._trend_statistics(scores)
 
-        # Calcular pendiente simple (primera vs última)
-        trend = "improving" if scores[-1] > scores[0] else "declining" if scores[-1] < scores[0] else "stable"
+        # Tendencias por categoría (una consulta agrupada)
+        scores_by_audit = ScoringService.get_scores_by_category_bulk(
+            [audit.id for audit in audits]
+        )
 
-        # Calcular cambio porcentual
-        change_percentage = round(((scores[-1] - scores[0]) / scores[0]) * 100, 2) if scores[0] > 0 else 0
+        category_series = {}
+        for audit in audits:
+            for category, data in scores_by_audit.get(audit.id, {}).items():
+                category_series.setdefault(category, []).append(data['percentage'])
 
-        # Tendencias por categoría
         categories_trends = {}
-
-        first_audit = audits.first()
-        categories = ScoringService.get_score_by_category(first_audit).keys()
-
-        for category in categories:
-            category_scores = []
-
-            for audit in audits:
-                score_by_cat = ScoringService.get_score_by_category(audit)
-                if category in score_by_cat:
-                    category_scores.append(score_by_cat[category]['percentage'])
-
+        for category, category_scores in category_series.items():
             if len(category_scores) >= 2:
-                cat_trend = "improving" if category_scores[-1] > category_scores[0] else "declining" if category_scores[-1] < category_scores[0] else "stable"
-                cat_change = round(((category_scores[-1] - category_scores[0]) / category_scores[0]) * 100, 2) if category_scores[0] > 0 else 0
-
                 categories_trends[category] = {
                     'scores': category_scores,
-                    'trend': cat_trend,
-                    'change_percentage': cat_change
+                    **ComparisonService._trend_statistics(category_scores)
                 }
 
         return {
-            'overall_trend': trend,
-            'change_percentage': change_percentage,
+            'overall_trend': overall['trend'],
+            'change_percentage': overall['change_percentage'],
+            'slope': overall['slope'],
+            'intercept': overall['intercept'],
+            'moving_average': overall['moving_average'],
             'scores_timeline': scores,
             'categories_trends': categories_trends,
             'audits_count': len(scores)
         }
+
+    @staticmethod
+    def get_fingerprint(audit_ids, user):
+        """
+        Huella de un conjunto de auditorías.
+
+        Combina los IDs ordenados, completed_at/updated_at de cada auditoría,
+        la versión de su plantilla y ScoringService.SCORING_VERSION. Cualquier
+        cambio en una auditoría miembro produce una huella distinta.
+        """
+        rows = Audit.objects.filter(
+            id__in=audit_ids,
+            company__owner=user,
+            status='completed'
+        ).values_list(
+            'id', 'completed_at', 'updated_at', 'template__version'
+        ).order_by('id')
+
+        parts = [f'scoring:{ScoringService.SCORING_VERSION}']
+        for audit_id, completed_at, updated_at, template_version in rows:
+            parts.append(
+                f'{audit_id}:{completed_at.isoformat()}:'
+                f'{updated_at.isoformat()}:{template_version}'
+            )
+
+        return hashlib.sha256('|'.join(parts).encode()).hexdigest()
+
+    @staticmethod
+    def get_cached_result(kind, audit_ids, user):
+        """
+        Resultado de compare_audits ('analyze') o get_trends ('trends')
+        cacheado por la huella de las auditorías.
+
+        Los errores de validación no se cachean.
+        """
+        builders = {
+            'analyze': ComparisonService.compare_audits,
+            'trends': ComparisonService.get_trends,
+        }
+        builder = builders[kind]
+
+        fingerprint = ComparisonService.get_fingerprint(audit_ids, user)
+        key = f'{ComparisonService.CACHE_PREFIX}:{kind}:{user.id}:{fingerprint}'
+
+        result = cache.get(key)
+        if result is None:
+            result = builder(audit_ids=audit_ids, user=user)
+            cache.set(key, result, settings.COMPARISON_CACHE_TIMEOUT)
+
+        return result
@@ -1,20 +1,21 @@
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils.text import Truncator
+from apps.audits.models import AuditResponse
 from apps.comparisons.models import Recommendation
+from .rule_engine import RecommendationRuleEngine
 
 
 class RecommendationService:
     """
     Servicio para generar recomendaciones automáticas.
-    """
 
-    # Umbrales de score para priorización
-    THRESHOLDS = {
-        'high': 60,    # Menos de 60% = prioridad alta
-        'medium': 75,  # Entre 60-75% = prioridad media
-        'low': 85      # Entre 75-85% = prioridad baja
-        # Más de 85% = sin recomendación o felicitación
-    }
+    Las prioridades y textos salen del motor de reglas
+    (RecommendationRuleEngine), configurable por plantilla y empresa.
+    """
 
     @staticmethod
+    @transaction.atomic
     def generate_recommendations(audit):
         """
         Genera recomendaciones automáticas basadas en los scores.
@@ -36,117 +37,112 @@ class RecommendationService:
 
         recommendations = []
 
-        # Obtener scores por categoría
+        rules = RecommendationRuleEngine.get_rules(
+            audit.template,
+            company_id=audit.company_id
+        )
+
+        # Obtener scores por categoría y evaluarlos en bloque
         score_by_category = ScoringService.get_score_by_category(audit)
+        percentages = {
+            category: data['percentage']
+            for category, data in score_by_category.items()
+        }
 
-        # Generar recomendaciones por categoría
-        for category, data in score_by_category.items():
-            percentage = data['percentage']
-
-            # Determinar prioridad y generar recomendación
-            if percentage < RecommendationService.THRESHOLDS['high']:
-                priority = 'high'
-                recommendation_text = (
-                    f"La categoría '{category}' obtuvo {percentage:.1f}% y requiere atención inmediata. "
-                    f"Se recomienda: revisar todos los procesos relacionados, establecer un plan de acción "
-                    f"correctivo, capacitar al personal responsable y programar seguimiento en 30 días."
-                )
-
-            elif percentage < RecommendationService.THRESHOLDS['medium']:
-                priority = 'medium'
-                recommendation_text = (
-                    f"La categoría '{category}' obtuvo {percentage:.1f}% y debe ser mejorada. "
-                    f"Se recomienda: documentar mejor los procesos, reforzar controles existentes "
-                    f"y realizar revisiones periódicas."
-                )
-
-            elif percentage < RecommendationService.THRESHOLDS['low']:
-                priority = 'low'
-                recommendation_text = (
-                    f"La categoría '{category}' obtuvo {percentage:.1f}% y puede optimizarse. "
-                    f"Se recomienda: identificar oportunidades de mejora continua y mantener "
-                    f"las buenas prácticas actuales."
-                )
-
-            else:
-                # Score excelente, generar felicitación
-                priority = 'low'
-                recommendation_text = (
-                    f"¡Excelente desempeño! La categoría '{category}' obtuvo {percentage:.1f}%. "
-                    f"Se recomienda: mantener los estándares actuales y documentar las mejores "
-                    f"prácticas para replicarlas."
-                )
-
-            # Crear recomendación
-            recommendation = Recommendation.objects.create(
+        for category, percentage, rule in rules.evaluate_categories(percentages):
+            recommendations.append(Recommendation(
                 audit=audit,
                 category=category,
-                recommendation_text=recommendation_text,
-                priority=priority,
+                recommendation_text=rule.render(
+                    category=category,
+                    percentage=percentage
+                ),
+                priority=rule.priority,
                 is_auto_generated=True
-            )
+            ))
 
-            recommendations.append(recommendation)
+        # Recomendaciones por pregunta (agrupadas por categoría)
+        recommendations.extend(
+            RecommendationService.get_question_findings(audit, rules)
+        )
 
         # Recomendación general basada en score total
         total_percentage = float(audit.score_percentage)
+        general_rule = rules.evaluate_general(total_percentage)
 
-        if total_percentage < RecommendationService.THRESHOLDS['high']:
-            general_text = (
-                f"Score general de {total_percentage:.1f}% indica necesidad de mejora significativa. "
-                f"Se recomienda: establecer un comité de mejora, asignar recursos dedicados, "
-                f"realizar auditoría de seguimiento en 60 días."
-            )
-            general_priority = 'high'
+        if general_rule is not None:
+            recommendations.append(Recommendation(
+                audit=audit,
+                category='General',
+                recommendation_text=general_rule.render(
+                    category='General',
+                    percentage=total_percentage
+                ),
+                priority=general_rule.priority,
+                is_auto_generated=True
+            ))
 
-        elif total_percentage < RecommendationService.THRESHOLDS['medium']:
-            general_text = (
-                f"Score general de {total_percentage:.1f}% es aceptable pero mejorable. "
-                f"Se recomienda: enfocarse en las áreas con menor puntaje y establecer "
-                f"indicadores de seguimiento."
-            )
-            general_priority = 'medium'
+        return Recommendation.objects.bulk_create(recommendations)
 
-        elif total_percentage < RecommendationService.THRESHOLDS['low']:
-            general_text = (
-                f"Score general de {total_percentage:.1f}% es bueno. "
-                f"Se recomienda: mantener el nivel actual y buscar oportunidades de excelencia "
-                f"en áreas específicas."
-            )
-            general_priority = 'low'
+    @staticmethod
+    def get_question_findings(audit, rules):
+        """
+        Genera recomendaciones (sin guardar) para las preguntas con
+        respuesta 'no' o score bajo la fracción configurada del max_score.
 
-        else:
-            general_text = (
-                f"¡Excelente score general de {total_percentage:.1f}%! "
-                f"Se recomienda: mantener los estándares, documentar mejores prácticas y "
-                f"servir como referencia para otras áreas."
+        Usa una sola consulta sobre las respuestas de la auditoría,
+        ordenada por categoría y orden de pregunta.
+        """
+        responses = AuditResponse.objects.filter(
+            audit=audit
+        ).values_list(
+            'question_id', 'question__category', 'question__question_text',
+            'question__order_num', 'question__max_score',
+            'score', 'response_type'
+        ).order_by('question__category', 'question__order_num')
+
+        findings = []
+        for (question_id, category, question_text, order_num,
+             max_score, score, response_type) in responses:
+            percentage = None
+            if score is not None and max_score:
+                percentage = score / max_score * 100
+
+            rule = rules.evaluate_question(
+                question_id, category, response_type, percentage
             )
-            general_priority = 'low'
-
-        general_recommendation = Recommendation.objects.create(
-            audit=audit,
-            category='General',
-            recommendation_text=general_text,
-            priority=general_priority,
-            is_auto_generated=True
-        )
+            if rule is None:
+                continue
 
-        recommendations.append(general_recommendation)
+            findings.append(Recommendation(
+                audit=audit,
+                category=category,
+                question_id=question_id,
+                recommendation_text=rule.render(
+                    category=category,
+                    percentage=percentage or 0,
+                    question=Truncator(question_text).chars(100),
+                    order_num=order_num,
+                    score=score if score is not None else '-',
+                    max_score=max_score
+                ),
+                priority=rule.priority,
+                is_auto_generated=True
+            ))
 
-        return recommendations
+        return findings
 
     @staticmethod
     def get_recommendations_summary(audit):
         """
         Obtiene resumen de recomendaciones de una auditoría.
         """
-        recommendations = audit.recommendations.all()
-
-        return {
-            'total': recommendations.count(),
-            'high_priority': recommendations.filter(priority='high').count(),
-            'medium_priority': recommendations.filter(priority='medium').count(),
-            'low_priority': recommendations.filter(priority='low').count(),
-            'auto_generated': recommendations.filter(is_auto_generated=True).count(),
-            'manual': recommendations.filter(is_auto_generated=False).count()
-        }
+        return audit.recommendations.aggregate(
+            total=Count('id'),
+            high_priority=Count('id', filter=Q(priority='high')),
+            medium_priority=Count('id', filter=Q(priority='medium')),
+            low_priority=Count('id', filter=Q(priority='low')),
+            auto_generated=Count('id', filter=Q(is_auto_generated=True)),
+            manual=Count('id', filter=Q(is_auto_generated=False)),
+            question_level=Count('id', filter=Q(question__isnull=False))
+        )
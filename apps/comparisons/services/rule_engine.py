@@ -0,0 +1,396 @@
+from bisect import bisect_right
+from collections import OrderedDict
+from django.conf import settings
+from django.core.cache import cache
+from apps.comparisons.models import RecommendationRule
+
+
+class CompiledRule:
+    """
+    Regla ya resuelta en memoria (sin acceso a base de datos).
+    """
+
+    __slots__ = (
+        'rule_id', 'scope', 'category', 'question_id', 'response_type',
+        'min_percentage', 'max_percentage', 'priority', 'text_template',
+        'specificity', 'order'
+    )
+
+    def __init__(self, scope, priority, text_template, category='',
+                 question_id=None, response_type='', min_percentage=None,
+                 max_percentage=None, specificity=0, order=0, rule_id=None):
+        self.rule_id = rule_id
+        self.scope = scope
+        self.category = category
+        self.question_id = question_id
+        self.response_type = response_type
+        self.min_percentage = min_percentage
+        self.max_percentage = max_percentage
+        self.priority = priority
+        self.text_template = text_template
+        self.specificity = specificity
+        self.order = order
+
+    def covers(self, lower, upper):
+        """Indica si la banda de la regla cubre el intervalo [lower, upper)"""
+        if self.min_percentage is not None:
+            if lower is None or lower < self.min_percentage:
+                return False
+        if self.max_percentage is not None:
+            if upper is None or upper > self.max_percentage:
+                return False
+        return True
+
+    def matches(self, percentage):
+        """Indica si un porcentaje cae dentro de la banda de la regla"""
+        if percentage is None:
+            return self.min_percentage is None and self.max_percentage is None
+        if self.min_percentage is not None and percentage < self.min_percentage:
+            return False
+        if self.max_percentage is not None and percentage >= self.max_percentage:
+            return False
+        return True
+
+    def render(self, **context):
+        """Genera el texto de la recomendación a partir de la plantilla"""
+        try:
+            return self.text_template.format_map(_SafeContext(context))
+        except (ValueError, IndexError, AttributeError):
+            return self.text_template
+
+
+class _SafeContext(dict):
+    """Deja intactas las variables desconocidas en lugar de fallar"""
+
+    def __missing__(self, key):
+        return '{' + key + '}'
+
+
+class DecisionTable:
+    """
+    Tabla de decisión por bandas de porcentaje.
+
+    Los límites de todas las reglas se aplanan en intervalos elementales y
+    cada intervalo queda resuelto con la regla ganadora, de modo que evaluar
+    un porcentaje es una búsqueda binaria.
+    """
+
+    def __init__(self, rules):
+        rules = sorted(rules, key=lambda r: (-r.specificity, r.order))
+
+        points = set()
+        for rule in rules:
+            if rule.min_percentage is not None:
+                points.add(rule.min_percentage)
+            if rule.max_percentage is not None:
+                points.add(rule.max_percentage)
+        self.breakpoints = sorted(points)
+
+        bounds = [None] + self.breakpoints + [None]
+        self.winners = []
+        for index in range(len(self.breakpoints) + 1):
+            lower, upper = bounds[index], bounds[index + 1]
+            self.winners.append(
+                next((r for r in rules if r.covers(lower, upper)), None)
+            )
+
+    def lookup(self, percentage):
+        return self.winners[bisect_right(self.breakpoints, percentage)]
+
+
+class CompiledRuleSet:
+    """
+    Conjunto de reglas compilado para una plantilla/empresa.
+    """
+
+    def __init__(self, rules):
+        category_rules = [r for r in rules if r.scope == 'category']
+        wildcard = [r for r in category_rules if not r.category]
+
+        self.category_default = DecisionTable(wildcard)
+        self.category_tables = {}
+        for category in {r.category for r in category_rules if r.category}:
+            self.category_tables[category] = DecisionTable(
+                wildcard + [r for r in category_rules if r.category == category]
+            )
+
+        self.general = DecisionTable([r for r in rules if r.scope == 'general'])
+
+        question_rules = sorted(
+            [r for r in rules if r.scope == 'question'],
+            key=lambda r: (-r.specificity, r.order)
+        )
+        self.question_generic = [r for r in question_rules if r.question_id is None]
+        self.question_index = {}
+        for question_id in {r.question_id for r in question_rules if r.question_id}:
+            self.question_index[question_id] = [
+                r for r in question_rules
+                if r.question_id in (None, question_id)
+            ]
+
+    def evaluate_categories(self, percentages):
+        """
+        Evalúa en bloque un vector {categoría: porcentaje}.
+        Retorna lista de (categoría, porcentaje, CompiledRule).
+        """
+        results = []
+        for category, percentage in percentages.items():
+            table = self.category_tables.get(category, self.category_default)
+            rule = table.lookup(percentage)
+            if rule is not None:
+                results.append((category, percentage, rule))
+        return results
+
+    def evaluate_general(self, percentage):
+        return self.general.lookup(percentage)
+
+    def evaluate_question(self, question_id, category, response_type, percentage):
+        """
+        Primera regla por pregunta que coincide con la respuesta dada.
+        """
+        for rule in self.question_index.get(question_id, self.question_generic):
+            if rule.category and rule.category != category:
+                continue
+            if rule.response_type and rule.response_type != response_type:
+                continue
+            if rule.matches(percentage):
+                return rule
+        return None
+
+
+class RecommendationRuleEngine:
+    """
+    Motor de reglas de recomendaciones.
+
+    Las reglas se leen de la base de datos, se combinan con las reglas por
+    defecto y se compilan una sola vez por (plantilla, versión, empresa).
+    Cualquier cambio en RecommendationRule incrementa una generación en el
+    cache, lo que invalida las tablas compiladas en todos los procesos.
+    """
+
+    GENERATION_KEY = 'recommendation_rules:generation'
+
+    # Tablas compiladas que se conservan por proceso; al superarlo se
+    # descarta la usada hace más tiempo
+    MAX_COMPILED = 256
+
+    # Umbrales por defecto para priorización
+    DEFAULT_THRESHOLDS = {
+        'high': 60,    # Menos de 60% = prioridad alta
+        'medium': 75,  # Entre 60-75% = prioridad media
+        'low': 85      # Entre 75-85% = prioridad baja
+        # Más de 85% = felicitación
+    }
+
+    DEFAULT_RULES = [
+        CompiledRule(
+            scope='category', priority='high', specificity=-1,
+            max_percentage=DEFAULT_THRESHOLDS['high'],
+            text_template=(
+                "La categoría '{category}' obtuvo {percentage:.1f}% y requiere atención inmediata. "
+                "Se recomienda: revisar todos los procesos relacionados, establecer un plan de acción "
+                "correctivo, capacitar al personal responsable y programar seguimiento en 30 días."
+            )
+        ),
+        CompiledRule(
+            scope='category', priority='medium', specificity=-1,
+            min_percentage=DEFAULT_THRESHOLDS['high'],
+            max_percentage=DEFAULT_THRESHOLDS['medium'],
+            text_template=(
+                "La categoría '{category}' obtuvo {percentage:.1f}% y debe ser mejorada. "
+                "Se recomienda: documentar mejor los procesos, reforzar controles existentes "
+                "y realizar revisiones periódicas."
+            )
+        ),
+        CompiledRule(
+            scope='category', priority='low', specificity=-1,
+            min_percentage=DEFAULT_THRESHOLDS['medium'],
+            max_percentage=DEFAULT_THRESHOLDS['low'],
+            text_template=(
+                "La categoría '{category}' obtuvo {percentage:.1f}% y puede optimizarse. "
+                "Se recomienda: identificar oportunidades de mejora continua y mantener "
+                "las buenas prácticas actuales."
+            )
+        ),
+        CompiledRule(
+            scope='category', priority='low', specificity=-1,
+            min_percentage=DEFAULT_THRESHOLDS['low'],
+            text_template=(
+                "¡Excelente desempeño! La categoría '{category}' obtuvo {percentage:.1f}%. "
+                "Se recomienda: mantener los estándares actuales y documentar las mejores "
+                "prácticas para replicarlas."
+            )
+        ),
+        CompiledRule(
+            scope='general', priority='high', specificity=-1,
+            max_percentage=DEFAULT_THRESHOLDS['high'],
+            text_template=(
+                "Score general de {percentage:.1f}% indica necesidad de mejora significativa. "
+                "Se recomienda: establecer un comité de mejora, asignar recursos dedicados, "
+                "realizar auditoría de seguimiento en 60 días."
+            )
+        ),
+        CompiledRule(
+            scope='general', priority='medium', specificity=-1,
+            min_percentage=DEFAULT_THRESHOLDS['high'],
+            max_percentage=DEFAULT_THRESHOLDS['medium'],
+            text_template=(
+                "Score general de {percentage:.1f}% es aceptable pero mejorable. "
+                "Se recomienda: enfocarse en las áreas con menor puntaje y establecer "
+                "indicadores de seguimiento."
+            )
+        ),
+        CompiledRule(
+            scope='general', priority='low', specificity=-1,
+            min_percentage=DEFAULT_THRESHOLDS['medium'],
+            max_percentage=DEFAULT_THRESHOLDS['low'],
+            text_template=(
+                "Score general de {percentage:.1f}% es bueno. "
+                "Se recomienda: mantener el nivel actual y buscar oportunidades de excelencia "
+                "en áreas específicas."
+            )
+        ),
+        CompiledRule(
+            scope='general', priority='low', specificity=-1,
+            min_percentage=DEFAULT_THRESHOLDS['low'],
+            text_template=(
+                "¡Excelente score general de {percentage:.1f}%! "
+                "Se recomienda: mantener los estándares, documentar mejores prácticas y "
+                "servir como referencia para otras áreas."
+            )
+        ),
+    ]
+
+    @staticmethod
+    def default_question_rules():
+        """
+        Reglas por pregunta por defecto: respuestas 'no' y
+        scores bajo la fracción configurada del max_score.
+        """
+        fraction = getattr(settings, 'RECOMMENDATION_LOW_SCORE_FRACTION', 0.5)
+
+        return [
+            CompiledRule(
+                scope='question', priority='high', specificity=-1, order=0,
+                response_type='no',
+                text_template=(
+                    "La pregunta {order_num} ('{question}') de la categoría '{category}' "
+                    "fue respondida como 'No'. Se recomienda: definir una acción correctiva "
+                    "específica, asignar un responsable y verificar su cierre."
+                )
+            ),
+            CompiledRule(
+                scope='question', priority='medium', specificity=-1, order=1,
+                max_percentage=fraction * 100,
+                text_template=(
+                    "La pregunta {order_num} ('{question}') de la categoría '{category}' "
+                    "obtuvo {score} de {max_score} puntos ({percentage:.1f}%). Se recomienda: "
+                    "revisar el control asociado y documentar la evidencia de cumplimiento."
+                )
+            ),
+        ]
+
+    # Tablas compiladas en este proceso, de la menos a la más usada
+    # recientemente: {(template, versión, empresa): CompiledRuleSet}
+    _compiled = OrderedDict()
+    _compiled_generation = None
+
+    @staticmethod
+    def get_generation():
+        """Generación actual de las reglas (compartida vía cache)"""
+        generation = cache.get(RecommendationRuleEngine.GENERATION_KEY)
+        if generation is None:
+            generation = 1
+            cache.add(RecommendationRuleEngine.GENERATION_KEY, generation, None)
+        return generation
+
+    @staticmethod
+    def invalidate():
+        """Invalida las tablas compiladas en todos los procesos"""
+        try:
+            cache.incr(RecommendationRuleEngine.GENERATION_KEY)
+        except ValueError:
+            cache.set(RecommendationRuleEngine.GENERATION_KEY, 2, None)
+        RecommendationRuleEngine._compiled.clear()
+
+    @staticmethod
+    def _specificity(rule):
+        """
+        Especificidad de una regla de base de datos:
+        empresa+plantilla > plantilla > empresa > global,
+        y dentro de cada nivel, categoría concreta > cualquier categoría.
+        """
+        if rule.template_id and rule.company_id:
+            level = 3
+        elif rule.template_id:
+            level = 2
+        elif rule.company_id:
+            level = 1
+        else:
+            level = 0
+        return level * 2 + (1 if rule.category else 0)
+
+    @staticmethod
+    def _load_rules(template_id, company_id):
+        """
+        Reglas activas de la empresa y reglas sin empresa del owner de la
+        empresa (las define el creador de la plantilla). Las reglas sin
+        empresa de otros owners no aplican aunque compartan plantilla.
+        """
+        from django.db.models import Q
+        from apps.companies.models import Company
+
+        owner = Company.objects.filter(id=company_id).values('owner_id')
+
+        db_rules = RecommendationRule.objects.filter(
+            Q(template_id=template_id) | Q(template__isnull=True),
+            Q(company_id=company_id) |
+            Q(company__isnull=True, template__created_by_id__in=owner),
+            is_active=True
+        )
+
+        rules = list(RecommendationRuleEngine.DEFAULT_RULES)
+        rules.extend(RecommendationRuleEngine.default_question_rules())
+        for rule in db_rules:
+            rules.append(CompiledRule(
+                rule_id=rule.id,
+                scope=rule.scope,
+                category=rule.category,
+                question_id=rule.question_id,
+                response_type=rule.response_type or '',
+                min_percentage=float(rule.min_percentage) if rule.min_percentage is not None else None,
+                max_percentage=float(rule.max_percentage) if rule.max_percentage is not None else None,
+                priority=rule.priority,
+                text_template=rule.text_template,
+                specificity=RecommendationRuleEngine._specificity(rule),
+                order=rule.order
+            ))
+        return rules
+
+    @staticmethod
+    def get_rules(template, company_id=None):
+        """
+        Obtiene el CompiledRuleSet para una plantilla (y empresa),
+        compilándolo solo si no está en memoria para la versión actual.
+        Se conservan como máximo MAX_COMPILED tablas por proceso (LRU).
+        """
+        generation = RecommendationRuleEngine.get_generation()
+        if generation != RecommendationRuleEngine._compiled_generation:
+            RecommendationRuleEngine._compiled.clear()
+            RecommendationRuleEngine._compiled_generation = generation
+
+        compiled_sets = RecommendationRuleEngine._compiled
+        key = (template.id, template.version, company_id)
+        # pop + asignación la mueve al final (más reciente)
+        compiled = compiled_sets.pop(key, None)
+
+        if compiled is None:
+            compiled = CompiledRuleSet(
+                RecommendationRuleEngine._load_rules(template.id, company_id)
+            )
+        compiled_sets[key] = compiled
+
+        while len(compiled_sets) > RecommendationRuleEngine.MAX_COMPILED:
+            compiled_sets.popitem(last=False)
+
+        return compiled
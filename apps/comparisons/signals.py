@@ -0,0 +1,10 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import RecommendationRule
+
+
+@receiver([post_save, post_delete], sender=RecommendationRule)
+def invalidate_recommendation_rules(sender, **kwargs):
+    """Invalida las tablas de reglas compiladas al modificar una regla"""
+    from .services.rule_engine import RecommendationRuleEngine
+    RecommendationRuleEngine.invalidate()
@@ -0,0 +1,54 @@
+from datetime import timedelta
+from django.test import TestCase
+from django.utils import timezone
+from apps.audits.models import Audit
+from apps.companies.models import Company, Branch
+from apps.comparisons.services.benchmark_service import BenchmarkService
+from apps.templates.models import AuditTemplate
+from core.testing import create_user
+
+
+class BenchmarkRankTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = create_user('owner@test.com', 'owner')
+        cls.template = AuditTemplate.objects.create(
+            name='ISO', iso_standard='27701', created_by=cls.owner
+        )
+        cls.acme = Company.objects.create(name='ACME', owner=cls.owner)
+        cls.other = Company.objects.create(name='Otra', owner=cls.owner)
+
+    def create_audit(self, company, branch_name, score, days_ago=0):
+        branch = Branch.objects.get_or_create(name=branch_name, company=company)[0]
+        return Audit.objects.create(
+            title=branch_name, template=self.template, company=company,
+            branch=branch, assigned_to=self.owner, created_by=self.owner,
+            status='completed', score_percentage=score,
+            completed_at=timezone.now() - timedelta(days=days_ago)
+        )
+
+    def ranks(self):
+        result = BenchmarkService.benchmark_template(self.template.id, self.owner)
+        return {
+            b['branch_name']: (b['rank'], b['company_rank'])
+            for b in result['branches']
+        }
+
+    def test_ties_share_rank(self):
+        self.create_audit(self.acme, 'A', 80)
+        self.create_audit(self.acme, 'B', 80)
+        self.create_audit(self.acme, 'C', 70)
+        self.create_audit(self.other, 'D', 90)
+
+        self.assertEqual(self.ranks(), {
+            'D': (1, 1), 'A': (2, 1), 'B': (2, 1), 'C': (4, 3)
+        })
+
+    def test_only_latest_audit_ranked(self):
+        # La auditoría anterior de A no cuenta para el ranking
+        self.create_audit(self.acme, 'A', 95, days_ago=30)
+        self.create_audit(self.acme, 'A', 60)
+        self.create_audit(self.acme, 'B', 70)
+
+        self.assertEqual(self.ranks(), {'B': (1, 1), 'A': (2, 2)})
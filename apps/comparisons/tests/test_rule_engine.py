@@ -0,0 +1,64 @@
+from unittest.mock import patch
+from django.test import TestCase
+from apps.companies.models import Company
+from apps.comparisons.models import RecommendationRule
+from apps.comparisons.services.rule_engine import RecommendationRuleEngine
+from apps.templates.models import AuditTemplate
+from core.testing import create_user
+
+
+class RuleScopeTests(TestCase):
+    """Las reglas de un owner no se aplican a empresas de otros owners"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = create_user('author@test.com', 'owner')
+        cls.other = create_user('other@test.com', 'owner')
+        cls.author_company = Company.objects.create(name='Autor', owner=cls.author)
+        cls.other_company = Company.objects.create(name='Otra', owner=cls.other)
+        # Plantilla activa: ambos owners la usan
+        cls.template = AuditTemplate.objects.create(
+            name='ISO', iso_standard='27701', created_by=cls.author
+        )
+        RecommendationRule.objects.create(
+            name='Global del autor', scope='category', template=cls.template,
+            category='Seguridad', priority='high', text_template='AUTOR'
+        )
+        RecommendationRule.objects.create(
+            name='Empresa ajena', scope='category', template=cls.template,
+            company=cls.other_company, category='Accesos', priority='high',
+            text_template='OTRA'
+        )
+
+    def texts(self, company):
+        rules = RecommendationRuleEngine.get_rules(self.template, company_id=company.id)
+        return {
+            category: rule.text_template
+            for category, percentage, rule in rules.evaluate_categories(
+                {'Seguridad': 10.0, 'Accesos': 10.0}
+            )
+        }
+
+    def test_template_rule_applies_to_author_companies(self):
+        texts = self.texts(self.author_company)
+
+        self.assertEqual(texts['Seguridad'], 'AUTOR')
+        self.assertNotEqual(texts['Accesos'], 'OTRA')
+
+    def test_template_rule_does_not_leak_to_other_owner(self):
+        texts = self.texts(self.other_company)
+
+        self.assertNotEqual(texts['Seguridad'], 'AUTOR')
+        self.assertEqual(texts['Accesos'], 'OTRA')
+
+    @patch.object(RecommendationRuleEngine, 'MAX_COMPILED', 1)
+    def test_compiled_tables_bounded(self):
+        RecommendationRuleEngine.invalidate()
+        RecommendationRuleEngine.get_rules(self.template, company_id=self.author_company.id)
+        RecommendationRuleEngine.get_rules(self.template, company_id=self.other_company.id)
+
+        self.assertEqual(len(RecommendationRuleEngine._compiled), 1)
+        with self.assertNumQueries(0):
+            RecommendationRuleEngine.get_rules(self.template, company_id=self.other_company.id)
+        with self.assertNumQueries(1):
+            RecommendationRuleEngine.get_rules(self.template, company_id=self.author_company.id)
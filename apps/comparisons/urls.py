@@ -3,8 +3,10 @@ from rest_framework.routers import DefaultRouter
 from .views import (
     ComparisonViewSet,
     RecommendationViewSet,
+    RecommendationRuleViewSet,
     CompareAuditsView,
     TrendsAnalysisView,
+    BenchmarkView,
     GenerateRecommendationsView,
     AuditRecommendationsView
 )
@@ -14,11 +16,14 @@ app_name = 'comparisons'
 router = DefaultRouter()
 router.register(r'comparisons', ComparisonViewSet, basename='comparison')
 router.register(r'recommendations', RecommendationViewSet, basename='recommendation')
+router.register(r'recommendation-rules', RecommendationRuleViewSet, basename='recommendation_rule')
 
 urlpatterns = [
-    path('', include(router.urls)),
+    # Antes del router para que no se resuelvan como comparisons/{pk}/
     path('comparisons/compare/', CompareAuditsView.as_view(), name='compare'),
     path('comparisons/trends/', TrendsAnalysisView.as_view(), name='trends'),
+    path('comparisons/benchmark/', BenchmarkView.as_view(), name='benchmark'),
+    path('', include(router.urls)),
     path('audits/<int:audit_id>/generate-recommendations/', GenerateRecommendationsView.as_view(), name='generate_recommendations'),
     path('audits/<int:audit_id>/recommendations/', AuditRecommendationsView.as_view(), name='audit_recommendations'),
 ]
@@ -4,14 +4,17 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 from django.core.exceptions import ValidationError as DjangoValidationError
-from .models import Comparison, Recommendation
+from django.utils.dateparse import parse_date
+from django.db.models import Count, Prefetch, Q
+from .models import Comparison, ComparisonAudit, Recommendation, RecommendationRule
 from .serializers import (
     ComparisonSerializer, ComparisonCreateSerializer,
     CompareAuditsSerializer, RecommendationSerializer,
-    RecommendationCreateSerializer
+    RecommendationCreateSerializer, RecommendationRuleSerializer
 )
 from .services.comparison_service import ComparisonService
 from .services.recommendation_service import RecommendationService
+from .services.benchmark_service import BenchmarkService
 from apps.authentication.permissions import IsOwner
 
 
@@ -28,7 +31,22 @@ class ComparisonViewSet(viewsets.ModelViewSet):
         """Filtrar comparaciones del owner"""
         return Comparison.objects.filter(
             created_by=self.request.user
-        ).prefetch_related('audits')
+        ).select_related(
+            'created_by'
+        ).annotate(
+            audits_count=Count('comparisonaudit')
+        ).order_by(
+            '-created_at'
+        ).prefetch_related(
+            'audits',
+            Prefetch(
+                'comparisonaudit_set',
+                queryset=ComparisonAudit.objects.select_related(
+                    'audit__company', 'audit__branch',
+                    'audit__template', 'audit__assigned_to'
+                )
+            )
+        )
 
     def get_serializer_class(self):
         if self.action == 'create':
@@ -42,10 +60,11 @@ class ComparisonViewSet(viewsets.ModelViewSet):
         Analiza una comparación guardada
         """
         comparison = self.get_object()
-        audit_ids = list(comparison.audits.values_list('id', flat=True))
+        audit_ids = [audit.id for audit in comparison.audits.all()]
 
         try:
-            analysis = ComparisonService.compare_audits(
+            analysis = ComparisonService.get_cached_result(
+                'analyze',
                 audit_ids=audit_ids,
                 user=request.user
             )
@@ -65,10 +84,11 @@ class ComparisonViewSet(viewsets.ModelViewSet):
         Analiza tendencias de una comparación
         """
         comparison = self.get_object()
-        audit_ids = list(comparison.audits.values_list('id', flat=True))
+        audit_ids = [audit.id for audit in comparison.audits.all()]
 
         try:
-            trends = ComparisonService.get_trends(
+            trends = ComparisonService.get_cached_result(
+                'trends',
                 audit_ids=audit_ids,
                 user=request.user
             )
@@ -147,6 +167,54 @@ class TrendsAnalysisView(APIView):
             )
 
 
+class BenchmarkView(APIView):
+    """
+    GET /api/comparisons/benchmark/
+
+    Ranking de sucursales sobre una misma plantilla usando la última
+    auditoría completada de cada sucursal.
+
+    Query params:
+    - template_id: ID de la plantilla (requerido)
+    - company_id: Filtrar por empresa (opcional)
+    - date_from / date_to: Rango de completed_at, YYYY-MM-DD (opcional)
+    """
+
+    permission_classes = [IsAuthenticated, IsOwner]
+
+    def get(self, request):
+        template_id = request.query_params.get('template_id')
+
+        if not template_id:
+            return Response(
+                {'error': 'template_id es requerido'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            dates = {}
+            for param in ['date_from', 'date_to']:
+                value = request.query_params.get(param)
+                dates[param] = parse_date(value) if value else None
+                if value and dates[param] is None:
+                    raise ValueError(f"{param} debe tener formato YYYY-MM-DD")
+
+            benchmark = BenchmarkService.benchmark_template(
+                template_id=template_id,
+                user=request.user,
+                company_id=request.query_params.get('company_id'),
+                **dates
+            )
+
+            return Response(benchmark)
+
+        except (ValueError, DjangoValidationError) as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+
 class RecommendationViewSet(viewsets.ModelViewSet):
     """
     ViewSet para gestión de Recomendaciones.
@@ -180,6 +248,45 @@ class RecommendationViewSet(viewsets.ModelViewSet):
         return RecommendationSerializer
 
 
+class RecommendationRuleViewSet(viewsets.ModelViewSet):
+    """
+    ViewSet para gestión de Reglas de Recomendación.
+
+    Permite a los owners configurar umbrales, prioridades y textos
+    por plantilla, empresa, categoría o pregunta.
+    """
+
+    serializer_class = RecommendationRuleSerializer
+    permission_classes = [IsAuthenticated, IsOwner]
+
+    def get_queryset(self):
+        """
+        Reglas de las empresas del owner o de plantillas
+        creadas por él sin empresa asociada.
+        """
+        user = self.request.user
+
+        queryset = RecommendationRule.objects.filter(
+            Q(company__owner=user) |
+            Q(company__isnull=True, template__created_by=user)
+        ).select_related('template', 'company', 'question')
+
+        # Filtros opcionales
+        template_id = self.request.query_params.get('template')
+        if template_id:
+            queryset = queryset.filter(template_id=template_id)
+
+        company_id = self.request.query_params.get('company')
+        if company_id:
+            queryset = queryset.filter(company_id=company_id)
+
+        scope = self.request.query_params.get('scope')
+        if scope:
+            queryset = queryset.filter(scope=scope)
+
+        return queryset
+
+
 class GenerateRecommendationsView(APIView):
     """
     POST /api/audits/{audit_id}/generate-recommendations/
@@ -255,7 +362,9 @@ class AuditRecommendationsView(APIView):
                     )
 
             # Obtener recomendaciones
-            recommendations = audit.recommendations.all()
+            recommendations = audit.recommendations.select_related(
+                'audit', 'created_by'
+            )
 
             # Obtener resumen
             summary = RecommendationService.get_recommendations_summary(audit)
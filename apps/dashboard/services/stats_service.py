@@ -45,6 +45,48 @@ class StatsService:
 
         return queryset.distinct()
 
+    @staticmethod
+    def get_dashboard_state(user, company_id=None):
+        """
+        Versión de los datos del dashboard para GET condicional (dos
+        consultas agregadas en lugar de las de cada estadística).
+
+        Cambia cuando se crea, modifica o elimina una auditoría (las
+        respuestas actualizan la auditoría), una empresa, una sucursal o
+        una plantilla usada, y cuando cambia el día (estadísticas del
+        período actual).
+
+        Returns:
+            (partes del ETag, última modificación)
+        """
+        audits = StatsService._get_base_queryset(user, company_id).order_by().aggregate(
+            audits_count=Count('id'),
+            audits_updated=Max('updated_at'),
+            templates_updated=Max('template__updated_at')
+        )
+
+        companies_queryset = Company.objects.filter(owner=user)
+        if company_id:
+            companies_queryset = companies_queryset.filter(id=company_id)
+
+        companies = companies_queryset.aggregate(
+            companies_count=Count('id', distinct=True),
+            companies_updated=Max('updated_at'),
+            branches_count=Count('branches', distinct=True),
+            branches_updated=Max('branches__updated_at')
+        )
+
+        parts = [
+            user.id, timezone.localdate(),
+            *audits.values(), *companies.values()
+        ]
+        last_modified = max(filter(None, [
+            audits['audits_updated'], audits['templates_updated'],
+            companies['companies_updated'], companies['branches_updated']
+        ]), default=None)
+
+        return parts, last_modified
+
     @staticmethod
     def get_overview_stats(user, company_id=None):
         """
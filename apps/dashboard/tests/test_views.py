@@ -0,0 +1,71 @@
+from django.test import TestCase
+from rest_framework.test import APIClient
+from apps.audits.models import Audit
+from apps.companies.models import Company, Branch
+from apps.templates.models import AuditTemplate
+from core.testing import create_user
+
+
+class DashboardViewsTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = create_user('owner@test.com', 'owner')
+        cls.employee = create_user('employee@test.com')
+        cls.company = Company.objects.create(name='ACME', owner=cls.owner)
+        cls.branch = Branch.objects.create(name='Norte', company=cls.company)
+        cls.template = AuditTemplate.objects.create(
+            name='ISO', iso_standard='27701', created_by=cls.owner
+        )
+        for status in ['completed', 'completed', 'in_progress']:
+            Audit.objects.create(
+                title=f'Auditoría {status}', template=cls.template,
+                company=cls.company, branch=cls.branch,
+                assigned_to=cls.employee, created_by=cls.owner,
+                status=status
+            )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+
+    def test_trends_by_month(self):
+        response = self.client.get('/api/dashboard/trends/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 1)
+        self.assertEqual(response.data[0]['total'], 3)
+        self.assertEqual(response.data[0]['completed'], 2)
+
+    def test_trends_by_week(self):
+        response = self.client.get('/api/dashboard/trends/', {'period': 'week'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(sum(item['total'] for item in response.data), 3)
+
+    def test_trends_through_batch(self):
+        response = self.client.post('/api/batch/', {
+            'requests': [{'id': 'trends', 'path': '/api/dashboard/trends/'}]
+        }, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['responses'][0]['status'], 200)
+
+    def test_all_sections_respond(self):
+        paths = [
+            'overview', 'trends', 'recent-audits', 'company-stats',
+            'score-distribution', 'template-stats', 'top-branches',
+            'period-stats', 'category-performance', 'summary'
+        ]
+        for path in paths:
+            with self.subTest(path=path):
+                response = self.client.get(f'/api/dashboard/{path}/')
+                self.assertEqual(response.status_code, 200)
+
+    def test_trends_not_modified(self):
+        response = self.client.get('/api/dashboard/trends/')
+        etag = response['ETag']
+
+        response = self.client.get('/api/dashboard/trends/', HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
@@ -4,6 +4,7 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework import status
 
 from apps.authentication.permissions import IsOwner
+from audit_system.conditional import conditional_get
 from .services import StatsService
 from .serializers import (
     OverviewStatsSerializer, AuditTrendSerializer, RecentAuditSerializer,
@@ -13,6 +14,14 @@ from .serializers import (
 )
 
 
+def dashboard_state(view, request, *args, **kwargs):
+    """Estado del dashboard del owner para ETag / Last-Modified"""
+    return StatsService.get_dashboard_state(
+        user=request.user,
+        company_id=request.query_params.get('company_id')
+    )
+
+
 class DashboardOverviewView(APIView):
     """
     GET /api/dashboard/overview/
@@ -35,6 +44,7 @@ class DashboardOverviewView(APIView):
     """
     permission_classes = [IsAuthenticated, IsOwner]
 
+    @conditional_get(dashboard_state)
     def get(self, request):
         company_id = request.query_params.get('company_id')
 
@@ -67,6 +77,7 @@ class AuditTrendsView(APIView):
     """
     permission_classes = [IsAuthenticated, IsOwner]
 
+    @conditional_get(dashboard_state)
     def get(self, request):
         company_id = request.query_params.get('company_id')
         period = request.query_params.get('period', 'month')
@@ -108,6 +119,7 @@ class RecentAuditsView(APIView):
     """
     permission_classes = [IsAuthenticated, IsOwner]
 
+    @conditional_get(dashboard_state)
     def get(self, request):
         company_id = request.query_params.get('company_id')
         limit = int(request.query_params.get('limit', 10))
@@ -147,6 +159,7 @@ class CompanyStatsView(APIView):
     """
     permission_classes = [IsAuthenticated, IsOwner]
 
+    @conditional_get(dashboard_state)
     def get(self, request):
         company_id = request.query_params.get('company_id')
 
@@ -180,6 +193,7 @@ class ScoreDistributionView(APIView):
     """
     permission_classes = [IsAuthenticated, IsOwner]
 
+    @conditional_get(dashboard_state)
     def get(self, request):
         company_id = request.query_params.get('company_id')
 
@@ -216,6 +230,7 @@ class TemplateStatsView(APIView):
     """
     permission_classes = [IsAuthenticated, IsOwner]
 
+    @conditional_get(dashboard_state)
     def get(self, request):
         company_id = request.query_params.get('company_id')
 
@@ -252,6 +267,7 @@ class TopBranchesView(APIView):
     """
     permission_classes = [IsAuthenticated, IsOwner]
 
+    @conditional_get(dashboard_state)
     def get(self, request):
         company_id = request.query_params.get('company_id')
         limit = int(request.query_params.get('limit', 10))
@@ -289,6 +305,7 @@ class PeriodStatsView(APIView):
     """
     permission_classes = [IsAuthenticated, IsOwner]
 
+    @conditional_get(dashboard_state)
     def get(self, request):
         company_id = request.query_params.get('company_id')
         period = request.query_params.get('period', 'month')
@@ -327,6 +344,7 @@ class CategoryPerformanceView(APIView):
     """
     permission_classes = [IsAuthenticated, IsOwner]
 
+    @conditional_get(dashboard_state)
     def get(self, request):
         company_id = request.query_params.get('company_id')
 
@@ -362,6 +380,7 @@ class DashboardSummaryView(APIView):
     """
     permission_classes = [IsAuthenticated, IsOwner]
 
+    @conditional_get(dashboard_state)
     def get(self, request):
         company_id = request.query_params.get('company_id')
         user = request.user
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from apps.search.services.search_service import SearchService
+
+
+class Command(BaseCommand):
+    help = 'Recrea los triggers FTS5 faltantes y reconstruye el índice de búsqueda (SQLite)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database',
+            default='default',
+            help='Alias de la base de datos (por defecto default)'
+        )
+
+    def handle(self, *args, **options):
+        using = options['database']
+        if connections[using].vendor != 'sqlite':
+            raise CommandError(
+                'Solo aplica a SQLite: en PostgreSQL los índices GIN se mantienen solos'
+            )
+
+        for name in SearchService.ensure_sqlite_index(using, rebuild=True):
+            self.stdout.write(f'{name}: reconstruido')
+        self.stdout.write(self.style.SUCCESS('Índice de búsqueda actualizado'))
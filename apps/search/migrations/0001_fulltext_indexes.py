@@ -0,0 +1,96 @@
+from django.db import migrations
+
+# Texto indexado por entidad: (app, modelo, tabla FTS5 de SQLite, campos).
+# Debe coincidir con SearchService.SOURCES.
+SOURCES = [
+    ('audits', 'Audit', 'search_audits_fts', ['title']),
+    ('audits', 'AuditResponse', 'search_responses_fts', ['notes']),
+    ('templates', 'TemplateQuestion', 'search_questions_fts', ['question_text', 'help_text']),
+    ('comparisons', 'Recommendation', 'search_recommendations_fts', ['recommendation_text']),
+]
+
+# SQLite descarta los triggers de una tabla cuando una migración posterior
+# la reconstruye (AlterField, RemoveField...). SearchService.ensure_sqlite_index
+# los recrea en post_migrate; también: python manage.py rebuild_search_index
+
+# Configuración de texto de PostgreSQL (SearchService.CONFIG)
+CONFIG = 'spanish'
+
+
+def gin_index(model, fields):
+    from django.contrib.postgres.indexes import GinIndex
+    from django.contrib.postgres.search import SearchVector
+
+    return GinIndex(
+        SearchVector(*fields, config=CONFIG),
+        name=f'{model._meta.db_table}_fts_idx'
+    )
+
+
+def create_indexes(apps, schema_editor):
+    """
+    PostgreSQL: índices GIN sobre la misma expresión to_tsvector que usa
+    SearchService. SQLite (desarrollo): tablas FTS5 de contenido externo
+    sincronizadas con triggers.
+    """
+    vendor = schema_editor.connection.vendor
+
+    for app_label, model_name, fts, fields in SOURCES:
+        model = apps.get_model(app_label, model_name)
+
+        if vendor == 'postgresql':
+            schema_editor.add_index(model, gin_index(model, fields))
+            continue
+        if vendor != 'sqlite':
+            continue
+
+        table = model._meta.db_table
+        columns = ', '.join(fields)
+        new_values = ', '.join(f'new.{field}' for field in fields)
+        old_values = ', '.join(f'old.{field}' for field in fields)
+
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE {fts} USING fts5({columns}, content='{table}', "
+            f"content_rowid='id', tokenize='unicode61 remove_diacritics 2')"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN "
+            f"INSERT INTO {fts}(rowid, {columns}) VALUES (new.id, {new_values}); END"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {columns}) VALUES ('delete', old.id, {old_values}); END"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER {fts}_au AFTER UPDATE OF {columns} ON {table} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {columns}) VALUES ('delete', old.id, {old_values}); "
+            f"INSERT INTO {fts}(rowid, {columns}) VALUES (new.id, {new_values}); END"
+        )
+        schema_editor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def drop_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+
+    for app_label, model_name, fts, fields in SOURCES:
+        model = apps.get_model(app_label, model_name)
+
+        if vendor == 'postgresql':
+            schema_editor.remove_index(model, gin_index(model, fields))
+        elif vendor == 'sqlite':
+            for suffix in ['ai', 'ad', 'au']:
+                schema_editor.execute(f'DROP TRIGGER IF EXISTS {fts}_{suffix}')
+            schema_editor.execute(f'DROP TABLE IF EXISTS {fts}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audits', '0006_idempotencykey'),
+        ('templates', '0002_templatequestion_updated_at'),
+        ('comparisons', '0003_recommendation_question'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
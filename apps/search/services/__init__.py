@@ -0,0 +1,3 @@
+from .search_service import SearchService
+
+__all__ = ['SearchService']
@@ -0,0 +1,197 @@
+from django.db import connection, connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from apps.audits.models import Audit, AuditResponse
+from apps.audits.services.audit_service import AuditService
+from apps.comparisons.models import Recommendation
+from apps.templates.models import TemplateQuestion
+
+
+class SearchService:
+    """
+    Servicio de búsqueda de texto completo.
+
+    En PostgreSQL usa to_tsvector/websearch_to_tsquery con la configuración
+    CONFIG, sobre la misma expresión que los índices GIN de la migración
+    0001, y ordena por ts_rank. En SQLite (desarrollo) usa las tablas FTS5
+    de esa migración y ordena por bm25.
+
+    Cada entidad se filtra con las reglas de visibilidad de su viewset
+    antes de limitar los resultados.
+    """
+
+    # Debe coincidir con la configuración de los índices (migración 0001)
+    CONFIG = 'spanish'
+
+    SOURCES = {
+        'audits': {
+            'model': Audit,
+            'fields': ['title'],
+            'fts': 'search_audits_fts',
+            'values': ['id', 'title', 'status', 'company_id', 'branch_id', 'scheduled_date'],
+        },
+        'responses': {
+            'model': AuditResponse,
+            'fields': ['notes'],
+            'fts': 'search_responses_fts',
+            'values': ['id', 'audit_id', 'question_id', 'notes'],
+        },
+        'questions': {
+            'model': TemplateQuestion,
+            'fields': ['question_text', 'help_text'],
+            'fts': 'search_questions_fts',
+            'values': ['id', 'template_id', 'category', 'question_text', 'help_text'],
+        },
+        'recommendations': {
+            'model': Recommendation,
+            'fields': ['recommendation_text'],
+            'fts': 'search_recommendations_fts',
+            'values': ['id', 'audit_id', 'category', 'priority', 'recommendation_text'],
+        },
+    }
+
+    @staticmethod
+    def get_visible(user, source):
+        """Queryset visible para el usuario (reglas de cada viewset)"""
+        audits = AuditService.get_visible_audits(user)
+
+        if source == 'audits':
+            return audits
+        if source == 'responses':
+            return AuditResponse.objects.filter(audit_id__in=audits.values('id'))
+        if source == 'questions':
+            if user.user_type == 'owner':
+                return TemplateQuestion.objects.filter(
+                    Q(template__is_active=True) | Q(template__created_by=user)
+                )
+            return TemplateQuestion.objects.filter(template__is_active=True)
+
+        if user.user_type == 'owner':
+            return Recommendation.objects.filter(audit__company__owner=user)
+        return Recommendation.objects.filter(audit__assigned_to=user)
+
+    @staticmethod
+    def ensure_sqlite_index(using='default', rebuild=False):
+        """
+        Recrea en SQLite las tablas FTS5 y triggers de la migración 0001 que
+        falten y reconstruye su índice.
+
+        Al reconstruir una tabla (p. ej. AlterField) SQLite descarta sus
+        triggers y el índice deja de actualizarse; se llama en post_migrate
+        y desde el comando rebuild_search_index.
+
+        Retorna: entidades reparadas (o reconstruidas con rebuild)
+        """
+        db = connections[using]
+        if db.vendor != 'sqlite':
+            return []
+
+        repaired = []
+        with db.cursor() as cursor:
+            cursor.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger')")
+            existing = {row[0] for row in cursor.fetchall()}
+
+            for name, source in SearchService.SOURCES.items():
+                fts = source['fts']
+                table = source['model']._meta.db_table
+                if table not in existing:
+                    continue
+
+                columns = ', '.join(source['fields'])
+                new_values = ', '.join(f'new.{field}' for field in source['fields'])
+                old_values = ', '.join(f'old.{field}' for field in source['fields'])
+                statements = {
+                    fts: (
+                        f"CREATE VIRTUAL TABLE {fts} USING fts5({columns}, content='{table}', "
+                        f"content_rowid='id', tokenize='unicode61 remove_diacritics 2')"
+                    ),
+                    f'{fts}_ai': (
+                        f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN "
+                        f"INSERT INTO {fts}(rowid, {columns}) VALUES (new.id, {new_values}); END"
+                    ),
+                    f'{fts}_ad': (
+                        f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN "
+                        f"INSERT INTO {fts}({fts}, rowid, {columns}) VALUES ('delete', old.id, {old_values}); END"
+                    ),
+                    f'{fts}_au': (
+                        f"CREATE TRIGGER {fts}_au AFTER UPDATE OF {columns} ON {table} BEGIN "
+                        f"INSERT INTO {fts}({fts}, rowid, {columns}) VALUES ('delete', old.id, {old_values}); "
+                        f"INSERT INTO {fts}(rowid, {columns}) VALUES (new.id, {new_values}); END"
+                    ),
+                }
+
+                missing = [obj for obj in statements if obj not in existing]
+                for obj in missing:
+                    cursor.execute(statements[obj])
+
+                if missing or rebuild:
+                    cursor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+                    repaired.append(name)
+
+        return repaired
+
+    @staticmethod
+    def _search_postgres(queryset, source, text):
+        from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+
+        vector = SearchVector(*source['fields'], config=SearchService.CONFIG)
+        query = SearchQuery(text, config=SearchService.CONFIG, search_type='websearch')
+
+        return queryset.annotate(
+            document=vector
+        ).filter(
+            document=query
+        ).annotate(
+            rank=SearchRank(vector, query)
+        )
+
+    @staticmethod
+    def fts5_query(text):
+        """Términos entre comillas (sin operadores FTS5); todos requeridos"""
+        return ' '.join(
+            '"{}"'.format(term.replace('"', '""')) for term in text.split()
+        )
+
+    @staticmethod
+    def _search_sqlite(queryset, source, text):
+        fts = source['fts']
+        table = source['model']._meta.db_table
+        match = SearchService.fts5_query(text)
+
+        # bm25 es menor cuanto más relevante: se invierte para ordenar igual
+        # que ts_rank
+        return queryset.filter(
+            id__in=RawSQL(f'SELECT rowid FROM {fts} WHERE {fts} MATCH %s', [match])
+        ).annotate(
+            rank=RawSQL(
+                f'SELECT -bm25({fts}) FROM {fts} WHERE {fts} MATCH %s AND rowid = "{table}"."id"',
+                [match]
+            )
+        )
+
+    @staticmethod
+    def search(user, text, sources=None, limit=10):
+        """
+        Busca text en las entidades indicadas (todas por defecto).
+
+        Retorna dict {entidad: [resultados ordenados por rank]} con a lo
+        sumo limit resultados por entidad.
+        """
+        if connection.vendor == 'postgresql':
+            backend = SearchService._search_postgres
+        else:
+            backend = SearchService._search_sqlite
+
+        results = {}
+        for name in sources or SearchService.SOURCES:
+            source = SearchService.SOURCES[name]
+            queryset = backend(SearchService.get_visible(user, name), source, text)
+
+            rows = list(queryset.order_by('-rank', 'id').values(
+                *source['values'], 'rank'
+            )[:limit])
+            for row in rows:
+                row['rank'] = round(row['rank'], 4)
+            results[name] = rows
+
+        return results
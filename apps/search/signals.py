@@ -0,0 +1,22 @@
+from django.db import connections
+from django.db.migrations.recorder import MigrationRecorder
+from django.db.models.signals import post_migrate
+from django.dispatch import receiver
+
+
+@receiver(post_migrate)
+def ensure_sqlite_index(sender, using='default', **kwargs):
+    """Recrea los triggers FTS5 que una migración haya descartado (SQLite)"""
+    from .services.search_service import SearchService
+
+    # post_migrate se envía una vez por app con modelos (search no tiene);
+    # basta con una de las apps indexadas
+    if sender.label != 'audits':
+        return
+
+    # Antes de aplicar 0001 las tablas FTS5 las crea la migración
+    applied = MigrationRecorder(connections[using]).applied_migrations()
+    if ('search', '0001_fulltext_indexes') not in applied:
+        return
+
+    SearchService.ensure_sqlite_index(using)
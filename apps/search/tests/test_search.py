@@ -0,0 +1,97 @@
+from io import StringIO
+from unittest import skipUnless
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from rest_framework.test import APIClient
+from apps.audits.models import Audit
+from apps.companies.models import Company, Branch
+from apps.search.services.search_service import SearchService
+from apps.templates.models import AuditTemplate
+from core.testing import create_user
+
+
+class SearchTestData(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = create_user('owner@test.com', 'owner')
+        cls.other_owner = create_user('other@test.com', 'owner')
+        cls.employee = create_user('employee@test.com')
+        cls.other_employee = create_user('other.employee@test.com')
+        cls.template = AuditTemplate.objects.create(
+            name='ISO', iso_standard='27701', created_by=cls.owner
+        )
+
+        cls.own_audit = cls.create_audit(cls.owner, cls.employee, 'Control de acceso central')
+        cls.foreign_audit = cls.create_audit(
+            cls.other_owner, cls.other_employee, 'Control de acceso ajeno'
+        )
+
+    @classmethod
+    def create_audit(cls, owner, assigned_to, title):
+        company = Company.objects.create(name=f'Empresa {owner.email}', owner=owner)
+        branch = Branch.objects.create(name='Centro', company=company)
+        return Audit.objects.create(
+            title=title, template=cls.template, company=company, branch=branch,
+            assigned_to=assigned_to, created_by=owner
+        )
+
+    def search_ids(self, user, text='control acceso'):
+        client = APIClient()
+        client.force_authenticate(user)
+        response = client.get('/api/search/', {'q': text, 'types': 'audits'})
+        self.assertEqual(response.status_code, 200)
+        return [row['id'] for row in response.data['results']['audits']]
+
+
+class SearchVisibilityTests(SearchTestData):
+    """La búsqueda aplica las mismas reglas que AuditViewSet"""
+
+    def test_owner_sees_only_own_company_audits(self):
+        self.assertEqual(self.search_ids(self.owner), [self.own_audit.id])
+        self.assertEqual(self.search_ids(self.other_owner), [self.foreign_audit.id])
+
+    def test_employee_sees_only_assigned_audits(self):
+        self.assertEqual(self.search_ids(self.employee), [self.own_audit.id])
+
+    def test_matches_audit_list(self):
+        client = APIClient()
+        client.force_authenticate(self.owner)
+        listed = [row['id'] for row in client.get('/api/audits/').data['results']]
+
+        self.assertEqual(self.search_ids(self.owner), listed)
+
+
+@skipUnless(connection.vendor == 'sqlite', 'Tablas FTS5 de SQLite')
+class SqliteIndexRepairTests(SearchTestData):
+    """Triggers FTS5 descartados al reconstruir una tabla"""
+
+    def drop_audit_triggers(self):
+        with connection.cursor() as cursor:
+            for suffix in ['ai', 'ad', 'au']:
+                cursor.execute(f'DROP TRIGGER search_audits_fts_{suffix}')
+
+    def test_ensure_recreates_missing_triggers(self):
+        self.drop_audit_triggers()
+        audit = self.create_audit(self.owner, self.employee, 'Inventario de activos')
+        self.assertEqual(self.search_ids(self.owner, 'inventario'), [])
+
+        self.assertEqual(SearchService.ensure_sqlite_index(), ['audits'])
+
+        self.assertEqual(self.search_ids(self.owner, 'inventario'), [audit.id])
+        audit.title = 'Revisión de proveedores'
+        audit.save()
+        self.assertEqual(self.search_ids(self.owner, 'proveedores'), [audit.id])
+
+    def test_ensure_is_noop_when_intact(self):
+        self.assertEqual(SearchService.ensure_sqlite_index(), [])
+
+    def test_rebuild_command(self):
+        self.drop_audit_triggers()
+        out = StringIO()
+
+        call_command('rebuild_search_index', stdout=out)
+
+        self.assertIn('audits: reconstruido', out.getvalue())
+        self.assertEqual(SearchService.ensure_sqlite_index(), [])
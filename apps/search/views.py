@@ -0,0 +1,67 @@
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+from rest_framework import status
+
+from .services import SearchService
+
+
+class SearchView(APIView):
+    """
+    GET /api/search/?q=control de acceso&types=audits,questions&limit=10
+
+    Búsqueda de texto completo en títulos de auditorías, notas de
+    respuestas, preguntas (texto y ayuda) y recomendaciones visibles para
+    el usuario. Cada entidad se ordena por relevancia.
+
+    Query params:
+    - q: texto a buscar (mínimo 2 caracteres)
+    - types: entidades separadas por coma (por defecto todas)
+    - limit: resultados por entidad (1-50, por defecto 10)
+
+    Retorna:
+    {
+        "query": "control de acceso",
+        "results": {
+            "audits": [{"id": 1, "title": "...", "rank": 0.0608, ...}],
+            "questions": [...]
+        }
+    }
+    """
+    permission_classes = [IsAuthenticated]
+
+    MAX_LIMIT = 50
+
+    def get(self, request):
+        text = request.query_params.get('q', '').strip()
+        if len(text) < 2:
+            return Response(
+                {'error': 'q debe tener al menos 2 caracteres'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        types = request.query_params.get('types')
+        sources = None
+        if types:
+            sources = [name.strip() for name in types.split(',') if name.strip()]
+            invalid = [name for name in sources if name not in SearchService.SOURCES]
+            if invalid:
+                return Response(
+                    {
+                        'error': f'Tipos no válidos: {", ".join(invalid)}',
+                        'valid_types': list(SearchService.SOURCES)
+                    },
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+        limit = request.query_params.get('limit', '10')
+        if not limit.isdigit() or not 1 <= int(limit) <= self.MAX_LIMIT:
+            return Response(
+                {'error': f'limit debe ser un entero entre 1 y {self.MAX_LIMIT}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        return Response({
+            'query': text,
+            'results': SearchService.search(request.user, text, sources, int(limit))
+        })
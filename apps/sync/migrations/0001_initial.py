@@ -0,0 +1,37 @@
+# Generated by Django 5.0 on 2026-10-18 23:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SyncChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entity', models.CharField(choices=[('audit', 'Auditoría'), ('response', 'Respuesta'), ('template', 'Plantilla'), ('question', 'Pregunta')], max_length=20, verbose_name='Entidad')),
+                ('object_id', models.BigIntegerField(verbose_name='ID del objeto')),
+                ('audit_id', models.BigIntegerField(blank=True, null=True, verbose_name='Auditoría')),
+                ('template_id', models.BigIntegerField(blank=True, null=True, verbose_name='Plantilla')),
+                ('company_id', models.BigIntegerField(blank=True, null=True, verbose_name='Empresa')),
+                ('assigned_to_id', models.BigIntegerField(blank=True, null=True, verbose_name='Asignado a')),
+                ('created_by_id', models.BigIntegerField(blank=True, null=True, verbose_name='Creado por')),
+                ('created', models.BooleanField(default=False, verbose_name='Creación')),
+                ('deleted', models.BooleanField(default=False, verbose_name='Eliminación')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Cambio de Sincronización',
+                'verbose_name_plural': 'Cambios de Sincronización',
+                'db_table': 'sync_changes',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['company_id', 'id'], name='sync_change_company_e4cef8_idx'), models.Index(fields=['assigned_to_id', 'id'], name='sync_change_assigne_4ccafe_idx'), models.Index(fields=['created_by_id', 'id'], name='sync_change_created_e324d1_idx'), models.Index(fields=['audit_id', 'id'], name='sync_change_audit_i_7c436e_idx'), models.Index(fields=['template_id', 'id'], name='sync_change_templat_5f3760_idx')],
+            },
+        ),
+    ]
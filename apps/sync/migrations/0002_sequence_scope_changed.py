@@ -0,0 +1,32 @@
+# Generated by Django 5.0 on 2026-10-19 00:26
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def populate_sequence(apps, schema_editor):
+    # Las filas existentes ya están confirmadas: sequence = id mantiene
+    # válidos los cursores que guardan los clientes
+    SyncChange = apps.get_model('sync', 'SyncChange')
+    SyncChange.objects.update(sequence=F('id'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sync', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='syncchange',
+            name='scope_changed',
+            field=models.BooleanField(default=False, help_text='La auditoría cambió de empresa, asignado o creador', verbose_name='Cambio de alcance'),
+        ),
+        migrations.AddField(
+            model_name='syncchange',
+            name='sequence',
+            field=models.BigIntegerField(blank=True, help_text='Orden de commit (cursor). Vacío hasta que confirma la transacción', null=True, unique=True, verbose_name='Secuencia'),
+        ),
+        migrations.RunPython(populate_sequence, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,99 @@
+from django.db import models
+
+
+class SyncChange(models.Model):
+    """
+    Registro de cambios para la sincronización incremental de clientes
+    offline. Cada escritura sobre auditorías, respuestas, plantillas o
+    preguntas agrega una fila.
+
+    El cursor que guarda el cliente es sequence, no el id: el id se asigna
+    al insertar y una transacción larga puede confirmar después de otra
+    con un id mayor. sequence se asigna tras el commit, en orden, por
+    SyncService.assign_sequence; las filas sin sequence aún no se envían.
+
+    Las referencias son enteros simples (sin FK) para que las filas de
+    eliminación (tombstones) sobrevivan al objeto. Las filas de auditorías
+    guardan empresa, asignado y creador para filtrar por visibilidad sin
+    consultar la auditoría.
+    """
+
+    ENTITY_CHOICES = [
+        ('audit', 'Auditoría'),
+        ('response', 'Respuesta'),
+        ('template', 'Plantilla'),
+        ('question', 'Pregunta'),
+    ]
+
+    entity = models.CharField(
+        max_length=20,
+        choices=ENTITY_CHOICES,
+        verbose_name='Entidad'
+    )
+    object_id = models.BigIntegerField(
+        verbose_name='ID del objeto'
+    )
+    sequence = models.BigIntegerField(
+        null=True,
+        blank=True,
+        unique=True,
+        verbose_name='Secuencia',
+        help_text='Orden de commit (cursor). Vacío hasta que confirma la transacción'
+    )
+    audit_id = models.BigIntegerField(
+        null=True,
+        blank=True,
+        verbose_name='Auditoría'
+    )
+    template_id = models.BigIntegerField(
+        null=True,
+        blank=True,
+        verbose_name='Plantilla'
+    )
+    company_id = models.BigIntegerField(
+        null=True,
+        blank=True,
+        verbose_name='Empresa'
+    )
+    assigned_to_id = models.BigIntegerField(
+        null=True,
+        blank=True,
+        verbose_name='Asignado a'
+    )
+    created_by_id = models.BigIntegerField(
+        null=True,
+        blank=True,
+        verbose_name='Creado por'
+    )
+    created = models.BooleanField(
+        default=False,
+        verbose_name='Creación'
+    )
+    deleted = models.BooleanField(
+        default=False,
+        verbose_name='Eliminación'
+    )
+    scope_changed = models.BooleanField(
+        default=False,
+        verbose_name='Cambio de alcance',
+        help_text='La auditoría cambió de empresa, asignado o creador'
+    )
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'sync_changes'
+        verbose_name = 'Cambio de Sincronización'
+        verbose_name_plural = 'Cambios de Sincronización'
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['company_id', 'id']),
+            models.Index(fields=['assigned_to_id', 'id']),
+            models.Index(fields=['created_by_id', 'id']),
+            models.Index(fields=['audit_id', 'id']),
+            models.Index(fields=['template_id', 'id']),
+        ]
+
+    def __str__(self):
+        action = 'eliminado' if self.deleted else 'modificado'
+        return f"#{self.id} {self.entity} {self.object_id} {action}"
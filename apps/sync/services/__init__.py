@@ -0,0 +1,3 @@
+from .sync_service import SyncService
+
+__all__ = ['SyncService']
@@ -0,0 +1,314 @@
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Max, Min, Q
+from apps.audits.models import Audit, AuditResponse
+from apps.templates.models import AuditTemplate, TemplateQuestion
+from apps.sync.models import SyncChange
+
+
+class SyncService:
+    """
+    Servicio de sincronización incremental para auditores offline.
+
+    El cliente guarda el cursor recibido y en la siguiente sincronización
+    solo recibe las auditorías, respuestas, plantillas y preguntas de su
+    alcance que cambiaron después de ese cursor, más los IDs eliminados o
+    que dejaron de ser visibles (tombstones).
+
+    El cursor es SyncChange.sequence, asignado después del commit por
+    assign_sequence: un cambio visible con sequence N implica que todos
+    los anteriores ya son visibles, así que ninguno queda atrás del cursor.
+
+    El alcance es el mismo de AuditViewSet: owners ven las auditorías de
+    sus empresas o que crearon; employees, las asignadas. Las plantillas y
+    preguntas visibles son las de esas auditorías.
+    """
+
+    ENTITIES = {
+        Audit: 'audit',
+        AuditResponse: 'response',
+        AuditTemplate: 'template',
+        TemplateQuestion: 'question',
+    }
+
+    # Campos enviados al cliente por entidad
+    FIELDS = {
+        'audit': [
+            'id', 'title', 'status', 'template_id', 'company_id', 'branch_id',
+            'assigned_to_id', 'scheduled_date', 'started_at', 'completed_at',
+            'total_score', 'max_possible_score', 'score_percentage', 'notes',
+            'version', 'updated_at'
+        ],
+        'response': [
+            'id', 'audit_id', 'question_id', 'response_type', 'score',
+            'notes', 'evidence_file', 'updated_at'
+        ],
+        'template': [
+            'id', 'name', 'iso_standard', 'description', 'is_active',
+            'version', 'updated_at'
+        ],
+        'question': [
+            'id', 'template_id', 'category', 'question_text', 'order_num',
+            'max_score', 'is_required', 'help_text', 'updated_at'
+        ],
+    }
+
+    # Clave de cada entidad en la respuesta
+    KEYS = {
+        'audit': 'audits',
+        'response': 'responses',
+        'template': 'templates',
+        'question': 'questions',
+    }
+
+    # Clave del advisory lock (PostgreSQL) que serializa assign_sequence
+    SEQUENCE_LOCK_ID = 7_301_001
+
+    @staticmethod
+    def _change(instance, created, deleted, scope_changed=False):
+        """Fila de SyncChange para una instancia"""
+        entity = SyncService.ENTITIES[type(instance)]
+        change = SyncChange(
+            entity=entity,
+            object_id=instance.pk,
+            created=created,
+            deleted=deleted,
+            scope_changed=scope_changed
+        )
+
+        if entity == 'audit':
+            change.template_id = instance.template_id
+            change.company_id = instance.company_id
+            change.assigned_to_id = instance.assigned_to_id
+            change.created_by_id = instance.created_by_id
+        elif entity == 'response':
+            change.audit_id = instance.audit_id
+        elif entity == 'template':
+            change.template_id = instance.pk
+        else:
+            change.template_id = instance.template_id
+
+        return change
+
+    @staticmethod
+    def record(instances, created=False, deleted=False, scope_changed=False):
+        """
+        Registra cambios de varias instancias con un solo INSERT.
+        Las señales cubren save()/delete(); las escrituras en lote
+        (bulk_create, update) deben llamarlo explícitamente.
+
+        La secuencia se asigna al confirmar la transacción.
+        """
+        changes = [
+            SyncService._change(instance, created, deleted, scope_changed)
+            for instance in instances
+        ]
+        if changes:
+            SyncChange.objects.bulk_create(changes)
+            transaction.on_commit(SyncService.assign_sequence)
+
+    @staticmethod
+    def assign_sequence():
+        """
+        Asigna sequence, en orden de id, a las filas confirmadas que aún no
+        la tienen, a continuación de la última asignada.
+
+        Las asignaciones se serializan (advisory lock en PostgreSQL; SQLite
+        ya serializa las escrituras) y cada una confirma antes de que
+        empiece la siguiente, así que el orden de sequence es el de commit.
+        Si un proceso muere antes de llegar aquí, la siguiente asignación
+        recoge sus filas.
+        """
+        with transaction.atomic():
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        'SELECT pg_advisory_xact_lock(%s)', [SyncService.SEQUENCE_LOCK_ID]
+                    )
+
+            pending = SyncChange.objects.filter(sequence__isnull=True)
+            first = pending.aggregate(first=Min('id'))['first']
+            if first is None:
+                return
+
+            last = SyncChange.objects.aggregate(last=Max('sequence'))['last'] or 0
+            # Filas con id menor que first que confirmen mientras tanto quedan
+            # para la siguiente asignación (con sequence mayor)
+            pending.filter(id__gte=first).update(
+                sequence=F('id') - first + last + 1
+            )
+
+    # Campos de la auditoría que determinan quién la ve
+    AUDIT_SCOPE_FIELDS = ['company_id', 'assigned_to_id', 'created_by_id']
+
+    @staticmethod
+    def get_audit_scope(audit):
+        """Alcance cargado de la auditoría (los campos diferidos se omiten)"""
+        return {
+            field: audit.__dict__[field]
+            for field in SyncService.AUDIT_SCOPE_FIELDS
+            if field in audit.__dict__
+        }
+
+    @staticmethod
+    def record_previous_scope(audit, previous):
+        """
+        Si la auditoría cambió de empresa, asignado o creador, registra una
+        fila con el alcance anterior: quienes dejaron de verla la reciben
+        en deleted en su siguiente sincronización.
+
+        Retorna True si el alcance cambió (la fila del nuevo alcance debe
+        marcarse con scope_changed).
+        """
+        current = SyncService.get_audit_scope(audit)
+        if all(current.get(field) == value for field, value in previous.items()):
+            return False
+
+        change = SyncService._change(audit, created=False, deleted=False)
+        for field, value in previous.items():
+            setattr(change, field, value)
+        change.save()
+        return True
+
+    @staticmethod
+    def _audit_scope(user):
+        """Filtro de visibilidad sobre las columnas de SyncChange"""
+        if user.user_type == 'owner':
+            from apps.companies.models import Company
+            return (
+                Q(company_id__in=Company.objects.filter(owner=user).values('id')) |
+                Q(created_by_id=user.id)
+            )
+        return Q(assigned_to_id=user.id)
+
+    @staticmethod
+    def _serialize(entity, queryset):
+        """Filas compactas (values) de una entidad"""
+        return list(queryset.order_by('id').values(*SyncService.FIELDS[entity]))
+
+    @staticmethod
+    def _empty_deleted():
+        return {key: [] for key in SyncService.KEYS.values()}
+
+    @staticmethod
+    def get_snapshot(user):
+        """
+        Descarga completa del alcance del usuario (primera sincronización).
+        El cursor se lee antes de los datos: un cambio que confirme después
+        recibe una sequence mayor, así que puede reenviarse en la siguiente
+        sincronización pero no perderse.
+        """
+        # Import local: audit_service importa este módulo
+        from apps.audits.services.audit_service import AuditService
+
+        cursor = SyncChange.objects.aggregate(last=Max('sequence'))['last'] or 0
+
+        audits = AuditService.get_visible_audits(user)
+        template_ids = audits.values('template_id')
+
+        return {
+            'cursor': cursor,
+            'full': True,
+            'has_more': False,
+            'audits': SyncService._serialize('audit', audits),
+            'responses': SyncService._serialize(
+                'response', AuditResponse.objects.filter(audit_id__in=audits.values('id'))
+            ),
+            'templates': SyncService._serialize(
+                'template', AuditTemplate.objects.filter(id__in=template_ids)
+            ),
+            'questions': SyncService._serialize(
+                'question', TemplateQuestion.objects.filter(template_id__in=template_ids)
+            ),
+            'deleted': SyncService._empty_deleted()
+        }
+
+    @staticmethod
+    def get_changes(user, cursor, limit=None):
+        """
+        Cambios del alcance del usuario posteriores al cursor.
+
+        Lee a lo sumo limit filas del registro; si hay más, has_more es
+        True y el cursor devuelto apunta a la última fila procesada. Los
+        objetos cambiados que ya no existen o dejaron de ser visibles se
+        informan en deleted. Para auditorías nuevas o que entraron al
+        alcance (reasignadas, movidas de empresa) se incluyen además su
+        plantilla, preguntas y respuestas completas.
+
+        Un cursor mayor al último registrado (base reiniciada) produce una
+        descarga completa.
+        """
+        limit = limit or settings.SYNC_PAGE_SIZE
+        last = SyncChange.objects.aggregate(last=Max('sequence'))['last'] or 0
+        if cursor > last:
+            return SyncService.get_snapshot(user)
+
+        from apps.audits.services.audit_service import AuditService
+
+        audits = AuditService.get_visible_audits(user)
+        audit_ids = audits.values('id')
+        template_ids = audits.values('template_id')
+
+        rows = list(SyncChange.objects.filter(
+            sequence__gt=cursor,
+            sequence__lte=last
+        ).filter(
+            (Q(entity='audit') & SyncService._audit_scope(user)) |
+            Q(entity='response', audit_id__in=audit_ids) |
+            Q(entity__in=['template', 'question'], template_id__in=template_ids)
+        ).order_by('sequence').values_list(
+            'sequence', 'entity', 'object_id', 'created', 'scope_changed'
+        )[:limit + 1])
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        changed = {entity: set() for entity in SyncService.FIELDS}
+        # Auditorías que el cliente puede no tener: se envían completas
+        new_audits = set()
+        for _, entity, object_id, created, scope_changed in rows:
+            changed[entity].add(object_id)
+            if entity == 'audit' and (created or scope_changed):
+                new_audits.add(object_id)
+
+        result = {
+            'cursor': rows[-1][0] if has_more else last,
+            'full': False,
+            'has_more': has_more,
+            'deleted': SyncService._empty_deleted()
+        }
+
+        audits_data = SyncService._serialize(
+            'audit', audits.filter(id__in=changed['audit'])
+        )
+        new_audits = {audit['id'] for audit in audits_data if audit['id'] in new_audits}
+        new_templates = {
+            audit['template_id'] for audit in audits_data
+            if audit['id'] in new_audits
+        }
+
+        result['audits'] = audits_data
+        result['responses'] = SyncService._serialize(
+            'response', AuditResponse.objects.filter(
+                Q(id__in=changed['response']) | Q(audit_id__in=new_audits),
+                audit_id__in=audit_ids
+            )
+        )
+        result['templates'] = SyncService._serialize(
+            'template', AuditTemplate.objects.filter(
+                Q(id__in=changed['template']) | Q(id__in=new_templates),
+                id__in=template_ids
+            )
+        )
+        result['questions'] = SyncService._serialize(
+            'question', TemplateQuestion.objects.filter(
+                Q(id__in=changed['question']) | Q(template_id__in=new_templates),
+                template_id__in=template_ids
+            )
+        )
+
+        for entity, key in SyncService.KEYS.items():
+            present = {item['id'] for item in result[key]}
+            result['deleted'][key] = sorted(changed[entity] - present)
+
+        return result
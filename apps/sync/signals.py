@@ -0,0 +1,36 @@
+from django.db.models.signals import post_init, post_save, post_delete
+from django.dispatch import receiver
+from apps.audits.models import Audit, AuditResponse
+from apps.templates.models import AuditTemplate, TemplateQuestion
+from .services.sync_service import SyncService
+
+
+@receiver(post_init, sender=Audit)
+def remember_audit_scope(sender, instance, **kwargs):
+    """Guarda el alcance cargado para detectar reasignaciones"""
+    instance._sync_scope = SyncService.get_audit_scope(instance)
+
+
+@receiver(post_save, sender=Audit)
+@receiver(post_save, sender=AuditResponse)
+@receiver(post_save, sender=AuditTemplate)
+@receiver(post_save, sender=TemplateQuestion)
+def record_save(sender, instance, created, raw=False, **kwargs):
+    """Registra la creación o modificación para la sincronización"""
+    if raw:
+        return
+    scope_changed = False
+    if sender is Audit and not created:
+        scope_changed = SyncService.record_previous_scope(instance, instance._sync_scope)
+    SyncService.record([instance], created=created, scope_changed=scope_changed)
+    if sender is Audit:
+        instance._sync_scope = SyncService.get_audit_scope(instance)
+
+
+@receiver(post_delete, sender=Audit)
+@receiver(post_delete, sender=AuditResponse)
+@receiver(post_delete, sender=AuditTemplate)
+@receiver(post_delete, sender=TemplateQuestion)
+def record_delete(sender, instance, **kwargs):
+    """Registra la eliminación (tombstone) para la sincronización"""
+    SyncService.record([instance], deleted=True)
@@ -0,0 +1,179 @@
+from django.test import TestCase
+from rest_framework.test import APIClient
+from apps.audits.models import Audit, AuditResponse
+from apps.companies.models import Company, Branch
+from apps.sync.models import SyncChange
+from apps.sync.services import SyncService
+from apps.templates.models import AuditTemplate, TemplateQuestion
+from core.testing import create_user
+
+
+class SyncChangesTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = create_user('owner@test.com', 'owner')
+        cls.employees = [create_user(f'e{i}@test.com') for i in range(2)]
+        cls.company = Company.objects.create(name='ACME', owner=cls.owner)
+        cls.branch = Branch.objects.create(name='Norte', company=cls.company)
+        cls.template = AuditTemplate.objects.create(
+            name='ISO', iso_standard='27701', created_by=cls.owner
+        )
+        cls.question = TemplateQuestion.objects.create(
+            template=cls.template, category='A', question_text='¿Pregunta?',
+            order_num=1, max_score=4
+        )
+
+    def setUp(self):
+        with self.commit():
+            self.audit = Audit.objects.create(
+                title='Auditoría', template=self.template, company=self.company,
+                branch=self.branch, assigned_to=self.employees[0], created_by=self.owner
+            )
+            self.response = AuditResponse.objects.create(
+                audit=self.audit, question=self.question, score=4, response_type='yes'
+            )
+
+    def commit(self):
+        """Ejecuta los on_commit (asignación de sequence) al salir del bloque"""
+        return self.captureOnCommitCallbacks(execute=True)
+
+    def cursor(self, user):
+        return SyncService.get_snapshot(user)['cursor']
+
+    def test_snapshot_contains_scope(self):
+        snapshot = SyncService.get_snapshot(self.employees[0])
+
+        self.assertEqual([a['id'] for a in snapshot['audits']], [self.audit.id])
+        self.assertEqual([r['id'] for r in snapshot['responses']], [self.response.id])
+        self.assertEqual([q['id'] for q in snapshot['questions']], [self.question.id])
+        self.assertEqual(SyncService.get_snapshot(self.employees[1])['audits'], [])
+
+    def test_update_is_sent_as_change(self):
+        cursor = self.cursor(self.employees[0])
+        with self.commit():
+            self.response.notes = 'Observación'
+            self.response.save()
+
+        changes = SyncService.get_changes(self.employees[0], cursor)
+
+        self.assertEqual([r['notes'] for r in changes['responses']], ['Observación'])
+
+    def test_reassigned_audit_sends_tombstone_to_previous_assignee(self):
+        previous, new = self.employees
+        previous_cursor = self.cursor(previous)
+        new_cursor = self.cursor(new)
+
+        with self.commit():
+            audit = Audit.objects.get(id=self.audit.id)
+            audit.assigned_to = new
+            audit.save()
+
+        changes = SyncService.get_changes(previous, previous_cursor)
+        self.assertEqual(changes['audits'], [])
+        self.assertEqual(changes['deleted']['audits'], [self.audit.id])
+
+        changes = SyncService.get_changes(new, new_cursor)
+        self.assertEqual([a['id'] for a in changes['audits']], [self.audit.id])
+        self.assertEqual(changes['deleted']['audits'], [])
+
+    def test_reassigned_audit_arrives_complete(self):
+        new = self.employees[1]
+        cursor = self.cursor(new)
+
+        with self.commit():
+            audit = Audit.objects.get(id=self.audit.id)
+            audit.assigned_to = new
+            audit.save()
+
+        changes = SyncService.get_changes(new, cursor)
+        self.assertEqual([a['id'] for a in changes['audits']], [self.audit.id])
+        self.assertEqual([r['id'] for r in changes['responses']], [self.response.id])
+        self.assertEqual([t['id'] for t in changes['templates']], [self.template.id])
+        self.assertEqual([q['id'] for q in changes['questions']], [self.question.id])
+
+    def test_plain_update_does_not_resend_template(self):
+        cursor = self.cursor(self.employees[0])
+
+        with self.commit():
+            self.audit.notes = 'Notas'
+            self.audit.save()
+
+        changes = SyncService.get_changes(self.employees[0], cursor)
+        self.assertEqual(changes['responses'], [])
+        self.assertEqual(changes['templates'], [])
+        self.assertEqual(changes['questions'], [])
+
+    def test_late_commit_is_not_skipped(self):
+        user = self.employees[0]
+        cursor = self.cursor(user)
+
+        # A obtiene su id pero no confirma todavía (la fila no es visible)
+        SyncService.record([self.response])
+        in_flight = SyncChange.objects.latest('id')
+        in_flight_id = in_flight.id
+        in_flight.delete()
+
+        # B, con un id mayor, confirma primero y el cliente sincroniza
+        with self.commit():
+            self.audit.notes = 'Notas'
+            self.audit.save()
+        cursor = SyncService.get_changes(user, cursor)['cursor']
+
+        # A confirma
+        in_flight.id = in_flight_id
+        in_flight.save(force_insert=True)
+        SyncService.assign_sequence()
+
+        self.assertLess(in_flight_id, SyncChange.objects.latest('id').id)
+        changes = SyncService.get_changes(user, cursor)
+        self.assertEqual([r['id'] for r in changes['responses']], [self.response.id])
+
+    def test_uncommitted_rows_are_not_served(self):
+        user = self.employees[0]
+        cursor = self.cursor(user)
+
+        with self.captureOnCommitCallbacks(execute=False):
+            self.response.notes = 'Sin confirmar'
+            self.response.save()
+
+            changes = SyncService.get_changes(user, cursor)
+
+        self.assertEqual(changes['cursor'], cursor)
+        self.assertEqual(changes['responses'], [])
+
+    def test_save_without_scope_change_records_one_row(self):
+        cursor = self.cursor(self.employees[0])
+
+        with self.commit():
+            self.audit.notes = 'Notas'
+            self.audit.save()
+
+        changes = SyncService.get_changes(self.employees[0], cursor)
+        self.assertEqual(changes['cursor'] - cursor, 1)
+        self.assertEqual(changes['deleted']['audits'], [])
+
+    def test_deleted_audit_sends_tombstone(self):
+        cursor = self.cursor(self.employees[0])
+        audit_id = self.audit.id
+
+        with self.commit():
+            self.audit.delete()
+
+        changes = SyncService.get_changes(self.employees[0], cursor)
+        self.assertEqual(changes['deleted']['audits'], [audit_id])
+        # Las respuestas de una auditoría eliminada las borra el cliente
+        self.assertEqual(changes['deleted']['responses'], [])
+
+    def test_sync_endpoint(self):
+        client = APIClient()
+        client.force_authenticate(self.employees[0])
+
+        snapshot = client.get('/api/sync/').data
+        self.assertTrue(snapshot['full'])
+
+        response = client.get('/api/sync/', {'cursor': snapshot['cursor']})
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.data['full'])
+
+        self.assertEqual(client.get('/api/sync/', {'cursor': '-1'}).status_code, 400)
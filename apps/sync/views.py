@@ -0,0 +1,47 @@
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+from rest_framework import status
+
+from .services import SyncService
+
+
+class SyncView(APIView):
+    """
+    GET /api/sync/?cursor=1234
+
+    Sincronización incremental para clientes offline.
+
+    Sin cursor (o cursor=0) retorna el alcance completo del usuario y el
+    cursor actual. Con cursor retorna solo lo que cambió después, más los
+    IDs eliminados en deleted. Si has_more es true, repetir con el nuevo
+    cursor.
+
+    Retorna:
+    {
+        "cursor": 1301,
+        "full": false,
+        "has_more": false,
+        "audits": [...],
+        "responses": [...],
+        "templates": [...],
+        "questions": [...],
+        "deleted": {"audits": [], "responses": [], "templates": [], "questions": []}
+    }
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        cursor = request.query_params.get('cursor', '0')
+
+        if not cursor.isdigit():
+            return Response(
+                {'error': 'cursor debe ser un entero no negativo'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        cursor = int(cursor)
+        if cursor == 0:
+            return Response(SyncService.get_snapshot(request.user))
+
+        return Response(SyncService.get_changes(request.user, cursor))
@@ -15,7 +15,7 @@ class TeamAdmin(admin.ModelAdmin):
         'name', 'department', 'team_type', 'leader',
         'get_member_count', 'is_active', 'created_at'
     ]
-    list_filter = ['team_type', 'is_active', 'created_at', 'department__branch__company']
+    list_filter = ['team_type', 'is_active', 'created_at', 'company']
     search_fields = ['name', 'description', 'leader__email']
     readonly_fields = ['created_at', 'updated_at']
     inlines = [TeamMemberInline]
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class TeamsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.teams'
+    verbose_name = 'Equipos y Jerarquía'
+
+    def ready(self):
+        from . import signals  # noqa: F401
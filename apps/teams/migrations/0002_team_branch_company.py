@@ -0,0 +1,89 @@
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def populate_ancestry(apps, schema_editor):
+    Department = apps.get_model('companies', 'Department')
+    Team = apps.get_model('teams', 'Team')
+    TeamMember = apps.get_model('teams', 'TeamMember')
+
+    departments = Department.objects.filter(id=OuterRef('department_id'))
+    Team.objects.update(
+        branch_id=Subquery(departments.values('branch_id')[:1]),
+        company_id=Subquery(departments.values('company_id')[:1])
+    )
+
+    teams = Team.objects.filter(id=OuterRef('team_id'))
+    TeamMember.objects.update(
+        branch_id=Subquery(teams.values('branch_id')[:1]),
+        company_id=Subquery(teams.values('company_id')[:1])
+    )
+
+    # Verificaciones de FK diferidas antes de los ALTER TABLE (PostgreSQL)
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0002_department_company'),
+        ('teams', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='team',
+            name='branch',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='teams', to='companies.branch', verbose_name='Sucursal'),
+        ),
+        migrations.AddField(
+            model_name='team',
+            name='company',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='teams', to='companies.company', verbose_name='Empresa'),
+        ),
+        migrations.AddField(
+            model_name='teammember',
+            name='branch',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='team_members', to='companies.branch', verbose_name='Sucursal'),
+        ),
+        migrations.AddField(
+            model_name='teammember',
+            name='company',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='team_members', to='companies.company', verbose_name='Empresa'),
+        ),
+        migrations.RunPython(populate_ancestry, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='team',
+            name='branch',
+            field=models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='teams', to='companies.branch', verbose_name='Sucursal'),
+        ),
+        migrations.AlterField(
+            model_name='team',
+            name='company',
+            field=models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='teams', to='companies.company', verbose_name='Empresa'),
+        ),
+        migrations.AlterField(
+            model_name='teammember',
+            name='branch',
+            field=models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='team_members', to='companies.branch', verbose_name='Sucursal'),
+        ),
+        migrations.AlterField(
+            model_name='teammember',
+            name='company',
+            field=models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='team_members', to='companies.company', verbose_name='Empresa'),
+        ),
+        migrations.AddIndex(
+            model_name='team',
+            index=models.Index(fields=['company', 'team_type'], name='teams_company_7f1f96_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='team',
+            index=models.Index(fields=['branch'], name='teams_branch__74e60a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='teammember',
+            index=models.Index(fields=['company', 'user'], name='team_member_company_b3be0f_idx'),
+        ),
+    ]
@@ -1,6 +1,6 @@
 from django.db import models
 from django.conf import settings
-from apps.companies.models import Department
+from apps.companies.models import Company, Branch, Department
 
 
 class Team(models.Model):
@@ -25,6 +25,21 @@ class Team(models.Model):
         related_name='teams',
         verbose_name='Departamento'
     )
+    # Desnormalizados desde department; se mantienen en save()
+    branch = models.ForeignKey(
+        Branch,
+        on_delete=models.CASCADE,
+        related_name='teams',
+        editable=False,
+        verbose_name='Sucursal'
+    )
+    company = models.ForeignKey(
+        Company,
+        on_delete=models.CASCADE,
+        related_name='teams',
+        editable=False,
+        verbose_name='Empresa'
+    )
     team_type = models.CharField(
         max_length=50,
         choices=TEAM_TYPE_CHOICES,
@@ -59,23 +74,28 @@ class Team(models.Model):
         ordering = ['department', 'team_type', 'name']
         indexes = [
             models.Index(fields=['department']),
+            models.Index(fields=['company', 'team_type']),
+            models.Index(fields=['branch']),
             models.Index(fields=['team_type']),
             models.Index(fields=['leader']),
             models.Index(fields=['is_active']),
         ]
 
     def __str__(self):
-        return f"{self.department.branch.name} - {self.name} ({self.get_team_type_display()})"
+        return f"{self.branch.name} - {self.name} ({self.get_team_type_display()})"
 
-    @property
-    def company(self):
-        """Empresa a la que pertenece el equipo"""
-        return self.department.branch.company
+    def save(self, *args, **kwargs):
+        """Sincroniza branch/company con el departamento y los propaga a miembros"""
+        self.branch_id = self.department.branch_id
+        self.company_id = self.department.company_id
+        adding = self._state.adding
+        super().save(*args, **kwargs)
+        if adding:
+            return
 
-    @property
-    def branch(self):
-        """Sucursal a la que pertenece el equipo"""
-        return self.department.branch
+        TeamMember.objects.filter(team=self).exclude(
+            branch_id=self.branch_id, company_id=self.company_id
+        ).update(branch_id=self.branch_id, company_id=self.company_id)
 
 
 class TeamMember(models.Model):
@@ -102,6 +122,21 @@ class TeamMember(models.Model):
         verbose_name='Usuario',
         limit_choices_to={'user_type': 'employee'}
     )
+    # Desnormalizados desde team; se mantienen en save()
+    branch = models.ForeignKey(
+        Branch,
+        on_delete=models.CASCADE,
+        related_name='team_members',
+        editable=False,
+        verbose_name='Sucursal'
+    )
+    company = models.ForeignKey(
+        Company,
+        on_delete=models.CASCADE,
+        related_name='team_members',
+        editable=False,
+        verbose_name='Empresa'
+    )
     role = models.CharField(
         max_length=20,
         choices=ROLE_CHOICES,
@@ -121,11 +156,18 @@ class TeamMember(models.Model):
         indexes = [
             models.Index(fields=['team']),
             models.Index(fields=['user']),
+            models.Index(fields=['company', 'user']),
         ]
 
     def __str__(self):
         return f"{self.user.get_full_name()} - {self.team.name} ({self.get_role_display()})"
 
+    def save(self, *args, **kwargs):
+        """Sincroniza branch/company con el equipo"""
+        self.branch_id = self.team.branch_id
+        self.company_id = self.team.company_id
+        super().save(*args, **kwargs)
+
     def clean(self):
         """Validaciones personalizadas"""
         from django.core.exceptions import ValidationError
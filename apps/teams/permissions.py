@@ -9,12 +9,5 @@ class IsCompanyOwnerForTeam(permissions.BasePermission):
     message = 'Solo el propietario de la empresa puede gestionar equipos.'
 
     def has_object_permission(self, request, view, obj):
-        # obj puede ser Team o TeamMember
-        if hasattr(obj, 'department'):
-            # Es un Team
-            return obj.department.branch.company.owner == request.user
-        elif hasattr(obj, 'team'):
-            # Es un TeamMember
-            return obj.team.department.branch.company.owner == request.user
-
-        return False
+        # obj puede ser Team o TeamMember; ambos guardan company_id
+        return obj.company.owner_id == request.user.id
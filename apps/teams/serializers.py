@@ -2,6 +2,7 @@ from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from .models import Team, TeamMember
 from apps.companies.serializers import DepartmentSerializer
+from .services.team_service import TeamService
 
 User = get_user_model()
 
@@ -140,3 +141,64 @@ class ChangeMemberRoleSerializer(serializers.Serializer):
 
     user_id = serializers.IntegerField()
     new_role = serializers.ChoiceField(choices=['leader', 'member'])
+
+
+class BulkMemberSerializer(serializers.Serializer):
+    """Miembro dentro de una operación masiva (sin consultas por usuario)"""
+
+    user_id = serializers.IntegerField()
+    role = serializers.ChoiceField(
+        choices=['leader', 'member'],
+        default='member'
+    )
+
+
+class BulkMemberRoleSerializer(serializers.Serializer):
+    """Cambio de rol dentro de una operación masiva"""
+
+    user_id = serializers.IntegerField()
+    new_role = serializers.ChoiceField(choices=['leader', 'member'])
+
+
+def _validate_unique_users(items):
+    """Validar que no haya usuarios repetidos en la operación"""
+    user_ids = [item['user_id'] for item in items]
+    if len(user_ids) != len(set(user_ids)):
+        raise serializers.ValidationError("No puede haber usuarios duplicados")
+    return items
+
+
+class BulkAddMembersSerializer(serializers.Serializer):
+    """Serializer para agregar varios miembros a un equipo"""
+
+    members = BulkMemberSerializer(
+        many=True,
+        allow_empty=False,
+        max_length=TeamService.MAX_BULK_MEMBERS
+    )
+
+    def validate_members(self, value):
+        return _validate_unique_users(value)
+
+
+class BulkRemoveMembersSerializer(serializers.Serializer):
+    """Serializer para remover varios miembros de un equipo"""
+
+    user_ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        allow_empty=False,
+        max_length=TeamService.MAX_BULK_MEMBERS
+    )
+
+
+class BulkChangeRolesSerializer(serializers.Serializer):
+    """Serializer para cambiar el rol de varios miembros"""
+
+    members = BulkMemberRoleSerializer(
+        many=True,
+        allow_empty=False,
+        max_length=TeamService.MAX_BULK_MEMBERS
+    )
+
+    def validate_members(self, value):
+        return _validate_unique_users(value)
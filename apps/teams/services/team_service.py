@@ -1,5 +1,9 @@
-from django.db.models import Count, Q
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Avg, Count, Q
+from django.utils import timezone
 from django.core.exceptions import ValidationError
+from django.db import transaction
 from apps.teams.models import Team, TeamMember
 
 
@@ -121,6 +125,175 @@ class TeamService:
         except (Team.DoesNotExist, TeamMember.DoesNotExist):
             raise ValidationError("Equipo o miembro no encontrado")
 
+    # Máximo de usuarios por operación masiva de miembros
+    MAX_BULK_MEMBERS = 500
+
+    @staticmethod
+    def _single_leader(user_ids_by_role):
+        """Valida que una operación masiva designe a lo sumo un líder"""
+        leaders = user_ids_by_role.get('leader', [])
+        if len(leaders) > 1:
+            raise ValidationError("Solo puede designarse un líder por equipo")
+        return leaders[0] if leaders else None
+
+    @staticmethod
+    def _set_leader(team, leader_id):
+        """
+        Designa el líder del equipo, bajando a member al líder anterior.
+        leader_id=None deja el equipo sin líder.
+        """
+        TeamMember.objects.filter(
+            team=team, role='leader'
+        ).exclude(user_id=leader_id).update(role='member')
+
+        if leader_id is not None:
+            TeamMember.objects.filter(
+                team=team, user_id=leader_id
+            ).update(role='leader')
+
+        team.leader_id = leader_id
+        team.save()
+
+    @staticmethod
+    @transaction.atomic
+    def bulk_add_members(team, members):
+        """
+        Agrega varios miembros a un equipo en una transacción.
+
+        Args:
+        - team: Team
+        - members: lista de dicts {'user_id', 'role'}
+
+        Los usuarios se validan contra un único set precargado. Los que ya
+        son miembros se omiten (bulk_create con ignore_conflicts).
+
+        Retorna: dict con IDs agregados y omitidos
+        """
+        from django.contrib.auth import get_user_model
+        User = get_user_model()
+
+        user_ids = [member['user_id'] for member in members]
+        user_types = dict(
+            User.objects.filter(id__in=user_ids).values_list('id', 'user_type')
+        )
+
+        missing = [user_id for user_id in user_ids if user_id not in user_types]
+        if missing:
+            raise ValidationError(f"Usuarios no encontrados: {missing}")
+
+        not_employees = [
+            user_id for user_id in user_ids if user_types[user_id] != 'employee'
+        ]
+        if not_employees:
+            raise ValidationError(
+                f"Solo usuarios de tipo 'employee' pueden ser miembros de equipos: {not_employees}"
+            )
+
+        existing = set(TeamMember.objects.filter(
+            team=team, user_id__in=user_ids
+        ).values_list('user_id', flat=True))
+
+        new_members = [m for m in members if m['user_id'] not in existing]
+
+        by_role = {}
+        for member in new_members:
+            by_role.setdefault(member['role'], []).append(member['user_id'])
+        leader_id = TeamService._single_leader(by_role)
+
+        TeamMember.objects.bulk_create(
+            [
+                TeamMember(
+                    team=team,
+                    branch_id=team.branch_id,
+                    company_id=team.company_id,
+                    user_id=member['user_id'],
+                    role='member' if member['user_id'] == leader_id else member['role']
+                )
+                for member in new_members
+            ],
+            ignore_conflicts=True
+        )
+
+        if leader_id is not None:
+            TeamService._set_leader(team, leader_id)
+
+        # bulk_create no dispara señales
+        TeamService.invalidate_hierarchy(team.company_id)
+
+        return {
+            'added': [m['user_id'] for m in new_members],
+            'skipped': sorted(existing)
+        }
+
+    @staticmethod
+    @transaction.atomic
+    def bulk_remove_members(team, user_ids):
+        """
+        Remueve varios miembros de un equipo en una transacción.
+        Si se remueve al líder, el equipo queda sin líder.
+
+        Retorna: dict con IDs removidos y no encontrados
+        """
+        members = TeamMember.objects.filter(team=team, user_id__in=user_ids)
+        removed = set(members.values_list('user_id', flat=True))
+
+        if team.leader_id in removed:
+            team.leader = None
+            team.save()
+
+        members.delete()
+
+        return {
+            'removed': sorted(removed),
+            'not_found': [user_id for user_id in user_ids if user_id not in removed]
+        }
+
+    @staticmethod
+    @transaction.atomic
+    def bulk_change_roles(team, changes):
+        """
+        Cambia el rol de varios miembros de un equipo en una transacción.
+
+        Args:
+        - team: Team
+        - changes: lista de dicts {'user_id', 'new_role'}
+
+        Retorna: cantidad de miembros actualizados
+        """
+        user_ids = [change['user_id'] for change in changes]
+
+        members = set(TeamMember.objects.filter(
+            team=team, user_id__in=user_ids
+        ).values_list('user_id', flat=True))
+
+        not_members = [user_id for user_id in user_ids if user_id not in members]
+        if not_members:
+            raise ValidationError(f"Los usuarios no son miembros del equipo: {not_members}")
+
+        by_role = {}
+        for change in changes:
+            by_role.setdefault(change['new_role'], []).append(change['user_id'])
+        leader_id = TeamService._single_leader(by_role)
+
+        demoted = by_role.get('member', [])
+        TeamMember.objects.filter(
+            team=team, user_id__in=demoted
+        ).update(role='member')
+
+        if leader_id is not None:
+            TeamService._set_leader(team, leader_id)
+        elif team.leader_id in demoted:
+            team.leader = None
+            team.save()
+
+        # update() no dispara señales
+        TeamService.invalidate_hierarchy(team.company_id)
+
+        return len(changes)
+
+    # Clave de cache del snapshot de jerarquía por empresa
+    HIERARCHY_CACHE_KEY = 'team_hierarchy:{company_id}'
+
     @staticmethod
     def get_hierarchy(company_id):
         """
@@ -132,69 +305,107 @@ class TeamService:
             - Departamentos
               - Equipos (ordenados por team_type)
                 - Miembros
+
+        El snapshot se cachea por empresa y se invalida con señales al
+        modificar sucursales, departamentos, equipos o miembros.
         """
-        from apps.companies.models import Company
+        key = TeamService.HIERARCHY_CACHE_KEY.format(company_id=company_id)
 
-        try:
-            company = Company.objects.prefetch_related(
-                'branches__departments__teams__members__user'
-            ).get(id=company_id)
-
-            hierarchy = {
-                'company_id': company.id,
-                'company_name': company.name,
-                'branches': []
-            }
+        hierarchy = cache.get(key)
+        if hierarchy is None:
+            hierarchy = TeamService.build_hierarchy(company_id)
+            cache.set(key, hierarchy, settings.HIERARCHY_CACHE_TIMEOUT)
+
+        return hierarchy
 
-            for branch in company.branches.all():
-                branch_data = {
-                    'branch_id': branch.id,
-                    'branch_name': branch.name,
-                    'departments': []
-                }
-
-                for department in branch.departments.all():
-                    dept_data = {
-                        'department_id': department.id,
-                        'department_name': department.name,
-                        'teams': []
-                    }
-
-                    for team in department.teams.all():
-                        team_data = {
-                            'team_id': team.id,
-                            'team_name': team.name,
-                            'team_type': team.team_type,
-                            'team_type_display': team.get_team_type_display(),
-                            'leader': {
-                                'id': team.leader.id,
-                                'name': team.leader.get_full_name(),
-                                'email': team.leader.email
-                            } if team.leader else None,
-                            'members': []
-                        }
-
-                        for member in team.members.all():
-                            team_data['members'].append({
-                                'id': member.user.id,
-                                'name': member.user.get_full_name(),
-                                'email': member.user.email,
-                                'role': member.role,
-                                'role_display': member.get_role_display(),
-                                'assigned_at': member.assigned_at.isoformat()
-                            })
-
-                        dept_data['teams'].append(team_data)
-
-                    branch_data['departments'].append(dept_data)
-
-                hierarchy['branches'].append(branch_data)
-
-            return hierarchy
-
-        except Company.DoesNotExist:
+    @staticmethod
+    def invalidate_hierarchy(company_id):
+        """Descarta el snapshot de jerarquía cacheado de una empresa"""
+        cache.delete(TeamService.HIERARCHY_CACHE_KEY.format(company_id=company_id))
+
+    @staticmethod
+    def build_hierarchy(company_id):
+        """
+        Construye la jerarquía de una empresa con 5 consultas planas
+        (empresa, sucursales, departamentos, equipos con líder y miembros
+        con usuario) y la arma en memoria con diccionarios por ID.
+        """
+        from apps.companies.models import Company, Branch, Department
+
+        company = Company.objects.filter(id=company_id).values('id', 'name').first()
+        if company is None:
             raise ValidationError("Empresa no encontrada")
 
+        hierarchy = {
+            'company_id': company['id'],
+            'company_name': company['name'],
+            'branches': []
+        }
+
+        branches = {}
+        for branch in Branch.objects.filter(
+            company_id=company_id
+        ).values('id', 'name').order_by('name'):
+            branches[branch['id']] = {
+                'branch_id': branch['id'],
+                'branch_name': branch['name'],
+                'departments': []
+            }
+            hierarchy['branches'].append(branches[branch['id']])
+
+        departments = {}
+        for department in Department.objects.filter(
+            company_id=company_id
+        ).values('id', 'name', 'branch_id').order_by('name'):
+            departments[department['id']] = {
+                'department_id': department['id'],
+                'department_name': department['name'],
+                'teams': []
+            }
+            branches[department['branch_id']]['departments'].append(
+                departments[department['id']]
+            )
+
+        team_type_display = dict(Team.TEAM_TYPE_CHOICES)
+        teams = {}
+        for team in Team.objects.filter(
+            company_id=company_id
+        ).values(
+            'id', 'name', 'team_type', 'department_id', 'leader_id',
+            'leader__first_name', 'leader__last_name', 'leader__email'
+        ).order_by('team_type', 'name'):
+            teams[team['id']] = {
+                'team_id': team['id'],
+                'team_name': team['name'],
+                'team_type': team['team_type'],
+                'team_type_display': team_type_display.get(team['team_type'], team['team_type']),
+                'leader': {
+                    'id': team['leader_id'],
+                    'name': f"{team['leader__first_name']} {team['leader__last_name']}",
+                    'email': team['leader__email']
+                } if team['leader_id'] else None,
+                'members': []
+            }
+            departments[team['department_id']]['teams'].append(teams[team['id']])
+
+        role_display = dict(TeamMember.ROLE_CHOICES)
+        for member in TeamMember.objects.filter(
+            company_id=company_id
+        ).values(
+            'team_id', 'role', 'assigned_at', 'user_id',
+            'user__first_name', 'user__last_name', 'user__email'
+        ).order_by('role', '-user__date_joined'):
+            teams[member['team_id']]['members'].append({
+                'id': member['user_id'],
+                'name': f"{member['user__first_name']} {member['user__last_name']}",
+                'email': member['user__email'],
+                'role': member['role'],
+                'role_display': role_display.get(member['role'], member['role']),
+                'assigned_at': member['assigned_at'].isoformat()
+            })
+
+        return hierarchy
+
     @staticmethod
     def get_employee_teams(user_id):
         """
@@ -203,7 +414,7 @@ class TeamService:
         memberships = TeamMember.objects.filter(
             user_id=user_id
         ).select_related(
-            'team__department__branch__company'
+            'team__department', 'branch', 'company'
         )
 
         return [
@@ -214,8 +425,8 @@ class TeamService:
                 'team_type': m.team.team_type,
                 'role': m.role,
                 'department': m.team.department.name,
-                'branch': m.team.department.branch.name,
-                'company': m.team.department.branch.company.name,
+                'branch': m.branch.name,
+                'company': m.company.name,
                 'assigned_at': m.assigned_at.isoformat()
             }
             for m in memberships
@@ -226,37 +437,74 @@ class TeamService:
         """
         Obtiene estadísticas de un equipo.
         """
-        try:
-            team = Team.objects.get(id=team_id)
+        stats = TeamService.get_teams_stats(Team.objects.filter(id=team_id))
+        if not stats:
+            raise ValidationError("Equipo no encontrado")
+        return stats[0]
 
-            members_count = team.members.count()
-            leaders_count = team.members.filter(role='leader').count()
-
-            # Contar auditorías asignadas a miembros del equipo
-            from apps.audits.models import Audit
-            member_ids = team.members.values_list('user_id', flat=True)
-
-            audits_stats = {
-                'total': Audit.objects.filter(assigned_to_id__in=member_ids).count(),
-                'completed': Audit.objects.filter(
-                    assigned_to_id__in=member_ids,
-                    status='completed'
-                ).count(),
-                'in_progress': Audit.objects.filter(
-                    assigned_to_id__in=member_ids,
-                    status='in_progress'
-                ).count()
-            }
+    @staticmethod
+    def get_teams_stats(teams):
+        """
+        Estadísticas de varios equipos en una sola consulta.
 
-            return {
-                'team_id': team.id,
-                'team_name': team.name,
-                'team_type': team.team_type,
-                'members_count': members_count,
-                'leaders_count': leaders_count,
-                'audits': audits_stats,
-                'is_active': team.is_active
-            }
+        Agrega con conteos condicionales sobre el join
+        equipo → miembros → auditorías asignadas. Una auditoría está
+        asignada a un único usuario y (equipo, usuario) es único, así que
+        solo los conteos de miembros necesitan DISTINCT.
 
-        except Team.DoesNotExist:
-            raise ValidationError("Equipo no encontrado")
+        Args:
+        - teams: QuerySet de Team a incluir
+
+        Retorna: lista de dicts con el formato de get_team_stats
+        """
+        audits = 'members__user__assigned_audits'
+        open_statuses = ['draft', 'in_progress']
+
+        rows = teams.order_by(
+            'department__name', 'team_type', 'name'
+        ).values(
+            'id', 'name', 'team_type', 'is_active'
+        ).annotate(
+            members_count=Count('members', distinct=True),
+            leaders_count=Count(
+                'members', filter=Q(members__role='leader'), distinct=True
+            ),
+            audits_total=Count(audits),
+            audits_completed=Count(
+                audits, filter=Q(**{f'{audits}__status': 'completed'})
+            ),
+            audits_in_progress=Count(
+                audits, filter=Q(**{f'{audits}__status': 'in_progress'})
+            ),
+            audits_overdue=Count(
+                audits,
+                filter=Q(**{
+                    f'{audits}__status__in': open_statuses,
+                    f'{audits}__scheduled_date__lt': timezone.localdate()
+                })
+            ),
+            average_score=Avg(
+                f'{audits}__score_percentage',
+                filter=Q(**{f'{audits}__status': 'completed'})
+            )
+        )
+
+        return [
+            {
+                'team_id': row['id'],
+                'team_name': row['name'],
+                'team_type': row['team_type'],
+                'members_count': row['members_count'],
+                'leaders_count': row['leaders_count'],
+                'audits': {
+                    'total': row['audits_total'],
+                    'completed': row['audits_completed'],
+                    'in_progress': row['audits_in_progress'],
+                    'overdue': row['audits_overdue'],
+                    'average_score': round(float(row['average_score']), 2)
+                    if row['average_score'] is not None else None
+                },
+                'is_active': row['is_active']
+            }
+            for row in rows
+        ]
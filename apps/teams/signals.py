@@ -0,0 +1,16 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from apps.companies.models import Branch, Department
+from .models import Team, TeamMember
+
+
+@receiver([post_save, post_delete], sender=Branch)
+@receiver([post_save, post_delete], sender=Department)
+@receiver([post_save, post_delete], sender=Team)
+@receiver([post_save, post_delete], sender=TeamMember)
+def invalidate_hierarchy(sender, instance, **kwargs):
+    """Invalida el snapshot de jerarquía de la empresa afectada"""
+    from .services.team_service import TeamService
+
+    # Todos los nodos guardan company_id desnormalizado
+    TeamService.invalidate_hierarchy(instance.company_id)
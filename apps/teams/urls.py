@@ -14,7 +14,8 @@ router.register(r'teams', TeamViewSet, basename='team')
 router.register(r'team-members', TeamMemberViewSet, basename='team_member')
 
 urlpatterns = [
-    path('', include(router.urls)),
+    # Antes del router para que no se resuelva como teams/{pk}/
     path('teams/hierarchy/', HierarchyView.as_view(), name='hierarchy'),
+    path('', include(router.urls)),
     path('employees/<int:user_id>/teams/', EmployeeTeamsView.as_view(), name='employee_teams'),
 ]
@@ -9,7 +9,9 @@ from .models import Team, TeamMember
 from .serializers import (
     TeamSerializer, TeamListSerializer,
     TeamMemberSerializer, TeamMemberListSerializer,
-    AddMemberSerializer, ChangeMemberRoleSerializer
+    AddMemberSerializer, ChangeMemberRoleSerializer,
+    BulkAddMembersSerializer, BulkRemoveMembersSerializer,
+    BulkChangeRolesSerializer
 )
 from .services.team_service import TeamService
 from .permissions import IsCompanyOwnerForTeam
@@ -34,13 +36,13 @@ class TeamViewSet(viewsets.ModelViewSet):
         user = self.request.user
 
         queryset = Team.objects.select_related(
-            'department__branch__company', 'leader'
+            'department', 'branch', 'company', 'leader'
         ).prefetch_related('members')
 
         if user.user_type == 'owner':
             # Owners ven equipos de sus empresas
             queryset = queryset.filter(
-                department__branch__company__owner=user
+                company__owner=user
             )
         else:
             # Employees ven equipos donde están asignados
@@ -51,15 +53,11 @@ class TeamViewSet(viewsets.ModelViewSet):
         # Filtros opcionales
         company_id = self.request.query_params.get('company')
         if company_id:
-            queryset = queryset.filter(
-                department__branch__company_id=company_id
-            )
+            queryset = queryset.filter(company_id=company_id)
 
         branch_id = self.request.query_params.get('branch')
         if branch_id:
-            queryset = queryset.filter(
-                department__branch_id=branch_id
-            )
+            queryset = queryset.filter(branch_id=branch_id)
 
         department_id = self.request.query_params.get('department')
         if department_id:
@@ -69,7 +67,9 @@ class TeamViewSet(viewsets.ModelViewSet):
         if team_type:
             queryset = queryset.filter(team_type=team_type)
 
-        return queryset.annotate(member_count=Count('members'))
+        return queryset.annotate(
+            member_count=Count('members')
+        ).order_by('department', 'team_type', 'name')
 
     def get_serializer_class(self):
         """Usar serializer diferente según la acción"""
@@ -79,7 +79,10 @@ class TeamViewSet(viewsets.ModelViewSet):
 
     def get_permissions(self):
         """Permisos: solo owners pueden crear/modificar equipos"""
-        if self.action in ['create', 'update', 'partial_update', 'destroy']:
+        if self.action in [
+            'create', 'update', 'partial_update', 'destroy',
+            'bulk_add_members', 'bulk_remove_members', 'bulk_change_roles'
+        ]:
             return [IsAuthenticated(), IsOwner(), IsCompanyOwnerForTeam()]
         return super().get_permissions()
 
@@ -184,6 +187,108 @@ class TeamViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
+    @action(detail=True, methods=['post'])
+    def bulk_add_members(self, request, pk=None):
+        """
+        POST /api/teams/{id}/bulk_add_members/
+        Agrega varios miembros en una transacción
+
+        Body: {
+            "members": [
+                {"user_id": 5, "role": "member"},
+                {"user_id": 6, "role": "leader"}
+            ]
+        }
+        """
+        team = self.get_object()
+        serializer = BulkAddMembersSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            result = TeamService.bulk_add_members(
+                team=team,
+                members=serializer.validated_data['members']
+            )
+
+            return Response({
+                'message': f"{len(result['added'])} miembros agregados",
+                **result
+            })
+
+        except DjangoValidationError as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+    @action(detail=True, methods=['post'])
+    def bulk_remove_members(self, request, pk=None):
+        """
+        POST /api/teams/{id}/bulk_remove_members/
+        Remueve varios miembros en una transacción
+
+        Body: {
+            "user_ids": [5, 6, 7]
+        }
+        """
+        team = self.get_object()
+        serializer = BulkRemoveMembersSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        result = TeamService.bulk_remove_members(
+            team=team,
+            user_ids=serializer.validated_data['user_ids']
+        )
+
+        return Response({
+            'message': f"{len(result['removed'])} miembros removidos",
+            **result
+        })
+
+    @action(detail=True, methods=['post'])
+    def bulk_change_roles(self, request, pk=None):
+        """
+        POST /api/teams/{id}/bulk_change_roles/
+        Cambia el rol de varios miembros en una transacción
+
+        Body: {
+            "members": [
+                {"user_id": 5, "new_role": "leader"},
+                {"user_id": 6, "new_role": "member"}
+            ]
+        }
+        """
+        team = self.get_object()
+        serializer = BulkChangeRolesSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            updated = TeamService.bulk_change_roles(
+                team=team,
+                changes=serializer.validated_data['members']
+            )
+
+            return Response({
+                'message': f'{updated} roles actualizados',
+                'updated': updated
+            })
+
+        except DjangoValidationError as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+    @action(detail=False, methods=['get'], url_path='stats')
+    def bulk_stats(self, request):
+        """
+        GET /api/teams/stats/?company=1&branch=2&department=3
+        Estadísticas de todos los equipos visibles (con los mismos
+        filtros del listado) en una sola consulta
+        """
+        teams = Team.objects.filter(id__in=self.get_queryset().values('id'))
+        return Response(TeamService.get_teams_stats(teams))
+
     @action(detail=True, methods=['get'])
     def stats(self, request, pk=None):
         """
@@ -216,13 +321,13 @@ class TeamMemberViewSet(viewsets.ModelViewSet):
         user = self.request.user
 
         queryset = TeamMember.objects.select_related(
-            'team__department__branch__company', 'user'
+            'team', 'company', 'user'
         )
 
         if user.user_type == 'owner':
             # Owners ven miembros de sus empresas
             queryset = queryset.filter(
-                team__department__branch__company__owner=user
+                company__owner=user
             )
         else:
             # Employees ven miembros de sus equipos
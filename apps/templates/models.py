@@ -58,12 +58,22 @@ class AuditTemplate(models.Model):
 
     @property
     def total_questions(self):
-        """Cantidad total de preguntas en la plantilla"""
+        """
+        Cantidad total de preguntas en la plantilla.
+        Usa la anotación questions_count del queryset si está disponible.
+        """
+        if hasattr(self, 'questions_count'):
+            return self.questions_count
         return self.questions.count()
 
     @property
     def max_possible_score(self):
-        """Puntaje máximo posible de la plantilla"""
+        """
+        Puntaje máximo posible de la plantilla.
+        Usa la anotación questions_max_score del queryset si está disponible.
+        """
+        if hasattr(self, 'questions_max_score'):
+            return self.questions_max_score or 0
         from django.db.models import Sum
         result = self.questions.aggregate(Sum('max_score'))
         return result['max_score__sum'] or 0
@@ -117,6 +127,7 @@ class TemplateQuestion(models.Model):
     )
 
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         db_table = 'template_questions'
@@ -0,0 +1,54 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from apps.templates.models import AuditTemplate, TemplateQuestion
+from core.testing import create_user
+
+
+class TemplateListQueryCountTests(TestCase):
+    """La lista de plantillas usa un número de consultas fijo (sin N+1)"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = create_user('owner@test.com', 'owner')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+
+    def create_template(self, index):
+        """Plantilla con tres preguntas de puntaje 2"""
+        template = AuditTemplate.objects.create(
+            name=f'Plantilla {index}', iso_standard='27701', created_by=self.owner
+        )
+        TemplateQuestion.objects.bulk_create([
+            TemplateQuestion(
+                template=template, category='General',
+                question_text=f'Pregunta {number}', order_num=number, max_score=2
+            )
+            for number in range(3)
+        ])
+        return template
+
+    def count_queries(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/api/templates/')
+        self.assertEqual(response.status_code, 200)
+        return len(context), response.data['results']
+
+    def test_template_list(self):
+        self.create_template(0)
+        one, results = self.count_queries()
+        self.assertEqual(len(results), 1)
+
+        for index in range(1, 5):
+            self.create_template(index)
+        many, results = self.count_queries()
+
+        self.assertEqual(len(results), 5)
+        self.assertEqual(many, one)
+        self.assertEqual(
+            {(row['total_questions'], row['max_possible_score']) for row in results},
+            {(3, 6)}
+        )
@@ -2,7 +2,8 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.db.models import Count, Sum, Q
+from django.db.models import Count, Max, Sum, Q
+from django.utils import timezone
 from .models import AuditTemplate, TemplateQuestion
 from .serializers import (
     AuditTemplateSerializer, AuditTemplateListSerializer,
@@ -10,6 +11,28 @@ from .serializers import (
     TemplateBulkCreateSerializer
 )
 from apps.authentication.permissions import IsOwner
+from apps.sync.services import SyncService
+from audit_system.conditional import conditional_get
+
+
+def template_state(view, request, pk=None, **kwargs):
+    """
+    Versión de una plantilla visible para el usuario: su updated_at y el
+    conteo y última modificación de sus preguntas (una consulta).
+    """
+    try:
+        state = view.get_queryset().filter(pk=pk).annotate(
+            questions_updated=Max('questions__updated_at')
+        ).values_list('updated_at', 'questions_count', 'questions_updated').first()
+    except (ValueError, TypeError):
+        return None
+
+    if state is None:
+        return None
+
+    updated_at, _, questions_updated = state
+    last_modified = max(filter(None, [updated_at, questions_updated]))
+    return state, last_modified
 
 
 class AuditTemplateViewSet(viewsets.ModelViewSet):
@@ -30,7 +53,10 @@ class AuditTemplateViewSet(viewsets.ModelViewSet):
         """
         user = self.request.user
 
-        queryset = AuditTemplate.objects.select_related('created_by')
+        queryset = AuditTemplate.objects.select_related('created_by').annotate(
+            questions_count=Count('questions'),
+            questions_max_score=Sum('questions__max_score')
+        )
 
         if user.user_type == 'owner':
             # Owners ven plantillas activas + las que ellos crearon
@@ -41,7 +67,11 @@ class AuditTemplateViewSet(viewsets.ModelViewSet):
             # Employees solo ven plantillas activas
             queryset = queryset.filter(is_active=True)
 
-        return queryset.distinct()
+        if self.action != 'list':
+            queryset = queryset.prefetch_related('questions')
+
+        # Las consultas agrupadas no aplican el ordering de Meta
+        return queryset.distinct().order_by('-created_at')
 
     def get_serializer_class(self):
         """Usar serializer diferente para list vs detail"""
@@ -60,6 +90,11 @@ class AuditTemplateViewSet(viewsets.ModelViewSet):
             return [IsAuthenticated(), IsOwner()]
         return super().get_permissions()
 
+    @conditional_get(template_state)
+    def retrieve(self, request, *args, **kwargs):
+        """Detalle con soporte de ETag / Last-Modified (304 si no cambió)"""
+        return super().retrieve(request, *args, **kwargs)
+
     @action(detail=False, methods=['post'])
     def bulk_create(self, request):
         """
@@ -81,6 +116,7 @@ class AuditTemplateViewSet(viewsets.ModelViewSet):
         )
 
     @action(detail=True, methods=['get'])
+    @conditional_get(template_state)
     def questions(self, request, pk=None):
         """
         Endpoint personalizado: GET /api/templates/{id}/questions/
@@ -92,6 +128,7 @@ class AuditTemplateViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
     @action(detail=True, methods=['get'])
+    @conditional_get(template_state)
     def categories(self, request, pk=None):
         """
         Endpoint personalizado: GET /api/templates/{id}/categories/
@@ -283,7 +320,13 @@ class TemplateQuestionViewSet(viewsets.ModelViewSet):
                 TemplateQuestion.objects.filter(
                     id=item['id'],
                     template=template
-                ).update(order_num=item['order_num'])
+                ).update(order_num=item['order_num'], updated_at=timezone.now())
+
+            # update() no emite señales
+            SyncService.record(TemplateQuestion.objects.filter(
+                template=template,
+                id__in=[item['id'] for item in questions_data]
+            ).only('id', 'template_id'))
 
             return Response({
                 'message': 'Preguntas reordenadas exitosamente'
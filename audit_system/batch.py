@@ -0,0 +1,154 @@
+"""
+Endpoint de multiplexación de peticiones GET (/api/batch/).
+
+El frontend agrupa las peticiones de carga inicial (secciones del
+dashboard, empresas, plantillas...) en una sola llamada. La autenticación
+JWT se resuelve una vez y cada sub-petición se despacha en el mismo
+proceso a través del resolver de URLs, sin pasar de nuevo por los
+middlewares. Cada vista aplica sus propios permisos y filtros.
+"""
+import json
+import logging
+from urllib.parse import urlsplit
+from django.conf import settings
+from django.http import HttpRequest, QueryDict
+from django.urls import Resolver404, resolve
+from rest_framework import serializers, status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+logger = logging.getLogger(__name__)
+
+
+class BatchItemSerializer(serializers.Serializer):
+    """Sub-petición GET"""
+
+    id = serializers.CharField(max_length=100)
+    path = serializers.CharField(max_length=2000)
+
+    def validate_path(self, value):
+        """Solo rutas de la API, sin anidar batch"""
+        path = urlsplit(value).path
+        if not path.startswith('/api/'):
+            raise serializers.ValidationError("La ruta debe comenzar con /api/")
+        if path.rstrip('/') == '/api/batch':
+            raise serializers.ValidationError("No se puede anidar /api/batch/")
+        return value
+
+
+class BatchSerializer(serializers.Serializer):
+    """Lista de sub-peticiones"""
+
+    requests = serializers.ListField(
+        child=BatchItemSerializer(),
+        min_length=1,
+        max_length=settings.BATCH_MAX_REQUESTS
+    )
+
+    def validate_requests(self, value):
+        ids = [item['id'] for item in value]
+        if len(ids) != len(set(ids)):
+            raise serializers.ValidationError("Los id de las sub-peticiones deben ser únicos")
+        return value
+
+
+class BatchView(APIView):
+    """
+    POST /api/batch/
+
+    Body:
+    {
+        "requests": [
+            {"id": "overview", "path": "/api/dashboard/overview/?company_id=1"},
+            {"id": "companies", "path": "/api/companies/"}
+        ]
+    }
+
+    Retorna (mismo orden):
+    {
+        "responses": [
+            {"id": "overview", "status": 200, "body": {...}},
+            {"id": "companies", "status": 200, "body": {...}}
+        ]
+    }
+
+    El error de una sub-petición (404, 403, 500...) queda en su entrada y
+    no afecta a las demás.
+    """
+    permission_classes = [IsAuthenticated]
+
+    # Headers de la petición original que no aplican a las sub-peticiones
+    EXCLUDED_META = [
+        'CONTENT_LENGTH', 'CONTENT_TYPE', 'HTTP_IF_NONE_MATCH',
+        'HTTP_IF_MODIFIED_SINCE', 'HTTP_IF_MATCH', 'HTTP_IDEMPOTENCY_KEY'
+    ]
+
+    def post(self, request):
+        serializer = BatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        responses = [
+            {'id': item['id'], **self.dispatch_get(request, item['path'])}
+            for item in serializer.validated_data['requests']
+        ]
+
+        return Response({'responses': responses})
+
+    def build_request(self, request, path, query):
+        """HttpRequest GET con el usuario ya autenticado"""
+        sub_request = HttpRequest()
+        sub_request.method = 'GET'
+        sub_request.path = sub_request.path_info = path
+        sub_request.META = {
+            key: value for key, value in request.META.items()
+            if key not in self.EXCLUDED_META
+        }
+        sub_request.META.update({
+            'REQUEST_METHOD': 'GET',
+            'PATH_INFO': path,
+            'QUERY_STRING': query,
+        })
+        sub_request.GET = QueryDict(query)
+        sub_request.COOKIES = request.COOKIES
+
+        # Mismo mecanismo que usa DRF para forzar la autenticación: las
+        # vistas no vuelven a decodificar el JWT ni a consultar el usuario
+        sub_request._force_auth_user = request.user
+        sub_request._force_auth_token = request.auth
+        sub_request.user = request.user
+        return sub_request
+
+    def dispatch_get(self, request, url):
+        """Ejecuta una sub-petición y retorna status, body y ETag"""
+        parts = urlsplit(url)
+
+        try:
+            match = resolve(parts.path)
+        except Resolver404:
+            return {
+                'status': status.HTTP_404_NOT_FOUND,
+                'body': {'error': 'Ruta no encontrada'}
+            }
+
+        sub_request = self.build_request(request, parts.path, parts.query)
+
+        try:
+            response = match.func(sub_request, *match.args, **match.kwargs)
+            if hasattr(response, 'render'):
+                response.render()
+        except Exception:
+            logger.exception('Error en sub-petición batch %s', url)
+            return {
+                'status': status.HTTP_500_INTERNAL_SERVER_ERROR,
+                'body': {'error': 'Error interno del servidor'}
+            }
+
+        body = None
+        if response.content and 'json' in response.get('Content-Type', ''):
+            body = json.loads(response.content)
+
+        result = {'status': response.status_code, 'body': body}
+        if response.has_header('ETag'):
+            result['etag'] = response['ETag']
+        return result
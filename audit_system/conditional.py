@@ -0,0 +1,60 @@
+"""
+Soporte de GET condicional (ETag / Last-Modified) para vistas DRF.
+
+Cada vista calcula un estado barato (timestamps y conteos obtenidos con una
+consulta agregada) antes de ejecutar la consulta completa y el serializer.
+Si el cliente ya tiene esa versión (If-None-Match / If-Modified-Since) se
+responde 304 sin cuerpo.
+"""
+import hashlib
+from functools import wraps
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+
+def make_etag(*parts):
+    """ETag a partir de las partes que identifican la versión del recurso"""
+    raw = ':'.join(str(part) for part in parts)
+    return quote_etag(hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest())
+
+
+def conditional_get(state_func):
+    """
+    Decorador para métodos GET de vistas y acciones DRF.
+
+    state_func(view, request, *args, **kwargs) retorna (partes, last_modified)
+    o None si el recurso no existe o no es visible (la vista responde como
+    siempre, normalmente 404). Las partes deben cambiar cada vez que cambie
+    el contenido de la respuesta.
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, request, *args, **kwargs):
+            state = state_func(self, request, *args, **kwargs)
+            if state is None:
+                return method(self, request, *args, **kwargs)
+
+            parts, last_modified = state
+            etag = make_etag(request.get_full_path(), *parts)
+            timestamp = int(last_modified.timestamp()) if last_modified else None
+
+            response = get_conditional_response(
+                request, etag=etag, last_modified=timestamp
+            )
+            if response is None:
+                response = method(self, request, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+
+            response['ETag'] = etag
+            if timestamp is not None:
+                response['Last-Modified'] = http_date(timestamp)
+            # El contenido depende del usuario: solo caché del navegador y
+            # siempre revalidando
+            patch_cache_control(response, private=True, no_cache=True)
+            patch_vary_headers(response, ['Authorization'])
+            return response
+
+        return wrapper
+
+    return decorator
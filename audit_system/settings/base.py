@@ -1,6 +1,7 @@
 import os
 from pathlib import Path
 from decouple import config
+from corsheaders.defaults import default_headers
 from datetime import timedelta
 
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
@@ -29,6 +30,8 @@ INSTALLED_APPS = [
     'apps.dashboard',
     'apps.comparisons',
     'apps.teams',
+    'apps.sync',
+    'apps.search',
 ]
 
 MIDDLEWARE = [
@@ -65,9 +68,33 @@ WSGI_APPLICATION = 'audit_system.wsgi.application'
 # User Model
 AUTH_USER_MODEL = 'authentication.User'
 
+# Cache
+# Con REDIS_URL la cache es compartida por todos los workers de gunicorn;
+# la necesitan el usuario cacheado de la autenticación JWT y los límites
+# de intentos. Sin REDIS_URL (desarrollo, un proceso) se usa cache local.
+REDIS_URL = config('REDIS_URL', default='')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
 # REST Framework
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
+        # El usuario cacheado solo se invalida en todos los workers con
+        # cache compartida
+        'apps.authentication.authentication.CachedJWTAuthentication'
+        if REDIS_URL else
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
@@ -79,6 +106,17 @@ REST_FRAMEWORK = {
         'rest_framework.renderers.JSONRenderer',
     ],
     'EXCEPTION_HANDLER': 'rest_framework.views.exception_handler',
+    # Límites de login, registro, cambio de contraseña y refresh
+    # (apps.authentication.throttles)
+    'DEFAULT_THROTTLE_RATES': {
+        'auth_ip': config('AUTH_THROTTLE_IP_RATE', default='30/min'),
+        'auth_email': config('AUTH_THROTTLE_EMAIL_RATE', default='5/min'),
+        'auth_refresh': config('AUTH_THROTTLE_REFRESH_RATE', default='60/min'),
+    },
+    # Proxies de confianza delante de la app (production.py usa 1 por
+    # defecto, Render). Con 0 la IP es REMOTE_ADDR; X-Forwarded-For lo
+    # envía el cliente y no se usa
+    'NUM_PROXIES': config('NUM_PROXIES', default=0, cast=int),
 }
 
 # JWT Settings
@@ -100,8 +138,13 @@ SIMPLE_JWT = {
 
     'AUTH_TOKEN_CLASSES': ('rest_framework_simplejwt.tokens.AccessToken',),
     'TOKEN_TYPE_CLAIM': 'token_type',
+
+    'TOKEN_REFRESH_SERIALIZER': 'apps.authentication.serializers.CachedTokenRefreshSerializer',
 }
 
+# Segundos que se conserva el usuario cacheado por CachedJWTAuthentication
+AUTH_USER_CACHE_TIMEOUT = config('AUTH_USER_CACHE_TIMEOUT', default=300, cast=int)
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -135,6 +178,35 @@ MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Recomendaciones automáticas
+# Fracción del max_score bajo la cual una pregunta genera recomendación
+RECOMMENDATION_LOW_SCORE_FRACTION = config(
+    'RECOMMENDATION_LOW_SCORE_FRACTION', default=0.5, cast=float
+)
+
+# Comparaciones
+# Segundos que se conservan los resultados cacheados de analyze/trends
+COMPARISON_CACHE_TIMEOUT = config('COMPARISON_CACHE_TIMEOUT', default=3600, cast=int)
+
+# Equipos
+# Segundos que se conserva el snapshot cacheado de la jerarquía por empresa
+HIERARCHY_CACHE_TIMEOUT = config('HIERARCHY_CACHE_TIMEOUT', default=3600, cast=int)
+
+# Sincronización offline
+# Máximo de cambios del registro procesados por llamada a /api/sync/
+SYNC_PAGE_SIZE = config('SYNC_PAGE_SIZE', default=1000, cast=int)
+
+# Idempotencia
+# Horas que se conserva la respuesta de cada Idempotency-Key
+IDEMPOTENCY_KEY_TTL_HOURS = config('IDEMPOTENCY_KEY_TTL_HOURS', default=24, cast=int)
+# Segundos tras los que una petición sin respuesta se considera abandonada
+# (el worker murió) y un reintento puede tomar la clave
+IDEMPOTENCY_LEASE_SECONDS = config('IDEMPOTENCY_LEASE_SECONDS', default=120, cast=int)
+
+# Batch
+# Máximo de sub-peticiones GET por llamada a /api/batch/
+BATCH_MAX_REQUESTS = config('BATCH_MAX_REQUESTS', default=20, cast=int)
+
 # CORS
 # CORS
 CORS_ALLOWED_ORIGINS = config('CORS_ALLOWED_ORIGINS', default='').split(',')
@@ -152,3 +224,11 @@ LOCALLY_ALLOWED_ORIGINS = [
 
 CORS_ALLOWED_ORIGINS.extend(LOCALLY_ALLOWED_ORIGINS)
 CORS_ALLOW_CREDENTIALS = True
+
+# Concurrencia optimista (If-Match), GET condicional (If-None-Match /
+# If-Modified-Since) e idempotencia (Idempotency-Key)
+CORS_ALLOW_HEADERS = (
+    *default_headers, 'if-match', 'if-none-match', 'if-modified-since',
+    'idempotency-key'
+)
+CORS_EXPOSE_HEADERS = ['ETag', 'Last-Modified', 'Idempotent-Replayed']
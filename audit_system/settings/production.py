@@ -31,6 +31,10 @@ SECURE_BROWSER_XSS_FILTER = config('SECURE_BROWSER_XSS_FILTER', default=True, ca
 SECURE_CONTENT_TYPE_NOSNIFF = config('SECURE_CONTENT_TYPE_NOSNIFF', default=True, cast=bool)
 X_FRAME_OPTIONS = config('X_FRAME_OPTIONS', default='DENY')
 
+# Detrás del proxy de la plataforma (Render) REMOTE_ADDR es el proxy: sin
+# NUM_PROXIES todos los clientes compartirían el límite auth_ip
+REST_FRAMEWORK['NUM_PROXIES'] = config('NUM_PROXIES', default=1, cast=int)
+
 # Static files (CSS, JavaScript, Images)
 STATIC_URL = '/static/'
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
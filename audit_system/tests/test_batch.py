@@ -0,0 +1,84 @@
+from unittest.mock import patch
+from django.conf import settings
+from django.test import TestCase
+from rest_framework.test import APIClient
+from apps.companies.models import Company
+from core.testing import create_user
+
+
+class BatchViewTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = create_user('owner@test.com', 'owner')
+        cls.other_owner = create_user('other@test.com', 'owner')
+        cls.employee = create_user('employee@test.com')
+        cls.company = Company.objects.create(name='ACME', owner=cls.owner)
+        cls.other_company = Company.objects.create(name='Otra', owner=cls.other_owner)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+
+    def batch(self, *paths):
+        return self.client.post('/api/batch/', {
+            'requests': [{'id': str(i), 'path': path} for i, path in enumerate(paths)]
+        }, format='json')
+
+    def test_failed_entries_do_not_affect_others(self):
+        with patch(
+            'apps.dashboard.views.StatsService.get_overview_stats',
+            side_effect=RuntimeError
+        ), self.assertLogs('audit_system.batch', 'ERROR'):
+            response = self.batch(
+                f'/api/companies/{self.company.id}/',
+                '/api/no-existe/',
+                '/api/auth/login/',
+                '/api/dashboard/overview/',
+                '/api/auth/profile/'
+            )
+
+        self.assertEqual(response.status_code, 200)
+        entries = response.data['responses']
+        self.assertEqual([e['id'] for e in entries], ['0', '1', '2', '3', '4'])
+        self.assertEqual([e['status'] for e in entries], [200, 404, 405, 500, 200])
+        self.assertEqual(entries[0]['body']['name'], 'ACME')
+        self.assertEqual(entries[4]['body']['email'], 'owner@test.com')
+
+    def test_nested_batch_rejected(self):
+        for path in ['/api/batch/', '/api/batch', '/api/batch/?x=1']:
+            response = self.batch(path)
+            self.assertEqual(response.status_code, 400, path)
+
+    def test_max_requests_enforced(self):
+        paths = ['/api/auth/profile/'] * settings.BATCH_MAX_REQUESTS
+
+        self.assertEqual(self.batch(*paths).status_code, 200)
+        self.assertEqual(self.batch(*paths, '/api/auth/profile/').status_code, 400)
+
+    def test_sub_requests_use_caller_permissions(self):
+        self.client.force_authenticate(self.employee)
+
+        response = self.batch('/api/dashboard/overview/', '/api/auth/profile/')
+
+        self.assertEqual(
+            [e['status'] for e in response.data['responses']], [403, 200]
+        )
+        self.assertEqual(
+            response.data['responses'][1]['body']['email'], 'employee@test.com'
+        )
+
+    def test_sub_requests_use_caller_scope(self):
+        response = self.batch(
+            f'/api/companies/{self.other_company.id}/',
+            f'/api/companies/{self.company.id}/'
+        )
+
+        self.assertEqual(
+            [e['status'] for e in response.data['responses']], [404, 200]
+        )
+
+    def test_anonymous_rejected(self):
+        self.client.force_authenticate(None)
+
+        self.assertEqual(self.batch('/api/auth/profile/').status_code, 401)
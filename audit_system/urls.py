@@ -1,13 +1,17 @@
 from django.contrib import admin
 from django.urls import path, include
+from .batch import BatchView
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/auth/', include('apps.authentication.urls')),
+    path('api/batch/', BatchView.as_view(), name='batch'),
     path('api/', include('apps.companies.urls')),
     path('api/', include('apps.templates.urls')),
     path('api/', include('apps.audits.urls')),
     path('api/', include('apps.dashboard.urls')),
     path('api/', include('apps.comparisons.urls')),
     path('api/', include('apps.teams.urls')),
+    path('api/', include('apps.sync.urls')),
+    path('api/', include('apps.search.urls')),
 ]
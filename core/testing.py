@@ -0,0 +1,18 @@
+"""
+Utilidades compartidas por los tests de las apps.
+"""
+from django.contrib.auth import get_user_model
+
+TEST_PASSWORD = 'pass12345678'
+
+
+def create_user(email, user_type='employee', **fields):
+    """
+    Crea un usuario de prueba con TEST_PASSWORD. El nombre se deriva del
+    email (owner@test.com -> Owner Test) salvo que se indique otro.
+    """
+    fields.setdefault('first_name', email.split('@')[0].title())
+    fields.setdefault('last_name', 'Test')
+    return get_user_model().objects.create_user(
+        email, TEST_PASSWORD, user_type=user_type, **fields
+    )